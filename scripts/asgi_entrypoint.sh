@@ -0,0 +1,15 @@
+#!/bin/sh
+
+set -e
+
+# we dont need to collectstatic each time
+# python manage.py collectstatic --noinput
+python manage.py wait_for_db
+# every worker writes its metrics here and /metrics/ adds them up, from 0 on start
+export METRICS_DIR="${METRICS_DIR:-/tmp/taskmanager-metrics}"
+rm -rf "${METRICS_DIR}"
+mkdir -p "${METRICS_DIR}"
+uvicorn taskmanager.asgi:application \
+  --host 0.0.0.0 \
+  --port ${DJANGO_PORT} \
+  --workers 4
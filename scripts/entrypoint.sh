@@ -5,8 +5,16 @@ set -e
 # we dont need to collectstatic each time
 # python manage.py collectstatic --noinput
 python manage.py wait_for_db
+# every worker writes its metrics here and /metrics/ adds them up, from 0 on start
+export METRICS_DIR="${METRICS_DIR:-/tmp/taskmanager-metrics}"
+rm -rf "${METRICS_DIR}"
+mkdir -p "${METRICS_DIR}"
+# lazy-apps: every worker loads and warms the application up itself, instead of
+# forking the master's (and its database connections)
 uwsgi --socket :${DJANGO_PORT} \
   --workers 4 \
   --master \
+  --lazy-apps \
+  --need-app \
   --enable-threads \
   --module taskmanager.wsgi
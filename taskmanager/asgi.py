@@ -8,8 +8,17 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "taskmanager.settings")
+# the async views don't hop to a thread for every request served by ASGI
+os.environ.setdefault("TASKS_ASYNC_VIEWS", "true")
 
 application = get_asgi_application()
+
+if settings.WARMUP_ENABLED:
+    from taskmanager.warmup import try_warm_up_in_thread
+
+    # uvicorn loads the application in every worker inside of its event loop
+    try_warm_up_in_thread()
@@ -0,0 +1,214 @@
+"""Benchmark suite of the API's endpoints.
+
+Run it with ``python manage.py benchmark_api``. Like the scenarios of
+``tasks.benchmarks`` it runs on a throwaway test database, seeded with users and
+tasks shaped by UserFactory and TaskFactory and inserted with ``bulk_create`` in
+batches. Every endpoint is requested through Django's test Client, in process and
+with the whole middleware stack, and reported with latency percentiles, the
+throughput of a single client and the number of queries per request. Results are
+JSON carrying the commit and the settings that change the numbers, so runs of two
+commits can be compared with ``--compare``.
+"""
+
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+from itertools import islice
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.models import Q
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from taskmanager.version import __version__
+from tasks import counters
+from tasks.factories import TaskFactory
+from tasks.models import Task, TaskState
+from users.factories import COMMON_PASSWORD, UserFactory
+from users.models import User
+
+# a request to an endpoint: method, path and JSON data
+Request = tuple[str, str, Optional[dict]]
+
+
+def seed(users: int, tasks_per_user: int, batch_size: int = 5000) -> list[User]:
+    """Insert ``users`` with ``tasks_per_user`` tasks each, return the users.
+
+    The factories give the rows their shape and the rows are inserted in batches,
+    without save(). All users share a single password hash.
+    """
+    password = make_password(COMMON_PASSWORD)
+    seeded = User.objects.bulk_create(
+        (
+            UserFactory.build(email=f"benchmark-{i}@example.com", password=password)
+            for i in range(users)
+        ),
+        batch_size=batch_size,
+    )
+    today = timezone.now().date()
+    for user in seeded:
+        tasks = (
+            TaskFactory.build(owner=user, due_date=today + _due_in(i))
+            for i in range(tasks_per_user)
+        )
+        while batch := list(islice(tasks, batch_size)):
+            Task.objects.bulk_create(batch)
+    counters.rebuild()
+    if not connection.in_atomic_block:
+        # the row counts ANALYZE stores would outlive a rollback, e.g. of a test
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Task._meta.db_table)}")
+    return seeded
+
+
+def _due_in(i: int) -> timedelta:
+    # every other task is upcoming, the API lists only those, the rest is past
+    days = i // 2 % 365
+    return timedelta(days if i % 2 == 0 else -days - 1)
+
+
+def endpoints(user: User, count: int) -> dict[str, Callable[[int], Request]]:
+    """The ``i``-th request to every endpoint, for ``i`` up to ``count``."""
+    not_done = Task.objects.upcoming(user).filter(~Q(state=TaskState.DONE))
+    task_ids = [str(pk) for pk in not_done.values_list("pk", flat=True)[:count]]
+    if len(task_ids) < count:
+        raise ValueError(
+            f"{user.email} has {len(task_ids)} upcoming tasks that are not done, "
+            f"{count} are needed."
+        )
+    task = {
+        "title": "Benchmark",
+        "description": "Created by benchmark_api.",
+        "due_date": str(timezone.now().date() + timedelta(30)),
+    }
+    credentials = {"email": user.email, "password": COMMON_PASSWORD}
+    return {
+        "list": lambda i: ("get", "/tasks/", None),
+        "retrieve": lambda i: ("get", f"/tasks/{task_ids[i]}/", None),
+        "create": lambda i: ("post", "/tasks/", task),
+        # the same tasks move to-do, in progress and done, every request updates
+        "mark-to-do": lambda i: ("post", f"/tasks/{task_ids[i]}/mark-to-do/", None),
+        "mark-in-progress": lambda i: (
+            "post",
+            f"/tasks/{task_ids[i]}/mark-in-progress/",
+            None,
+        ),
+        "mark-done": lambda i: ("post", f"/tasks/{task_ids[i]}/mark-done/", None),
+        "login": lambda i: ("post", "/users/login/", credentials),
+    }
+
+
+def measure(
+    client: Client, make_request: Callable[[int], Request], requests: int, warmup: int
+) -> dict:
+    """Send ``warmup`` and then ``requests`` timed requests one after the other.
+
+    Queries are counted through Django's debug cursor, which adds microseconds
+    to every query.
+    """
+    for i in range(warmup):
+        method, path, data = make_request(i)
+        getattr(client, method)(path, data, content_type="application/json")
+
+    timings = []
+    queries = []
+    errors = 0
+    start = time.perf_counter()
+    for i in range(warmup, warmup + requests):
+        method, path, data = make_request(i)
+        with CaptureQueriesContext(connection) as context:
+            request_start = time.perf_counter()
+            response = getattr(client, method)(
+                path, data, content_type="application/json"
+            )
+            timings.append((time.perf_counter() - request_start) * 1000)
+        queries.append(len(context))
+        errors += response.status_code >= 400
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(percentiles[49], 3),
+        "p95_ms": round(percentiles[94], 3),
+        "p99_ms": round(percentiles[98], 3),
+        "queries": statistics.median_low(queries),
+        "max_queries": max(queries),
+    }
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return settings.LAST_COMMIT
+
+
+def run(
+    users: int = 10,
+    tasks_per_user: int = 1000,
+    requests: int = 200,
+    login_requests: int = 20,
+    warmup: int = 10,
+) -> dict:
+    """Seed the database and measure every endpoint with the first user."""
+    user, *_ = seed(users, tasks_per_user)
+    client = Client()
+    client.force_login(user)
+    results = {}
+    # DEBUG is off, but the test Client's host is not one of ours
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for name, make_request in endpoints(user, warmup + requests).items():
+            if name == "login":
+                # a client of its own, logging in cycles the session
+                results[name] = measure(Client(), make_request, login_requests, 1)
+            else:
+                results[name] = measure(client, make_request, requests, warmup)
+
+    return {
+        "commit": _commit(),
+        "version": __version__,
+        "config": {
+            "users": users,
+            "tasks_per_user": tasks_per_user,
+            "requests": requests,
+            "login_requests": login_requests,
+            "warmup": warmup,
+            "fast_json": settings.FAST_JSON_ENABLED,
+            "tasks_cache": settings.TASKS_CACHE_ENABLED,
+            "async_views": settings.TASKS_ASYNC_VIEWS,
+            "users_cache_timeout": settings.USERS_CACHE_TIMEOUT,
+            "session_engine": settings.SESSION_ENGINE.rsplit(".", 1)[-1],
+            "db_pool": bool(connection.settings_dict["OPTIONS"].get("pool")),
+            "password_hasher": settings.PASSWORD_HASHERS[0].rsplit(".", 1)[-1],
+        },
+        "endpoints": results,
+    }
+
+
+def compare(result: dict, baseline: dict) -> dict:
+    """Change of every endpoint's numbers since ``baseline``, in percent."""
+    changes = {}
+    for name, numbers in result["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(name)
+        if old is None:
+            continue
+        changes[name] = {
+            key: round((numbers[key] - old[key]) / old[key] * 100, 1)
+            for key in ("p50_ms", "p95_ms", "requests_per_second", "queries")
+            if old.get(key)
+        }
+    return {"baseline_commit": baseline.get("commit"), "change_percent": changes}
@@ -0,0 +1 @@
+"""PostgreSQL backend with an optional connection pool, see base.py."""
@@ -0,0 +1,127 @@
+"""PostgreSQL backend with an optional psycopg connection pool.
+
+A backport of the pool of Django 5.1's PostgreSQL backend, configured the same
+way, with ``OPTIONS["pool"]`` set to ``True`` or to ``ConnectionPool`` arguments.
+Without it the backend is Django's one. Django closes the connection of a thread
+at the end of every request (``CONN_MAX_AGE = 0``), which gives it back to the
+pool instead of closing it, so WSGI and ASGI workers reuse their connections.
+"""
+
+from typing import Any, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql.base import (
+    DatabaseWrapper as PostgreSQLDatabaseWrapper,
+)
+from django.utils.asyncio import async_unsafe
+from psycopg import IsolationLevel
+
+from taskmanager.db.creation import DatabaseCreation
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover
+    ConnectionPool = None
+
+
+class DatabaseWrapper(PostgreSQLDatabaseWrapper):
+    creation_class = DatabaseCreation
+    # pools of this process per database alias
+    _connection_pools: dict[str, Any] = {}
+
+    @property
+    def pool(self) -> Optional[Any]:
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+
+        pool = self._connection_pools.get(self.alias)
+        name = self.settings_dict["NAME"]
+        if pool is not None and name and pool.kwargs.get("dbname") != name:
+            # the test runner moved the alias to the test database
+            self.close_pool()
+            pool = None
+        if pool is None:
+            if self.settings_dict["CONN_MAX_AGE"] != 0:
+                raise ImproperlyConfigured(
+                    "Pooling doesn't support persistent connections."
+                )
+            if ConnectionPool is None:
+                raise ImproperlyConfigured(
+                    "Error loading psycopg_pool module.\n"
+                    "Did you install psycopg-pool?"
+                )
+            if pool_options is True:
+                pool_options = {}
+            connect_kwargs = self.get_connection_params()
+            # Django sets autocommit when it takes the connection
+            connect_kwargs["autocommit"] = True
+            check = None
+            if self.settings_dict["CONN_HEALTH_CHECKS"]:
+                check = ConnectionPool.check_connection
+            pool = ConnectionPool(
+                kwargs=connect_kwargs,
+                # opened by the first connection, not at startup or in a uwsgi
+                # master that forks workers afterwards
+                open=False,
+                check=check,
+                name=self.alias,
+                **pool_options,
+            )
+            # threads creating a pool at the same time keep the first one
+            pool = self._connection_pools.setdefault(self.alias, pool)
+        return pool
+
+    def close_pool(self) -> None:
+        pool = self._connection_pools.pop(self.alias, None)
+        if pool is not None:
+            pool.close()
+
+    def get_connection_params(self) -> dict:
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params: dict) -> Any:
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        pool.open()
+        connection = pool.getconn()
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = IsolationLevel(isolation_level)
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is not None and self.pool is not None:
+            with self.wrap_database_errors:
+                # the pool that gave the connection, the alias may have a new one
+                self.connection._pool.putconn(self.connection)
+                self.connection = None
+            return None
+        return super()._close()
+
+    def close_if_health_check_failed(self) -> None:
+        if self.pool is not None:
+            # the pool checks connections before handing them out
+            return None
+        return super().close_if_health_check_failed()
+
+
+def pool_stats() -> dict[str, dict]:
+    """Usage of the pools of this process, per database alias.
+
+    ``requests_wait_ms`` is the total time requests waited for a connection and
+    ``requests_waiting`` the number of them waiting right now.
+    """
+    return {
+        alias: pool.get_stats()
+        for alias, pool in DatabaseWrapper._connection_pools.items()
+    }
@@ -0,0 +1,16 @@
+from django.db.backends.postgresql.creation import (
+    DatabaseCreation as PostgreSQLDatabaseCreation,
+)
+
+
+class DatabaseCreation(PostgreSQLDatabaseCreation):
+    """Close the pool before test databases it is connected to are used as
+    templates or dropped."""
+
+    def _clone_test_db(self, suffix: str, verbosity: int, keepdb: bool = False):
+        self.connection.close_pool()
+        return super()._clone_test_db(suffix, verbosity, keepdb)
+
+    def _destroy_test_db(self, test_database_name: str, verbosity: int):
+        self.connection.close_pool()
+        return super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,72 @@
+"""Routing of reads to the read replicas of DATABASE_REPLICAS.
+
+Reads go to a replica only inside of ``read_from_replica()``, which
+``ReplicaReadsMixin`` enters for the safe requests of a view, so every other
+query, e.g. of sessions, the admin or management commands, uses the primary.
+A user that changed something reads from the primary for
+``DATABASE_REPLICA_PIN_SECONDS`` after, so they see their change even before it
+got to the replicas. The pins are kept in the default cache, which has to be
+shared by the workers for the pin of one to hold on the others, the
+``tasks.E002`` check requires it along with replicas.
+Reads in a transaction of the primary stay on the primary too, they may depend
+on its uncommitted writes.
+"""
+
+import random
+from contextvars import ContextVar, Token
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+
+# the replica of the request being served, None reads from the primary
+_replica: ContextVar[Optional[str]] = ContextVar("replica", default=None)
+
+
+def _pin_key(user_id: Any) -> str:
+    return f"replicas:pinned:{user_id}"
+
+
+def pin(user_id: Any) -> None:
+    """Read from the primary for the user's next requests, after a write."""
+    if settings.DATABASE_REPLICAS:
+        cache.set(_pin_key(user_id), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id: Any) -> bool:
+    return cache.get(_pin_key(user_id), False)
+
+
+def read_from_replica(user_id: Any) -> Optional[Token]:
+    """Send the reads that follow to a replica, unless the user is pinned.
+
+    Returns the token for ``reset()``, None if reads stay on the primary.
+    """
+    if not settings.DATABASE_REPLICAS or is_pinned(user_id):
+        return None
+    # one replica per request, so all its reads see the same point in time
+    return _replica.set(random.choice(settings.DATABASE_REPLICAS))
+
+
+def reset(token: Token) -> None:
+    _replica.reset(token)
+
+
+class ReplicaRouter:
+    """Route the reads of read_from_replica() to its replica, see above."""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        replica = _replica.get()
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return replica
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        # else instances read from a replica would be saved to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        # replicas have the rows of the primary
+        return True
@@ -0,0 +1,380 @@
+"""Metrics of the requests, the database pools and the caches.
+
+Counters and histograms keep a shard per thread, so recording a request neither
+takes a lock nor contends with the other threads, and ``/metrics/`` sums the
+shards when Prometheus scrapes it. Every worker process has metrics of its own:
+with ``METRICS_DIR`` set, workers write a snapshot of them to a file of that
+directory every ``METRICS_FLUSH_INTERVAL`` seconds, and the worker serving the
+scrape adds up the snapshots of all of them. Counters of workers that stopped
+are kept, gauges of workers that haven't written a snapshot for a few intervals
+are dropped.
+
+Output is the Prometheus text format, without the ``prometheus_client``
+dependency.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from taskmanager.db.base import pool_stats
+from tasks import cache as task_cache
+from users import backends as user_cache
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# snapshots older than this many flush intervals don't count for gauges
+STALE_INTERVALS = 3
+
+# a metric of a snapshot, as written to the snapshot files:
+# {"name", "type", "help", "labelnames", "samples": [[label values, value]]}
+Family = dict[str, Any]
+
+
+class Metric:
+    """Metric of this process with a shard per thread, see the module's docstring."""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            # once per thread, the shards of threads that ended stay counted
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _shard_items(self) -> Iterable[tuple[tuple, Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # copying a dict is atomic, iterating one another thread writes isn't
+            yield from shard.copy().items()
+
+    def collect(self) -> Family:
+        raise NotImplementedError
+
+    def _family(self, samples: dict) -> Family:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(labels), value] for labels, value in samples.items()],
+        }
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + value
+
+    def collect(self) -> Family:
+        totals: dict[tuple, float] = {}
+        for labels, value in self._shard_items():
+            totals[labels] = totals.get(labels, 0) + value
+        return self._family(totals)
+
+
+class Histogram(Metric):
+    """Histogram with fixed buckets.
+
+    A sample is the count of every bucket, then of ``+Inf``, then the sum.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Iterable[str], buckets: Iterable[float]
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        counts = shard.get(labels)
+        if counts is None:
+            counts = shard[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def collect(self) -> Family:
+        totals: dict[tuple, list] = {}
+        for labels, counts in self._shard_items():
+            total = totals.setdefault(labels, [0] * len(counts))
+            for i, count in enumerate(list(counts)):
+                total[i] += count
+        family = self._family(totals)
+        family["buckets"] = list(self.buckets)
+        return family
+
+
+REGISTRY: list[Metric] = []
+
+REQUESTS = Counter(
+    "taskmanager_http_requests_total",
+    "Requests served, by route name, method and status code.",
+    ["route", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "taskmanager_http_request_duration_seconds",
+    "Time to serve a request, by route name and method.",
+    ["route", "method"],
+    LATENCY_BUCKETS,
+)
+
+
+def _gauge(name: str, help: str, labelnames: list[str], samples: list) -> Family:
+    return {
+        "name": name,
+        "type": "gauge",
+        "help": help,
+        "labelnames": labelnames,
+        "samples": samples,
+    }
+
+
+def collect_pools() -> list[Family]:
+    """Stats of psycopg's pools, e.g. ``pool_available`` or ``requests_waiting``."""
+    samples: dict[str, list] = {}
+    for alias, stats in pool_stats().items():
+        for stat, value in stats.items():
+            samples.setdefault(stat, []).append([[alias], value])
+    return [
+        _gauge(
+            f"taskmanager_db_pool_{stat}",
+            f"{stat} of the connection pool, see psycopg_pool's get_stats().",
+            ["alias"],
+            values,
+        )
+        for stat, values in samples.items()
+    ]
+
+
+def collect_caches() -> list[Family]:
+    """Hits and misses of the task responses' cache and of the users' cache."""
+    samples = [
+        [[cache, result], stats[key]]
+        for cache, stats in (("tasks", task_cache.stats), ("users", user_cache.stats))
+        for result, key in (("hit", "hits"), ("miss", "misses"))
+    ]
+    return [
+        {
+            "name": "taskmanager_cache_requests_total",
+            "type": "counter",
+            "help": "Lookups of the task responses' and the users' caches.",
+            "labelnames": ["cache", "result"],
+            "samples": samples,
+        },
+        _gauge(
+            "taskmanager_users_cache_size",
+            "Number of users cached by the worker processes.",
+            [],
+            [[[], user_cache.size()]],
+        ),
+    ]
+
+
+COLLECTORS: list[Callable[[], list[Family]]] = [collect_pools, collect_caches]
+
+
+def snapshot() -> dict:
+    """All metrics of this process."""
+    families = [metric.collect() for metric in REGISTRY]
+    for collector in COLLECTORS:
+        families.extend(collector())
+    return {"pid": os.getpid(), "time": time.time(), "metrics": families}
+
+
+def merge(snapshots: Iterable[dict], now: Optional[float] = None) -> list[Family]:
+    """Sum the metrics of processes, leaving the gauges of stale snapshots out."""
+    if now is None:
+        now = time.time()
+    stale_before = now - STALE_INTERVALS * settings.METRICS_FLUSH_INTERVAL
+    merged: dict[str, Family] = {}
+    totals: dict[str, dict[tuple, Any]] = {}
+    for process in snapshots:
+        stale = process["time"] < stale_before
+        for family in process["metrics"]:
+            if stale and family["type"] == "gauge":
+                continue
+            name = family["name"]
+            merged.setdefault(name, family)
+            samples = totals.setdefault(name, {})
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                samples[key] = _add(samples.get(key), value)
+    return [
+        {**family, "samples": [[list(k), v] for k, v in totals[name].items()]}
+        for name, family in merged.items()
+    ]
+
+
+def _add(total: Any, value: Any) -> Any:
+    if total is None:
+        return value
+    if isinstance(value, list):
+        return [a + b for a, b in zip(total, value)]
+    return total + value
+
+
+def _labels(names: Iterable[str], values: Iterable[Any], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def render(families: Iterable[Family]) -> str:
+    """Families in the Prometheus text exposition format."""
+    lines = []
+    for family in sorted(families, key=lambda family: family["name"]):
+        name, labelnames = family["name"], family["labelnames"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labels, value in sorted(family["samples"]):
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(labelnames, labels)} {value}")
+                continue
+            cumulative = 0
+            bounds = [*family["buckets"], "+Inf"]
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                le = _labels(labelnames, labels, le=str(bound))
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labelnames, labels)} {value[-1]}")
+            lines.append(f"{name}_count{_labels(labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(directory: str, data: Optional[dict] = None) -> None:
+    """Write this process's snapshot to ``directory``, replacing the last one."""
+    if data is None:
+        data = snapshot()
+    path = Path(directory) / f"{data['pid']}.json"
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(data))
+    # readers see the previous snapshot or this one, never a partial file
+    os.replace(temporary, path)
+
+
+def read_snapshots(directory: str) -> list[dict]:
+    snapshots = []
+    for path in Path(directory).glob("*.json"):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            logger.warning("Skipped the unreadable metrics snapshot %s.", path)
+    return snapshots
+
+
+def exposition() -> str:
+    """Metrics of all the worker processes, or of this one without METRICS_DIR."""
+    data = snapshot()
+    directory = settings.METRICS_DIR
+    if not directory:
+        return render(merge([data]))
+    write_snapshot(directory, data)
+    return render(merge(read_snapshots(directory)))
+
+
+_flushing_pid: Optional[int] = None
+_flushing_lock = threading.Lock()
+
+
+def start_flushing(directory: str, interval: float) -> None:
+    """Write snapshots of this process every ``interval`` seconds and at exit."""
+    global _flushing_pid
+    with _flushing_lock:
+        # once per process, a forked worker starts a thread of its own
+        if _flushing_pid == os.getpid():
+            return
+        _flushing_pid = os.getpid()
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    def flush() -> None:
+        try:
+            write_snapshot(directory)
+        except OSError:
+            logger.exception("Writing the metrics snapshot failed.")
+
+    def run() -> None:
+        while True:
+            time.sleep(interval)
+            flush()
+
+    flush()
+    threading.Thread(target=run, name="metrics-flush", daemon=True).start()
+    atexit.register(flush)
+
+
+class MetricsMiddleware:
+    """Count requests and their latency by route name, method and status.
+
+    The route is the URL's name, e.g. ``tasks:task-mark-done``, so the metrics of
+    a task don't depend on its id; requests of unknown URLs are ``unmatched``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        if settings.METRICS_DIR:
+            start_flushing(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def record(request: HttpRequest, response: HttpResponse, seconds: float) -> None:
+        match = request.resolver_match
+        route = match.view_name if match is not None else "unmatched"
+        REQUESTS.inc(route, request.method, str(response.status_code))
+        REQUEST_DURATION.observe(seconds, route, request.method)
@@ -0,0 +1,44 @@
+"""JSON parser backed by orjson."""
+
+from typing import IO, Any, Optional
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from taskmanager.renderers import ORJSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser that parses with orjson, or with json when it isn't installed.
+
+    orjson only reads UTF-8, bodies in other charsets are decoded first. Like
+    JSONParser in strict mode, NaN and Infinity are rejected.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: Optional[str] = None,
+        parser_context: Optional[dict] = None,
+    ) -> Any:
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            content = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
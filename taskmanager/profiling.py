@@ -0,0 +1,204 @@
+"""On-demand sampling profiler of live requests.
+
+ProfilingMiddleware profiles the requests of staff users sending an ``X-Profile``
+header and ``PROFILING_SAMPLE_RATE`` of all requests. While a request is served,
+a thread of its own samples the stack of the thread serving it every
+``PROFILING_INTERVAL`` seconds, so the request runs unchanged, only sharing the
+GIL. The samples are saved as folded stacks, the input of flamegraph.pl and
+speedscope, to ``PROFILING_DIR``, which keeps the last ``PROFILING_MAX_PROFILES``
+of them. Staff users list and download them at ``/admin/profiles/``.
+
+Under ASGI the request moves between threads, so every thread of the worker is
+sampled: a profile shows the code of the requests other users made meanwhile,
+and every sample walks the stacks of all the threads while holding the GIL.
+Hence profiling is off unless ``PROFILING_ENABLED`` is set.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+
+# request header with which staff users ask for a profile of their request
+HEADER = "X-Profile"
+# response header with the id of the saved profile
+ID_HEADER = "X-Profile-Id"
+
+
+class Sampler:
+    """Counts the stacks of a thread, or of all others, sampled in a new thread."""
+
+    def __init__(self, interval: float, thread_id: Optional[int] = None) -> None:
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_id is None or thread_id == self.thread_id:
+                    self.stacks[fold(frame)] += 1
+
+
+def fold(frame: Optional[FrameType]) -> str:
+    """The stack of ``frame`` as ``module.function`` names from its root, by ``;``."""
+    names = []
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}.{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def get_directory() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+def save_profile(profile: dict) -> None:
+    """Write a profile and delete the oldest ones over PROFILING_MAX_PROFILES."""
+    directory = get_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{profile['id']}.json"
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(profile))
+    os.replace(temporary, path)
+
+    # ids start with the time, so the oldest come first
+    paths = sorted(directory.glob("*.json"))
+    for old_path in paths[: max(len(paths) - settings.PROFILING_MAX_PROFILES, 0)]:
+        # another worker may have deleted it already
+        old_path.unlink(missing_ok=True)
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    path = get_directory() / f"{profile_id}.json"
+    # ids of URLs are slugs, they can't point outside of the directory
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def list_profiles() -> list[dict]:
+    """Profiles without their stacks, the newest first."""
+    profiles = []
+    for path in sorted(get_directory().glob("*.json"), reverse=True):
+        profile = load_profile(path.stem)
+        if profile is not None:
+            profile.pop("stacks")
+            profiles.append(profile)
+    return profiles
+
+
+def folded(profile: dict) -> str:
+    """Stacks of a profile in the folded format, a line per stack and its count."""
+    return "".join(f"{stack} {count}\n" for stack, count in profile["stacks"].items())
+
+
+class ProfilingMiddleware:
+    """Profile requests asked for by staff users and a sample of all, see above."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+        asked = HEADER in request.headers and request.user.is_staff
+        if not asked and random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        sampler = Sampler(settings.PROFILING_INTERVAL, threading.get_ident())
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+        seconds = time.perf_counter() - start
+        response[ID_HEADER] = self.save(request, response, asked, stacks, seconds)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        asked = HEADER in request.headers and (await request.auser()).is_staff
+        if not asked and random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        sampler = Sampler(settings.PROFILING_INTERVAL)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stacks = await sync_to_async(sampler.stop)()
+        seconds = time.perf_counter() - start
+        # reads the user, which may not be loaded yet, and writes a file
+        response[ID_HEADER] = await sync_to_async(self.save)(
+            request, response, asked, stacks, seconds
+        )
+        return response
+
+    @staticmethod
+    def save(
+        request: HttpRequest,
+        response: HttpResponse,
+        asked: bool,
+        stacks: Counter,
+        seconds: float,
+    ) -> str:
+        """Save the profile of a request, return its id."""
+        created = timezone.now()
+        match = request.resolver_match
+        # DRF sets the user it authenticated, e.g. by a token, on the request
+        user: AbstractBaseUser = getattr(request, "user", AnonymousUser())
+        profile = {
+            "id": f"{created:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}",
+            "created": created.isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "route": match.view_name if match is not None else None,
+            "status": response.status_code,
+            "user_id": str(user.pk) if user.is_authenticated else None,
+            "trigger": "header" if asked else "sample",
+            "duration_ms": round(seconds * 1000, 3),
+            "interval_ms": settings.PROFILING_INTERVAL * 1000,
+            "samples": sum(stacks.values()),
+            "stacks": dict(stacks.most_common()),
+        }
+        save_profile(profile)
+        return profile["id"]
@@ -0,0 +1,54 @@
+"""JSON renderer backed by orjson."""
+
+from typing import Any, Optional
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that serializes with orjson.
+
+    orjson encodes UUIDs, dates and datetimes natively and leaves everything else
+    (lazy strings, Decimals, querysets...) to DRF's encoder, so the output matches
+    JSONRenderer's. Indented, ASCII-only or non-strict output, orjson being absent
+    or data it refuses (e.g. integers over 64 bits) fall back to JSONRenderer.
+    """
+
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[dict] = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Like JSONRenderer, escape \u2028 and \u2029 to stay a javascript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
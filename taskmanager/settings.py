@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "tasks",
     "users",
 ]
@@ -51,11 +52,15 @@ if DEBUG:
 
 
 MIDDLEWARE = [
+    "taskmanager.metrics.MetricsMiddleware",
+    "taskmanager.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # after AuthenticationMiddleware, it profiles requests of staff users on demand
+    "taskmanager.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -67,7 +72,7 @@ ROOT_URLCONF = "taskmanager.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [BASE_DIR / "taskmanager" / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -88,14 +93,66 @@ WSGI_APPLICATION = "taskmanager.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # Django's PostgreSQL backend with an optional connection pool
+        "ENGINE": "taskmanager.db",
         "NAME": env("POSTGRES_DB"),
         "USER": env("POSTGRES_USER"),
         "PASSWORD": env("POSTGRES_PASSWORD"),
         "HOST": env("POSTGRES_HOST"),
         "PORT": env("POSTGRES_PORT"),
+        # seconds a connection is kept open after a request, 0 closes it
+        "CONN_MAX_AGE": env("POSTGRES_CONN_MAX_AGE", cast=int, default=0),
+        "CONN_HEALTH_CHECKS": env(
+            "POSTGRES_CONN_HEALTH_CHECKS", cast=bool, default=False
+        ),
+        "OPTIONS": {},
     }
 }
+# a pool of connections per process, exclusive with CONN_MAX_AGE
+if env("POSTGRES_POOL_ENABLED", cast=bool, default=False):
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": env("POSTGRES_POOL_MIN_SIZE", cast=int, default=2),
+        "max_size": env("POSTGRES_POOL_MAX_SIZE", cast=int, default=10),
+        # seconds a request waits for a free connection before failing
+        "timeout": env("POSTGRES_POOL_TIMEOUT", cast=float, default=10),
+        # seconds after which a connection is replaced with a new one
+        "max_lifetime": env("POSTGRES_POOL_MAX_LIFETIME", cast=float, default=3600),
+    }
+
+# read replicas of the primary as "host[:port]", task reads are routed to them
+DATABASE_REPLICAS = []
+for number, address in enumerate(env.list("POSTGRES_REPLICAS", default=[]), 1):
+    host, _, port = address.partition(":")
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        # tests read from the test database, there's nothing replicating to theirs
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+DATABASE_ROUTERS = ["taskmanager.db.routers.ReplicaRouter"]
+# seconds a user reads from the primary after a write, longer than the replicas lag
+DATABASE_REPLICA_PIN_SECONDS = env("DATABASE_REPLICA_PIN_SECONDS", cast=int, default=5)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+# cache backends keeping their entries in the memory of a worker, or nowhere
+local_cache = CACHES["default"]["BACKEND"].endswith((".LocMemCache", ".DummyCache"))
+# sessions are read from a shared cache and written through to the database, a
+# worker's own cache would keep a session another worker ended
+SESSION_ENGINE = env(
+    "SESSION_ENGINE",
+    default="django.contrib.sessions.backends."
+    + ("db" if local_cache else "cached_db"),
+)
 
 
 # Password validation
@@ -141,19 +198,39 @@ STATIC_ROOT = "/vol/web/static"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
+# ModelBackend keeping Users of sessions and tokens in the memory of a worker
+AUTHENTICATION_BACKENDS = [
+    "users.backends.CachedModelBackend",
+    # loads the users of sessions logged in before CachedModelBackend
+    "django.contrib.auth.backends.ModelBackend",
+]
 
 
 ##################################
 # Django Rest Framework settings #
 ##################################
+# orjson-backed renderer and parser, they fall back to json when it isn't installed
+FAST_JSON_ENABLED = env("FAST_JSON_ENABLED", cast=bool, default=True)
+if FAST_JSON_ENABLED:
+    JSON_PARSER_CLASS = "taskmanager.parsers.ORJSONParser"
+    JSON_RENDERER_CLASS = "taskmanager.renderers.ORJSONRenderer"
+else:
+    JSON_PARSER_CLASS = "rest_framework.parsers.JSONParser"
+    JSON_RENDERER_CLASS = "rest_framework.renderers.JSONRenderer"
+
 REST_FRAMEWORK = {
     "PAGE_SIZE": 30,
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
+        "users.authentication.SignedTokenAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
-    "DEFAULT_PARSER_CLASSES": ["rest_framework.parsers.JSONParser"],
+    "DEFAULT_PARSER_CLASSES": [JSON_PARSER_CLASS],
+    "DEFAULT_RENDERER_CLASSES": [
+        JSON_RENDERER_CLASS,
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
 }
@@ -179,6 +256,65 @@ if OPENAPI_ENABLED:
 ####################
 LAST_COMMIT = env("LAST_COMMIT", default="stub")
 
+# warm workers up when they load the application, /ready/ reports them ready after
+WARMUP_ENABLED = env("WARMUP_ENABLED", cast=bool, default=True)
+# seconds the warm-up and wait_for_db wait for the database
+WARMUP_DB_TIMEOUT = env("WARMUP_DB_TIMEOUT", cast=float, default=30)
+
+# share of the requests reporting their db, serializer and render time, 0 disables it
+SERVER_TIMING_SAMPLE_RATE = env("SERVER_TIMING_SAMPLE_RATE", cast=float, default=0)
+
+# request, database pool and cache metrics served by /metrics/
+METRICS_ENABLED = env("METRICS_ENABLED", cast=bool, default=False)
+# token scrapes send as "Authorization: Bearer <token>", none leaves /metrics/ open
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+# directory the worker processes write their metrics to, so /metrics/ adds them up
+METRICS_DIR = env("METRICS_DIR", default="")
+# seconds between the snapshots a worker writes to METRICS_DIR
+METRICS_FLUSH_INTERVAL = env("METRICS_FLUSH_INTERVAL", cast=float, default=5)
+
+# profile requests of staff users sending an X-Profile header, see /admin/profiles/
+PROFILING_ENABLED = env("PROFILING_ENABLED", cast=bool, default=False)
+# share of all requests profiled, without a header
+PROFILING_SAMPLE_RATE = env("PROFILING_SAMPLE_RATE", cast=float, default=0)
+# seconds between the samples of a profiled request's stack, each one holds the GIL
+PROFILING_INTERVAL = env("PROFILING_INTERVAL", cast=float, default=0.005)
+PROFILING_DIR = env("PROFILING_DIR", default="/tmp/taskmanager-profiles")
+# number of profiles kept, the oldest are deleted
+PROFILING_MAX_PROFILES = env("PROFILING_MAX_PROFILES", cast=int, default=100)
+
+# max number of tasks accepted by a single bulk request
+TASKS_BULK_MAX_SIZE = env("TASKS_BULK_MAX_SIZE", cast=int, default=1000)
+# number of rows sent to the database in a single INSERT
+TASKS_BULK_BATCH_SIZE = env("TASKS_BULK_BATCH_SIZE", cast=int, default=500)
+
+# seconds a worker keeps a User loaded for a session or a token, 0 disables it
+USERS_CACHE_TIMEOUT = env("USERS_CACHE_TIMEOUT", cast=int, default=30)
+# number of users created by a single INSERT of import_users
+USERS_IMPORT_BATCH_SIZE = env("USERS_IMPORT_BATCH_SIZE", cast=int, default=1000)
+# seconds a token of /users/token/ is valid for
+USERS_TOKEN_MAX_AGE = env("USERS_TOKEN_MAX_AGE", cast=int, default=3600)
+
+# serve /tasks/ with AsyncTaskViewSet, on by default under ASGI (see asgi.py)
+TASKS_ASYNC_VIEWS = env("TASKS_ASYNC_VIEWS", cast=bool, default=False)
+# serve /users/login/ with an async view hashing passwords in a pool of threads
+USERS_ASYNC_LOGIN = env("USERS_ASYNC_LOGIN", cast=bool, default=TASKS_ASYNC_VIEWS)
+USERS_HASHING_THREADS = env("USERS_HASHING_THREADS", cast=int, default=2)
+
+# per-owner versioned cache of task list and detail responses
+TASKS_CACHE_ENABLED = env("TASKS_CACHE_ENABLED", cast=bool, default=False)
+TASKS_CACHE_ALIAS = env("TASKS_CACHE_ALIAS", default="default")
+TASKS_CACHE_TIMEOUT = env("TASKS_CACHE_TIMEOUT", cast=int, default=60)
+
+# number of rows fetched from the server-side cursor of an export at a time
+TASKS_EXPORT_CHUNK_SIZE = env("TASKS_EXPORT_CHUNK_SIZE", cast=int, default=2000)
+# number of valid imported rows written by a single COPY
+TASKS_IMPORT_BATCH_SIZE = env("TASKS_IMPORT_BATCH_SIZE", cast=int, default=5000)
+# max number of rejected rows listed in a response of /tasks/import/
+TASKS_IMPORT_MAX_REPORTED_REJECTS = env(
+    "TASKS_IMPORT_MAX_REPORTED_REJECTS", cast=int, default=1000
+)
+
 if DEBUG:
     # for DjangoDebugToolbar and dockers
     hostname, _, ips = gethostbyname_ex(gethostname())
@@ -225,6 +361,12 @@ LOGGING = {
             "handlers": ["local" if DEBUG else "staging"],
             "propagate": True,
         },
+        # a line per request sampled by ServerTimingMiddleware
+        "taskmanager.timing": {
+            "handlers": ["local" if DEBUG else "staging"],
+            "level": "INFO",
+            "propagate": False,
+        },
         # "django.db.backends": {
         #     "level": "DEBUG",
         #     "handlers": ["local"],
@@ -0,0 +1,74 @@
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+
+from taskmanager import benchmarks
+from tasks.models import Task, TaskCounter
+from users.models import User
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BenchmarkSuiteTestCase(TestCase):
+    """TestCase for the API benchmark suite on a small data set."""
+
+    def test_seed_inserts_users_with_tasks(self):
+        users = benchmarks.seed(users=2, tasks_per_user=30, batch_size=7)
+
+        self.assertEqual(User.objects.count(), 2)
+        for user in users:
+            self.assertEqual(Task.objects.filter(owner=user).count(), 30)
+        counted = TaskCounter.objects.aggregate(total=Sum("count"))["total"]
+        self.assertEqual(counted, 60)
+
+    # sessions come from the cache, as with a shared CACHE_URL
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_run_measures_every_endpoint(self):
+        result = benchmarks.run(
+            users=1, tasks_per_user=100, requests=3, login_requests=2, warmup=1
+        )
+
+        self.assertEqual(
+            list(result["endpoints"]),
+            [
+                "list",
+                "retrieve",
+                "create",
+                "mark-to-do",
+                "mark-in-progress",
+                "mark-done",
+                "login",
+            ],
+        )
+        for name, numbers in result["endpoints"].items():
+            with self.subTest(name):
+                self.assertEqual(numbers["errors"], 0)
+                self.assertGreater(numbers["requests_per_second"], 0)
+                self.assertLessEqual(numbers["p50_ms"], numbers["p99_ms"])
+        self.assertEqual(result["endpoints"]["retrieve"]["queries"], 1)
+        self.assertEqual(result["config"]["session_engine"], "cached_db")
+        self.assertEqual(result["config"]["password_hasher"], "MD5PasswordHasher")
+
+    def test_run_fails_without_enough_tasks(self):
+        with self.assertRaises(ValueError):
+            benchmarks.run(users=1, tasks_per_user=4, requests=3, warmup=1)
+
+    def test_compare(self):
+        baseline = {
+            "commit": "abc1234",
+            "endpoints": {"list": {"p50_ms": 10, "p95_ms": 20, "queries": 2}},
+        }
+        result = {
+            "endpoints": {
+                "list": {"p50_ms": 5, "p95_ms": 30, "queries": 2},
+                "login": {"p50_ms": 100},
+            }
+        }
+
+        self.assertEqual(
+            benchmarks.compare(result, baseline),
+            {
+                "baseline_commit": "abc1234",
+                "change_percent": {
+                    "list": {"p50_ms": -50.0, "p95_ms": 50.0, "queries": 0.0}
+                },
+            },
+        )
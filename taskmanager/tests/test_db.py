@@ -0,0 +1,82 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection, connections
+from django.test import TestCase
+
+from taskmanager.db.base import DatabaseWrapper, pool_stats
+
+
+class PooledDatabaseWrapperTestCase(TestCase):
+    """TestCase for the connection pool of the PostgreSQL backend.
+
+    Connections are taken from a pool of the test database under their own alias,
+    outside of the test's transaction.
+    """
+
+    alias = "pooled"
+
+    def setUp(self) -> None:
+        self.wrappers = []
+        # contrib.postgres looks new connections up by alias, it gets a plain one
+        connections.settings[self.alias] = {**connection.settings_dict, "OPTIONS": {}}
+
+    def tearDown(self) -> None:
+        for wrapper in self.wrappers:
+            wrapper.close()
+        if self.wrappers:
+            self.wrappers[0].close_pool()
+        connections[self.alias].close()
+        del connections[self.alias]
+        del connections.settings[self.alias]
+
+    def _make_wrapper(self, **pool_options) -> DatabaseWrapper:
+        settings_dict = {
+            **connection.settings_dict,
+            "OPTIONS": {"pool": {"min_size": 0, "max_size": 2, **pool_options}},
+        }
+        wrapper = DatabaseWrapper(settings_dict, alias=self.alias)
+        self.wrappers.append(wrapper)
+        return wrapper
+
+    @staticmethod
+    def _backend_pid(wrapper: DatabaseWrapper) -> int:
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    def test_closed_connections_are_reused(self):
+        wrapper = self._make_wrapper()
+
+        first_pid = self._backend_pid(wrapper)
+        wrapper.close()
+        second_pid = self._backend_pid(wrapper)
+
+        self.assertEqual(first_pid, second_pid)
+        self.assertEqual(pool_stats()[self.alias]["connections_num"], 1)
+
+    def test_waiting_for_a_connection_times_out(self):
+        self._backend_pid(self._make_wrapper(max_size=1, timeout=0.1))
+        waiting = self._make_wrapper(max_size=1, timeout=0.1)
+
+        with self.assertRaises(OperationalError):
+            self._backend_pid(waiting)
+
+        stats = pool_stats()[self.alias]
+        self.assertEqual(stats["requests_errors"], 1)
+        self.assertGreater(stats["requests_wait_ms"], 0)
+
+    def test_broken_connections_are_replaced_with_health_checks(self):
+        wrapper = self._make_wrapper()
+        wrapper.settings_dict["CONN_HEALTH_CHECKS"] = True
+        pid = self._backend_pid(wrapper)
+        wrapper.close()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+
+        self.assertNotEqual(self._backend_pid(wrapper), pid)
+
+    def test_pool_cannot_be_used_with_persistent_connections(self):
+        wrapper = self._make_wrapper()
+        wrapper.settings_dict["CONN_MAX_AGE"] = 60
+
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.cursor()
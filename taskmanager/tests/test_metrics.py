@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND
+from rest_framework.test import APITestCase
+
+from taskmanager import metrics
+from tasks.factories import TaskFactory
+from tasks.models import TaskState
+from users.factories import UserFactory
+
+
+class MetricsRegistryTestCase(TestCase):
+    """TestCase for the counters and histograms of the metrics registry."""
+
+    def _metric(self, metric: metrics.Metric) -> metrics.Metric:
+        self.addCleanup(metrics.REGISTRY.remove, metric)
+        return metric
+
+    def test_counter_adds_up_the_shards_of_all_threads(self):
+        counter = self._metric(metrics.Counter("test_total", "Test.", ["kind"]))
+
+        def count() -> None:
+            for _ in range(1000):
+                counter.inc("a")
+            counter.inc("b", value=2)
+
+        threads = [threading.Thread(target=count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(counter._shards), 4)
+        self.assertEqual(
+            sorted(counter.collect()["samples"]), [[["a"], 4000], [["b"], 8]]
+        )
+
+    def test_histogram_is_rendered_with_cumulative_buckets(self):
+        histogram = self._metric(
+            metrics.Histogram("test_seconds", "Test.", ["route"], [0.1, 1])
+        )
+        for seconds in (0.05, 0.1, 0.5, 3):
+            histogram.observe(seconds, 'say "hi"')
+
+        content = metrics.render([histogram.collect()])
+
+        self.assertEqual(
+            content,
+            "# HELP test_seconds Test.\n"
+            "# TYPE test_seconds histogram\n"
+            'test_seconds_bucket{route="say \\"hi\\"",le="0.1"} 2\n'
+            'test_seconds_bucket{route="say \\"hi\\"",le="1"} 3\n'
+            'test_seconds_bucket{route="say \\"hi\\"",le="+Inf"} 4\n'
+            'test_seconds_sum{route="say \\"hi\\""} 3.65\n'
+            'test_seconds_count{route="say \\"hi\\""} 4\n',
+        )
+
+    @override_settings(METRICS_FLUSH_INTERVAL=5)
+    def test_merge_adds_up_processes_and_drops_stale_gauges(self):
+        def process(pid: int, age: float, requests: int, buckets: list) -> dict:
+            return {
+                "pid": pid,
+                "time": time.time() - age,
+                "metrics": [
+                    {
+                        "name": "requests_total",
+                        "type": "counter",
+                        "help": "Requests.",
+                        "labelnames": ["route"],
+                        "samples": [[["task-list"], requests]],
+                    },
+                    {
+                        "name": "duration_seconds",
+                        "type": "histogram",
+                        "help": "Duration.",
+                        "labelnames": [],
+                        "buckets": [1],
+                        "samples": [[[], buckets]],
+                    },
+                    {
+                        "name": "pool_size",
+                        "type": "gauge",
+                        "help": "Pool size.",
+                        "labelnames": [],
+                        "samples": [[[], 2]],
+                    },
+                ],
+            }
+
+        merged = metrics.merge(
+            [
+                process(1, age=0, requests=3, buckets=[2, 1, 2.5]),
+                process(2, age=1, requests=4, buckets=[1, 0, 0.5]),
+                # a worker that stopped, its requests still count
+                process(3, age=60, requests=5, buckets=[0, 1, 2]),
+            ]
+        )
+
+        samples = {family["name"]: family["samples"] for family in merged}
+        self.assertEqual(samples["requests_total"], [[["task-list"], 12]])
+        self.assertEqual(samples["duration_seconds"], [[[], [3, 2, 5.0]]])
+        self.assertEqual(samples["pool_size"], [[[], 4]])
+
+
+@override_settings(METRICS_ENABLED=True)
+class MetricsEndpointTestCase(APITestCase):
+    """TestCase for MetricsMiddleware and the metrics endpoint."""
+
+    # warming up opens the connections of the replicas too, if there are any
+    databases = "__all__"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+        cls.task = TaskFactory(owner=cls.user, state=TaskState.TO_DO)
+
+    def setUp(self) -> None:
+        self.url = reverse("metrics")
+
+    @staticmethod
+    def _requests(route: str, method: str, status: str) -> int:
+        samples = metrics.REQUESTS.collect()["samples"]
+        return dict((tuple(labels), value) for labels, value in samples).get(
+            (route, method, status), 0
+        )
+
+    def test_requests_are_counted_by_route_name(self):
+        route = "tasks:task-mark-done"
+        before = self._requests(route, "POST", "200")
+        self.client.force_authenticate(self.user)
+
+        self.client.post(reverse("tasks:task-mark-done", args=[self.task.pk]))
+        self.client.get("/missing/")
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+        self.assertEqual(self._requests(route, "POST", "200"), before + 1)
+        content = response.content.decode()
+        self.assertIn(
+            "taskmanager_http_request_duration_seconds_bucket"
+            f'{{route="{route}",method="POST",le="+Inf"}}',
+            content,
+        )
+        self.assertIn('{route="unmatched",method="GET",status="404"}', content)
+        self.assertIn(
+            'taskmanager_cache_requests_total{cache="users",result="hit"}', content
+        )
+
+    def test_adds_up_the_snapshots_of_all_workers(self):
+        # loads the middleware, so this client doesn't start writing snapshots
+        self.client.get(reverse("ready"))
+        requests = self._requests("ready", "GET", "200")
+        with TemporaryDirectory() as directory:
+            other_worker = metrics.snapshot()
+            other_worker["pid"] = os.getpid() + 1
+            metrics.write_snapshot(directory, other_worker)
+            (Path(directory) / "broken.json").write_text("{")
+
+            with override_settings(METRICS_DIR=directory):
+                with self.assertLogs("taskmanager.metrics", "WARNING"):
+                    response = self.client.get(self.url)
+
+            own_snapshot = Path(directory) / f"{os.getpid()}.json"
+            self.assertTrue(own_snapshot.exists())
+            self.assertEqual(len(json.loads(own_snapshot.read_text())["metrics"]), 4)
+        self.assertIn(
+            'taskmanager_http_requests_total{route="ready",method="GET",'
+            f'status="200"}} {2 * requests}',
+            response.content.decode(),
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_need_the_token_when_it_is_set(self):
+        missing = self.client.get(self.url)
+        wrong = self.client.get(self.url, headers={"Authorization": "Bearer wrong"})
+        response = self.client.get(self.url, headers={"Authorization": "Bearer secret"})
+
+        self.assertEqual(missing.status_code, HTTP_401_UNAUTHORIZED)
+        self.assertEqual(wrong.status_code, HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_requests_are_not_counted_when_disabled(self):
+        route = "tasks:task-detail"
+        before = self._requests(route, "GET", "200")
+        self.client.force_authenticate(self.user)
+
+        self.client.get(reverse(route, args=[self.task.pk]))
+        response = self.client.get(self.url)
+
+        self.assertEqual(self._requests(route, "GET", "200"), before)
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
@@ -0,0 +1,40 @@
+from io import BytesIO
+from unittest.mock import patch
+
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APITestCase
+
+from taskmanager.parsers import ORJSONParser
+
+
+class ORJSONParserTestCase(APITestCase):
+    """TestCase for ORJSONParser."""
+
+    def setUp(self) -> None:
+        self.parser = ORJSONParser()
+
+    def test_parse(self):
+        stream = BytesIO('{"title": "Zażółć", "ids": [1, 2.5, null]}'.encode())
+
+        data = self.parser.parse(stream)
+
+        self.assertEqual(data, {"title": "Zażółć", "ids": [1, 2.5, None]})
+
+    def test_parse_other_encoding(self):
+        stream = BytesIO('{"title": "Zażółć"}'.encode("utf-16"))
+
+        data = self.parser.parse(stream, parser_context={"encoding": "utf-16"})
+
+        self.assertEqual(data, {"title": "Zażółć"})
+
+    def test_parse_invalid_json_raises_parse_error(self):
+        for content in [b"{", b'{"a": NaN}', b"\xff"]:
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError):
+                    self.parser.parse(BytesIO(content))
+
+    def test_falls_back_to_json_parser_without_orjson(self):
+        with patch("taskmanager.parsers.orjson", None):
+            data = self.parser.parse(BytesIO(b'{"a": [1, 2]}'))
+
+        self.assertEqual(data, {"a": [1, 2]})
@@ -0,0 +1,131 @@
+import threading
+import time
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_302_FOUND, HTTP_404_NOT_FOUND
+
+from taskmanager import profiling
+from users.factories import UserFactory
+
+
+def spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class SamplerTestCase(TestCase):
+    """TestCase for the Sampler of stacks."""
+
+    def test_samples_the_stack_of_a_thread(self):
+        thread = threading.Thread(target=spin, args=(0.2,))
+        thread.start()
+        sampler = profiling.Sampler(0.005, thread.ident)
+
+        sampler.start()
+        thread.join()
+        stacks = sampler.stop()
+
+        self.assertEqual(
+            list(stacks),
+            [
+                "threading.Thread._bootstrap;threading.Thread._bootstrap_inner;"
+                f"threading.Thread.run;{__name__}.spin"
+            ],
+        )
+        self.assertGreater(stacks.total(), 5)
+
+
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingMiddlewareTestCase(TestCase):
+    """TestCase for ProfilingMiddleware and the admin pages of profiles."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.staff = UserFactory(is_staff=True)
+        cls.user = UserFactory()
+
+    def setUp(self) -> None:
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(PROFILING_DIR=directory.name))
+        self.url = reverse("tasks:task-list")
+
+    def test_profiles_requests_of_staff_users_asking_for_it(self):
+        self.client.force_login(self.staff)
+
+        response = self.client.get(self.url, headers={"X-Profile": "1"})
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        profile = profiling.load_profile(response["X-Profile-Id"])
+        self.assertEqual(
+            {key: profile[key] for key in ("method", "path", "route", "status")},
+            {
+                "method": "GET",
+                "path": self.url,
+                "route": "tasks:task-list",
+                "status": 200,
+            },
+        )
+        self.assertEqual(profile["user_id"], str(self.staff.pk))
+        self.assertEqual(profile["trigger"], "header")
+        self.assertEqual(profile["samples"], sum(profile["stacks"].values()))
+
+    def test_ignores_the_header_of_other_users(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url, headers={"X-Profile": "1"})
+
+        self.assertFalse(response.has_header("X-Profile-Id"))
+        self.assertEqual(profiling.list_profiles(), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_MAX_PROFILES=2)
+    def test_keeps_the_newest_profiles_of_the_sample(self):
+        self.client.force_login(self.user)
+        ids = [self.client.get(self.url)["X-Profile-Id"] for _ in range(3)]
+
+        profiles = profiling.list_profiles()
+
+        self.assertEqual([p["id"] for p in profiles], ids[:0:-1])
+        self.assertEqual(profiles[0]["trigger"], "sample")
+        self.assertEqual(profiles[0]["user_id"], str(self.user.pk))
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_not_used_when_disabled(self):
+        self.client.force_login(self.staff)
+
+        response = self.client.get(self.url, headers={"X-Profile": "1"})
+
+        self.assertFalse(response.has_header("X-Profile-Id"))
+
+    def test_staff_users_list_and_download_profiles(self):
+        self.client.force_login(self.staff)
+        profile_id = self.client.get(self.url, headers={"X-Profile": "1"})[
+            "X-Profile-Id"
+        ]
+        profile = profiling.load_profile(profile_id)
+        profile["stacks"] = {"a;b": 3, "a;c": 1}
+        profiling.save_profile(profile)
+
+        list_response = self.client.get(reverse("profiles"))
+        response = self.client.get(reverse("profile", args=[profile_id]))
+
+        self.assertEqual(list_response.status_code, HTTP_200_OK)
+        self.assertContains(list_response, reverse("profile", args=[profile_id]))
+        self.assertEqual(response.content, b"a;b 3\na;c 1\n")
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="{profile_id}.folded"',
+        )
+        missing = self.client.get(reverse("profile", args=["missing"]))
+        self.assertEqual(missing.status_code, HTTP_404_NOT_FOUND)
+
+    def test_other_users_are_sent_to_the_admin_login(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("profiles"))
+
+        self.assertEqual(response.status_code, HTTP_302_FOUND)
+        self.assertIn(reverse("admin:login"), response["Location"])
@@ -0,0 +1,75 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from taskmanager.renderers import ORJSONRenderer
+from tasks.factories import TaskFactory
+from users.factories import UserFactory
+
+
+class ORJSONRendererTestCase(APITestCase):
+    """TestCase for ORJSONRenderer."""
+
+    def setUp(self) -> None:
+        self.renderer = ORJSONRenderer()
+        self.data = {
+            "id": uuid4(),
+            "due_date": date(2024, 1, 31),
+            "created_at": datetime(2024, 1, 31, 12, 30, 15, 1234, tzinfo=timezone.utc),
+            "naive": datetime(2024, 1, 31, 12, 30),
+            "price": Decimal("10.50"),
+            "message": _("Not found."),
+            "nested": ReturnDict({"title": "Zażółć gęślą jaźń  "}, serializer=None),
+            "items": (1, 2.5, None, True),
+            "tags": {"a"},
+            1: "non-str key",
+        }
+
+    def test_output_is_identical_to_json_renderer(self):
+        expected_content = JSONRenderer().render(self.data)
+
+        content = self.renderer.render(self.data)
+
+        self.assertEqual(content, expected_content)
+
+    def test_render_none_returns_empty_bytes(self):
+        self.assertEqual(self.renderer.render(None), b"")
+
+    def test_indent_falls_back_to_json_renderer(self):
+        media_type = "application/json; indent=4"
+        expected_content = JSONRenderer().render({"a": 1}, media_type)
+
+        content = self.renderer.render({"a": 1}, media_type)
+
+        self.assertEqual(content, expected_content)
+        self.assertIn(b"\n    ", content)
+
+    def test_big_integers_fall_back_to_json_renderer(self):
+        content = self.renderer.render({"a": 2**70})
+
+        self.assertEqual(content, b'{"a":%d}' % 2**70)
+
+    def test_falls_back_to_json_renderer_without_orjson(self):
+        expected_content = JSONRenderer().render(self.data)
+
+        with patch("taskmanager.renderers.orjson", None):
+            content = self.renderer.render(self.data)
+
+        self.assertEqual(content, expected_content)
+
+    def test_api_responses_are_rendered_with_orjson(self):
+        user = UserFactory()
+        TaskFactory.create_batch(size=3, owner=user)
+        self.client.force_authenticate(user)
+
+        response = self.client.get(reverse("tasks:task-list"))
+
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
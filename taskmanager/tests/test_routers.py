@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router, transaction
+from django.test import override_settings
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+from rest_framework.test import APITransactionTestCase
+
+from taskmanager.db import routers
+from tasks.factories import TaskFactory
+from tasks.models import Task, TaskState
+from users.factories import UserFactory
+
+REPLICA = "replica_test"
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRouterTestCase(APITransactionTestCase):
+    """TestCase for ReplicaRouter and the replica reads of TaskViewSet.
+
+    A second test database stands in for the replica. Nothing replicates to it,
+    so rows written only to it show which database a read went to.
+    """
+
+    # the runner sets up the databases before setUpClass() adds the replica's
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        settings_dict = connection.settings_dict
+        connections.settings[REPLICA] = {
+            **settings_dict,
+            "TEST": {**settings_dict["TEST"], "NAME": f"{settings_dict['NAME']}_2"},
+        }
+        cls.old_name = settings_dict["NAME"]
+        connections[REPLICA].creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        connections[REPLICA].creation.destroy_test_db(cls.old_name, verbosity=0)
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self) -> None:
+        # pins are kept in the cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = UserFactory()
+        self.user.save(using=REPLICA)
+        self.replica_task = TaskFactory.build(owner=self.user, state=TaskState.TO_DO)
+        self.replica_task.save(using=REPLICA)
+        self.url = reverse("tasks:task-list")
+        self.client.force_authenticate(self.user)
+
+    def _listed_ids(self) -> list[str]:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        return [task["id"] for task in response.json()["results"]]
+
+    def test_task_reads_go_to_the_replica(self):
+        detail_url = reverse("tasks:task-detail", args=[self.replica_task.pk])
+
+        response = self.client.get(detail_url)
+
+        self.assertEqual(self._listed_ids(), [str(self.replica_task.pk)])
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertFalse(Task.objects.exists())
+
+    def test_users_read_from_the_primary_after_writing(self):
+        task = TaskFactory.build(owner=self.user)
+        data = {
+            "due_date": task.due_date,
+            "title": task.title,
+            "description": task.description,
+        }
+
+        invalid = self.client.post(self.url, {**data, "due_date": "2000-01-01"})
+        ids_after_failing = self._listed_ids()
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(invalid.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(ids_after_failing, [str(self.replica_task.pk)])
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        self.assertEqual(self._listed_ids(), [response.json()["id"]])
+        self.assertTrue(routers.is_pinned(self.user.pk))
+
+    def test_replica_is_reset_after_an_unhandled_error(self):
+        error = RuntimeError("unhandled")
+        with patch("tasks.views.TaskViewSet._list_tasks", side_effect=error):
+            with self.assertRaises(RuntimeError):
+                self.client.get(self.url)
+
+        self.assertEqual(router.db_for_read(Task), DEFAULT_DB_ALIAS)
+
+    def test_reads_in_a_transaction_and_writes_go_to_the_primary(self):
+        token = routers.read_from_replica(self.user.pk)
+        self.addCleanup(routers.reset, token)
+
+        task = Task.objects.get()
+        with transaction.atomic():
+            read_in_transaction = router.db_for_read(Task)
+
+        self.assertEqual(task._state.db, REPLICA)
+        self.assertEqual(read_in_transaction, DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_write(Task, instance=task), DEFAULT_DB_ALIAS)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_go_to_the_primary_without_replicas(self):
+        self.assertIsNone(routers.read_from_replica(self.user.pk))
+        self.assertEqual(self._listed_ids(), [])
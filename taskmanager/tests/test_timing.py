@@ -0,0 +1,116 @@
+import re
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK
+from rest_framework.test import APITestCase
+
+from taskmanager import timing
+from tasks.factories import TaskFactory
+from users.factories import UserFactory
+
+SERVER_TIMING = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", '
+    r"serialize;dur=(?P<serialize>[\d.]+), "
+    r"render;dur=(?P<render>[\d.]+), "
+    r"total;dur=(?P<total>[\d.]+)"
+)
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+class ServerTimingMiddlewareTestCase(APITestCase):
+    """TestCase for ServerTimingMiddleware."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+        TaskFactory.create_batch(size=3, owner=cls.user)
+
+    def setUp(self) -> None:
+        self.url = reverse("tasks:task-list")
+        self.client.force_authenticate(self.user)
+
+    def test_sampled_request_reports_its_timings(self):
+        with self.assertLogs("taskmanager.timing", "INFO") as logs:
+            with self.assertNumQueries(2):
+                response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        match = SERVER_TIMING.fullmatch(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        self.assertEqual(match["queries"], "2")
+        for part in ("db", "serialize", "render"):
+            with self.subTest(part):
+                self.assertGreater(float(match[part]), 0)
+                self.assertLess(float(match[part]), float(match["total"]))
+        (record,) = logs.records
+        self.assertEqual(
+            (record.method, record.path, record.status, record.db_queries),
+            ("GET", self.url, HTTP_200_OK, 2),
+        )
+        self.assertEqual(record.total_ms, float(match["total"]))
+        self.assertIn("db_queries=2", record.getMessage())
+
+    def test_queries_of_other_requests_are_not_counted(self):
+        UserFactory()
+
+        with self.assertLogs("taskmanager.timing", "INFO"):
+            response = self.client.get(reverse("tasks:task-summary"))
+
+        match = SERVER_TIMING.fullmatch(response["Server-Timing"])
+        self.assertEqual(match["queries"], "1")
+
+    @patch("taskmanager.timing.random.random", return_value=0.5)
+    def test_requests_out_of_the_sample_are_not_measured(self, random):
+        with override_settings(SERVER_TIMING_SAMPLE_RATE=0.5):
+            with self.assertNoLogs("taskmanager.timing"):
+                response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_not_used_when_sample_rate_is_zero(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_measure_outside_of_a_request_does_nothing(self):
+        with timing.measure("serialize"):
+            pass
+
+        self.assertIsNone(timing._current.get())
+
+    def test_query_recorder_is_installed_once(self):
+        timing.install_query_recorder(connection)
+        timing.install_query_recorder(connection)
+
+        self.assertEqual(connection.execute_wrappers.count(timing.record_query), 1)
+
+
+@override_settings(
+    SERVER_TIMING_SAMPLE_RATE=1, ROOT_URLCONF="tasks.tests.test_async_views"
+)
+class ServerTimingMiddlewareASGITestCase(TestCase):
+    """TestCase for ServerTimingMiddleware with async views and the ASGI handler."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+
+    async def test_sampled_async_request_reports_its_timings(self):
+        await sync_to_async(TaskFactory)(owner=self.user)
+        await self.async_client.aforce_login(self.user)
+
+        with self.assertLogs("taskmanager.timing", "INFO"):
+            response = await self.async_client.get(reverse("tasks:task-list"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        match = SERVER_TIMING.fullmatch(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        self.assertGreater(int(match["queries"]), 0)
+        self.assertGreater(float(match["render"]), 0)
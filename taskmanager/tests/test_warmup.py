@@ -0,0 +1,162 @@
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import call, patch
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+
+from taskmanager import warmup
+from users.authentication import make_token
+from users.factories import UserFactory
+
+# state of a new process after it loaded the WSGI application, before and after
+# its first request
+FIRST_REQUEST_SCRIPT = """
+import json, sys
+from taskmanager.wsgi import application
+from django.db import connection
+from django.test import Client
+from django.urls import get_resolver
+from rest_framework.settings import api_settings
+from taskmanager import warmup
+
+state = {
+    "ready": warmup.is_ready(),
+    "views_imported": "tasks.views" in sys.modules,
+    "drf_settings_loaded": "DEFAULT_RENDERER_CLASSES" in api_settings._cached_attrs,
+    "urls_populated": get_resolver()._populated,
+    "connected": connection.connection is not None,
+}
+opened = connection.connection
+response = Client(HTTP_AUTHORIZATION=sys.argv[1]).get("/tasks/")
+state["status"] = response.status_code
+state["connection_reused"] = opened is not None and connection.connection is opened
+print(json.dumps(state))
+"""
+
+
+class WaitForDatabaseTestCase(TestCase):
+    """TestCase for wait_for_database."""
+
+    @patch("taskmanager.warmup.time.sleep")
+    def test_retries_with_backoff(self, sleep):
+        error = OperationalError("connection refused")
+        with patch.object(
+            connection, "ensure_connection", side_effect=[error, error, error, None]
+        ) as ensure_connection:
+            warmup.wait_for_database(timeout=60, max_delay=0.5)
+
+        self.assertEqual(ensure_connection.call_count, 4)
+        self.assertEqual(sleep.call_args_list, [call(0.2), call(0.4), call(0.5)])
+
+    @patch("taskmanager.warmup.time.sleep")
+    def test_raises_after_timeout(self, sleep):
+        error = OperationalError("connection refused")
+        with patch.object(connection, "ensure_connection", side_effect=error):
+            with self.assertRaises(OperationalError):
+                warmup.wait_for_database(timeout=0)
+
+        sleep.assert_not_called()
+
+    def test_wait_for_db_command_fails_when_database_is_unavailable(self):
+        error = OperationalError("connection refused")
+        with patch.object(connection, "ensure_connection", side_effect=error):
+            with self.assertRaises(CommandError):
+                call_command("wait_for_db", timeout=0, stdout=open(os.devnull, "w"))
+
+
+class ReadinessTestCase(TestCase):
+    """TestCase for the readiness endpoint and warm_up."""
+
+    # warming up opens the connections of the replicas too, if there are any
+    databases = "__all__"
+
+    def setUp(self) -> None:
+        self.url = reverse("ready")
+        warmup._ready.clear()
+        self.addCleanup(warmup._ready.clear)
+
+    def test_warm_up_times_every_step(self):
+        durations = warmup.warm_up(timeout=0)
+
+        self.assertEqual(
+            list(durations),
+            ["database", "imports", "urls", "translations", "connections", "caches"],
+        )
+        self.assertTrue(warmup.is_ready())
+
+    def test_ready_after_warm_up(self):
+        warmup.warm_up(timeout=0)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "ready"})
+
+    def test_not_ready_when_warm_up_fails(self):
+        error = OperationalError("connection refused")
+        with patch.object(connection, "ensure_connection", side_effect=error):
+            with self.assertLogs("taskmanager.warmup", "ERROR"):
+                response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json(), {"status": "warming up"})
+        self.assertFalse(warmup.is_ready())
+
+    def test_not_ready_when_database_does_not_answer(self):
+        warmup.warm_up(timeout=0)
+
+        with patch.object(
+            connection, "cursor", side_effect=OperationalError("server closed")
+        ):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json(), {"status": "database unavailable"})
+
+
+class FirstRequestTestCase(TransactionTestCase):
+    """TestCase for what a new WSGI worker has ready for its first request."""
+
+    def _first_request(self, warmup_enabled: bool) -> dict:
+        user = UserFactory()
+        env = os.environ | {
+            "POSTGRES_DB": connection.settings_dict["NAME"],
+            # persistent, so the first request can reuse the warm-up's connection
+            "POSTGRES_CONN_MAX_AGE": "60",
+            "ALLOWED_HOSTS": "testserver",
+            "DEBUG": "false",
+            "WARMUP_ENABLED": str(warmup_enabled).lower(),
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_REQUEST_SCRIPT, f"Token {make_token(user)}"],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        return json.loads(result.stdout.splitlines()[-1])
+
+    def test_warm_up_prepares_worker_for_first_request(self):
+        cold = self._first_request(warmup_enabled=False)
+        warm = self._first_request(warmup_enabled=True)
+
+        expected_cold = {
+            "ready": False,
+            "views_imported": False,
+            "drf_settings_loaded": False,
+            "urls_populated": False,
+            "connected": False,
+            "status": HTTP_200_OK,
+            "connection_reused": False,
+        }
+        self.assertEqual(cold, expected_cold)
+        expected_warm = {key: True for key in expected_cold} | {"status": HTTP_200_OK}
+        self.assertEqual(warm, expected_warm)
@@ -0,0 +1,214 @@
+"""Per-request timings of the database, serializers and rendering.
+
+ServerTimingMiddleware measures a sample of the requests and reports where their
+time went in a ``Server-Timing`` header, shown by browsers' developer tools, and
+in a log line with the same numbers as structured fields. Requests that are not
+sampled only pay for a random number and a context variable lookup per query and
+per serializer.
+
+Parts may overlap: a serializer evaluating a lazy queryset counts its queries in
+both ``db`` and ``serialize``.
+"""
+
+import logging
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.template.response import SimpleTemplateResponse
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# parts of a request reported besides the total, in the order of the header
+PARTS = ("db", "serialize", "render")
+
+
+class RequestTimings:
+    """Seconds spent in every part of a request and its number of queries."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.queries = 0
+
+    def fields(self) -> dict[str, Any]:
+        """Milliseconds of every part and of the whole request, for the log."""
+        fields = {f"{part}_ms": round(self.seconds[part] * 1000, 3) for part in PARTS}
+        fields["total_ms"] = round((time.perf_counter() - self.start) * 1000, 3)
+        fields["db_queries"] = self.queries
+        return fields
+
+    def header(self, fields: dict[str, Any]) -> str:
+        metrics = [f'db;dur={fields["db_ms"]};desc="{self.queries} queries"']
+        metrics.extend(f"{part};dur={fields[f'{part}_ms']}" for part in PARTS[1:])
+        metrics.append(f"total;dur={fields['total_ms']}")
+        return ", ".join(metrics)
+
+
+# timings of the request being served, copied into the threads of sync_to_async
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def measure(part: str) -> Iterator[None]:
+    """Add the time spent in the block to ``part`` of the sampled request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.seconds[part] += time.perf_counter() - start
+
+
+def record_query(
+    execute: Callable, sql: str, params: Any, many: bool, context: dict
+) -> Any:
+    """execute_wrapper counting the queries of the sampled request and their time."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.seconds["db"] += time.perf_counter() - start
+        timings.queries += 1
+
+
+def install_query_recorder(connection: BaseDatabaseWrapper) -> None:
+    """Wrap every query of ``connection``, for as long as it lives."""
+    if record_query not in connection.execute_wrappers:
+        # first, so the pop() of connection.execute_wrapper() leaves it in place
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def _install_on_connect(sender: Any, connection: BaseDatabaseWrapper, **kwargs) -> None:
+    # connections are per thread, this catches the ones of sync_to_async's threads
+    install_query_recorder(connection)
+
+
+connection_created.connect(_install_on_connect)
+
+
+class TimedSerializerMixin:
+    """Count the validation and the output of a serializer as ``serialize``."""
+
+    @property
+    def data(self) -> Any:
+        with measure("serialize"):
+            return super().data
+
+    def is_valid(self, *, raise_exception: bool = False) -> bool:
+        with measure("serialize"):
+            return super().is_valid(raise_exception=raise_exception)
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """ListSerializer of the serializers using TimedSerializerMixin."""
+
+
+class ServerTimingMiddleware:
+    """Measure a sample of the requests, see the module's docstring.
+
+    Samples ``SERVER_TIMING_SAMPLE_RATE`` of the requests, it isn't used at 0.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if settings.SERVER_TIMING_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # awaited as is, a sync method would cost every response a thread hop
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, response, timings)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, response, timings)
+        return response
+
+    def process_template_response(
+        self, request: HttpRequest, response: SimpleTemplateResponse
+    ) -> SimpleTemplateResponse:
+        # DRF's Response renders here, as the first middleware this runs last and
+        # the handler's render() after it finds the response rendered
+        if _current.get() is not None:
+            with measure("render"):
+                response.render()
+        return response
+
+    async def aprocess_template_response(
+        self, request: HttpRequest, response: SimpleTemplateResponse
+    ) -> SimpleTemplateResponse:
+        if _current.get() is not None:
+            with measure("render"):
+                await sync_to_async(response.render)()
+        return response
+
+    def report(
+        self, request: HttpRequest, response: HttpResponse, timings: RequestTimings
+    ) -> None:
+        fields = timings.fields()
+        header = timings.header(fields)
+        if response.has_header("Server-Timing"):
+            header = f"{response['Server-Timing']}, {header}"
+        response["Server-Timing"] = header
+        logger.info(
+            "%s %s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            " ".join(f"{name}={value}" for name, value in fields.items()),
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **fields,
+            },
+        )
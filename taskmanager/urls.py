@@ -4,10 +4,21 @@ from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from taskmanager.views import metrics, profile, profiles, readiness
+
 urlpatterns = [
+    # before the admin's URLs, their catch-all would take them for an app's
+    path("admin/profiles/", admin.site.admin_view(profiles), name="profiles"),
+    path(
+        "admin/profiles/<slug:profile_id>/",
+        admin.site.admin_view(profile),
+        name="profile",
+    ),
     path("admin/", admin.site.urls),
     path("tasks/", include("tasks.urls")),
     path("users/", include("users.urls")),
+    path("ready/", readiness, name="ready"),
+    path("metrics/", metrics, name="metrics"),
 ]
 
 if settings.DEBUG:
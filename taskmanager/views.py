@@ -0,0 +1,153 @@
+"""Project-wide views and the base of DRF views with async handlers."""
+
+from contextvars import Token
+from typing import Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.db import DatabaseError, connection
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.template.response import TemplateResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from taskmanager import profiling, warmup
+from taskmanager.db import routers
+from taskmanager.metrics import exposition
+
+
+def readiness(request: HttpRequest) -> JsonResponse:
+    """200 once this worker is warm and its database answers, 503 until then."""
+    # a worker that couldn't warm up when it started tries again, without waiting
+    if not warmup.is_ready() and not warmup.try_warm_up(timeout=0):
+        return JsonResponse({"status": "warming up"}, status=503)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return JsonResponse({"status": "database unavailable"}, status=503)
+    return JsonResponse({"status": "ready"})
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Metrics of all worker processes in the Prometheus text format.
+
+    With METRICS_TOKEN set only requests sending it as a bearer token get them.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    if token and not constant_time_compare(authorization, f"Bearer {token}"):
+        response = HttpResponse("Invalid metrics token.\n", status=401)
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(
+        exposition(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def profiles(request: HttpRequest) -> TemplateResponse:
+    """Admin page listing the saved profiles of requests."""
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "profiles": profiling.list_profiles(),
+    }
+    return TemplateResponse(request, "admin/profiles.html", context)
+
+
+def profile(request: HttpRequest, profile_id: str) -> HttpResponse:
+    """Folded stacks of a profile, for flamegraph.pl or speedscope."""
+    data = profiling.load_profile(profile_id)
+    if data is None:
+        raise Http404
+    response = HttpResponse(profiling.folded(data), content_type="text/plain")
+    response["Content-Disposition"] = f'attachment; filename="{profile_id}.folded"'
+    return response
+
+
+class AsyncAPIViewMixin:
+    """APIView dispatching to async handlers, for views served under ASGI.
+
+    Handlers that are not async run in a thread with ``sync_to_async``.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs) -> Callable:
+        view = super().as_view(*args, **initkwargs)
+        # dispatch() returns a coroutine, let Django await it
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> Response:
+        """APIView.dispatch awaiting the handler, sync handlers run in a thread."""
+        self.args = args
+        self.kwargs = kwargs
+        if hasattr(request, "auser"):
+            # SessionAuthentication reads request.user, load it without blocking
+            request.user = await request.auser()
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            if "Authorization" in request.headers:
+                # authenticators of headers, e.g. of tokens, may query the database
+                # for their user, the session's was loaded above
+                await sync_to_async(self.perform_authentication)(request)
+            self.initial(request, *args, **kwargs)
+            method = request.method.lower()
+            handler = self.http_method_not_allowed
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            if not iscoroutinefunction(handler):
+                handler = sync_to_async(handler)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class ReplicaReadsMixin:
+    """APIView reading from a replica in safe methods, see taskmanager.db.routers.
+
+    After a successful unsafe method the user reads from the primary for a while.
+    """
+
+    replica_token: Optional[Token] = None
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> Response:
+        # finalize_response() is skipped when an error is re-raised, and the next
+        # request of the thread would read from the replica
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            self.read_from_primary()
+
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        # authentication reads from the primary, it may have just logged in
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            self.replica_token = routers.read_from_replica(request.user.pk)
+
+    def finalize_response(
+        self, request: Request, response: Response, *args, **kwargs
+    ) -> Response:
+        # async dispatch() doesn't call the one above, the replica is only set in
+        # the context of its request though
+        self.read_from_primary()
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            if request.user.is_authenticated:
+                routers.pin(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def read_from_primary(self) -> None:
+        if self.replica_token is not None:
+            routers.reset(self.replica_token)
+            self.replica_token = None
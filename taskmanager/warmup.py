@@ -0,0 +1,148 @@
+"""Warm-up of a process before it serves requests.
+
+A worker that just started imports views, serializers and DRF's classes, builds
+the URL resolver, loads translations and connects to the database and the cache
+on its first requests, which makes them slow after every deploy. ``warm_up()``
+does all of it upfront, ``wsgi.py`` and ``asgi.py`` call it when a worker loads
+the application and ``/ready/`` reports the worker ready only once it is warm.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+from django.utils import translation
+from django.utils.module_loading import autodiscover_modules
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+# modules of the apps imported by the first requests
+MODULES = ["serializers", "filters", "permissions", "views", "async_views"]
+
+_ready = threading.Event()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_for_database(
+    alias: str = "default",
+    timeout: float = 30,
+    max_delay: float = 5,
+    log: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Connect to the database, retrying with an exponential backoff.
+
+    Raises the last DatabaseError once ``timeout`` seconds passed.
+    """
+    connection = connections[alias]
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    while True:
+        try:
+            connection.ensure_connection()
+            return
+        except DatabaseError as exc:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+            delay = min(delay * 2, max_delay, remaining)
+            if log is not None:
+                log(f"Database unavailable ({exc}), waiting {delay:.1f} seconds...")
+            time.sleep(delay)
+
+
+def import_modules() -> None:
+    autodiscover_modules(*MODULES)
+    # DRF imports the classes of its settings the first time they are used
+    for name in api_settings.defaults:
+        getattr(api_settings, name)
+
+
+def populate_urls() -> None:
+    # compiles the patterns of every URL and the lookups of reverse()
+    get_resolver().reverse_dict
+
+
+def load_translations() -> None:
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("Not found.")
+
+
+def prime_connections() -> None:
+    for connection in connections.all():
+        connection.ensure_connection()
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            # the pool opens its min_size connections in the background
+            pool.wait(timeout=settings.WARMUP_DB_TIMEOUT)
+        if not connection.in_atomic_block:
+            # non-persistent connections would be closed by the first request anyway
+            connection.close_if_unusable_or_obsolete()
+
+
+def prime_caches() -> None:
+    for alias in settings.CACHES:
+        caches[alias].get("warmup")
+
+
+STEPS: dict[str, Callable[[], None]] = {
+    "imports": import_modules,
+    "urls": populate_urls,
+    "translations": load_translations,
+    "connections": prime_connections,
+    "caches": prime_caches,
+}
+
+
+def warm_up(
+    timeout: Optional[float] = None, log: Optional[Callable[[str], None]] = None
+) -> dict[str, float]:
+    """Wait for the database and warm this process up, returns seconds per step."""
+    if timeout is None:
+        timeout = settings.WARMUP_DB_TIMEOUT
+    durations = {}
+    start = time.perf_counter()
+    wait_for_database(timeout=timeout, log=log)
+    durations["database"] = time.perf_counter() - start
+    for name, step in STEPS.items():
+        start = time.perf_counter()
+        step()
+        durations[name] = time.perf_counter() - start
+    _ready.set()
+    return durations
+
+
+def try_warm_up(timeout: Optional[float] = None) -> bool:
+    """warm_up() logging instead of raising when the database is unavailable."""
+    try:
+        warm_up(timeout=timeout)
+    except DatabaseError:
+        logger.exception("Warm-up failed, the database is unavailable.")
+        return False
+    return True
+
+
+def try_warm_up_in_thread(timeout: Optional[float] = None) -> bool:
+    """try_warm_up() in a thread of its own, which closes its connections after.
+
+    For a running event loop, e.g. uvicorn's loading the ASGI application, where
+    the ORM cannot be used.
+    """
+
+    def run() -> bool:
+        try:
+            return try_warm_up(timeout=timeout)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run).result()
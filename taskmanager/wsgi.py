@@ -8,8 +8,16 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "taskmanager.settings")
 
 application = get_wsgi_application()
+
+if settings.WARMUP_ENABLED:
+    from taskmanager.warmup import try_warm_up
+
+    # uwsgi loads the application in every worker (lazy-apps) before it accepts
+    # requests, so they don't start cold
+    try_warm_up()
@@ -1,5 +1,14 @@
+from typing import Any, Iterable
+
+from django.conf import settings
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import QuerySet
+from django.forms import ModelForm
+from django.http import HttpRequest
 
+from tasks import cache as task_cache
+from tasks import counters
 from tasks.models import Task
 
 
@@ -9,3 +18,33 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ("owner",)
     raw_id_fields = ["owner"]
     ordering = ("owner",)
+
+    @staticmethod
+    def _invalidate_cache(owner_ids: Iterable[Any]) -> None:
+        if settings.TASKS_CACHE_ENABLED:
+            for owner_id in set(owner_ids):
+                task_cache.bump_version(owner_id)
+
+    def save_model(
+        self, request: HttpRequest, obj: Task, form: ModelForm, change: bool
+    ) -> None:
+        with counters.counting(obj):
+            super().save_model(request, obj, form, change)
+        # a task moved to another owner leaves the old owner's responses too
+        self._invalidate_cache([obj.owner_id, form.initial.get("owner", obj.owner_id)])
+
+    def delete_model(self, request: HttpRequest, obj: Task) -> None:
+        with counters.counting(obj):
+            super().delete_model(request, obj)
+        self._invalidate_cache([obj.owner_id])
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet) -> None:
+        with transaction.atomic():
+            keys = list(
+                queryset.select_for_update().values_list(
+                    "owner_id", "state", "due_date"
+                )
+            )
+            super().delete_queryset(request, queryset)
+            counters.add((*key, -1) for key in keys)
+        self._invalidate_cache(owner_id for owner_id, _, _ in keys)
@@ -0,0 +1,165 @@
+"""Async variant of TaskViewSet for ASGI deployments.
+
+The dispatch runs on the event loop and the reads go through Django's async ORM
+(``aget``, ``acount``, ``aaggregate`` and async iteration), so a request waiting
+for the database doesn't hold one of a fixed number of worker threads. Django 5.0
+has no async ``transaction.atomic``: writes that save a task and its counter in
+one transaction run as a single ``sync_to_async`` call, like the actions that have
+no async handler here.
+"""
+
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from taskmanager.views import AsyncAPIViewMixin
+from tasks import cache as task_cache
+from tasks.conditional import Validators
+from tasks.models import Task, TaskState
+from tasks.serializers import TaskReadSerializer, TaskStateSerializer
+from tasks.views import TaskViewSet
+
+
+class AsyncTaskViewSet(AsyncAPIViewMixin, TaskViewSet):
+    """TaskViewSet with async list, retrieve, create and mark-* actions."""
+
+    async def aget_object(self) -> Task:
+        """get_object with the async ORM."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (Task.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        await self.acheck_object_permissions(self.request, obj)
+        return obj
+
+    async def acheck_object_permissions(self, request: Request, obj: Task) -> None:
+        for permission in self.get_permissions():
+            if hasattr(permission, "ahas_object_permission"):
+                allowed = await permission.ahas_object_permission(request, self, obj)
+            else:
+                allowed = permission.has_object_permission(request, self, obj)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    async def list(self, request: Request, *args, **kwargs) -> Response:
+        get_validators = self._aget_list_validators
+        if self._uses_cursor_pagination():
+            # validators need a COUNT, which is what cursor pagination avoids
+            get_validators = None
+        return await self._aread_response(self._alist_tasks, get_validators, request)
+
+    async def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return await self._aread_response(
+            self._aretrieve_task, self._aget_retrieve_validators, request
+        )
+
+    async def create(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        await sync_to_async(serializer.save)()
+        await self._ainvalidate_cache()
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
+
+    @action(methods=["post"], detail=True, url_path="mark-to-do")
+    async def mark_to_do(self, request: Request, pk: str = None) -> Response:
+        return await self._aupdate_task_state(TaskState.TO_DO)
+
+    @action(methods=["post"], detail=True, url_path="mark-in-progress")
+    async def mark_in_progress(self, request: Request, pk: str = None) -> Response:
+        return await self._aupdate_task_state(TaskState.IN_PROGRESS)
+
+    @action(methods=["post"], detail=True, url_path="mark-done")
+    async def mark_done(self, request: Request, pk: str = None) -> Response:
+        return await self._aupdate_task_state(TaskState.DONE)
+
+    async def _aupdate_task_state(self, state: TaskState) -> Response:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.get_queryset().filter(pk=self.kwargs[lookup_url_kwarg])
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+
+        tasks = await queryset.aupdate_state(state, fields=self.task_state_fields)
+        if tasks:
+            await self._ainvalidate_cache()
+            serializer = self.get_serializer(instance=tasks[0])
+            return Response(serializer.data)
+
+        # Nothing was updated - 404 or 403 if the task is missing or not the user's,
+        # else it was done when the UPDATE read it
+        await self.aget_object()
+        raise ValidationError({"state": [TaskStateSerializer.already_done]})
+
+    async def _aread_response(
+        self,
+        handler: Callable[..., Any],
+        get_validators: Optional[Callable[[], Any]],
+        request: Request,
+    ) -> Response:
+        """_read_response awaiting the handler and the validators."""
+        key = None
+        if settings.TASKS_CACHE_ENABLED:
+            key = await sync_to_async(self._get_read_cache_key)(request)
+            cached = await sync_to_async(task_cache.get_response)(key)
+            if cached is not None:
+                return self._cached_read_response(request, *cached)
+
+        validators = await get_validators() if get_validators is not None else None
+        not_modified = self._not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        response = await handler(request, *self.args, **self.kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            self._set_validator_headers(response, validators)
+            if key is not None:
+                await sync_to_async(task_cache.set_response)(
+                    key, (response.data, validators)
+                )
+        return response
+
+    async def _aget_list_validators(self) -> Validators:
+        queryset = self.filter_queryset(self.get_queryset())
+        summary = await queryset.aaggregate(**self.list_summary)
+        return self._make_list_validators(summary)
+
+    async def _aget_retrieve_validators(self) -> Validators:
+        self.task = await self.aget_object()
+        return self._make_retrieve_validators(self.task)
+
+    async def _alist_tasks(self, request: Request, *args, **kwargs) -> Response:
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            *TaskReadSerializer.get_columns(), named=True
+        )
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        if page is not None:
+            serializer = TaskReadSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = TaskReadSerializer([row async for row in queryset], many=True)
+        return Response(serializer.data)
+
+    async def _aretrieve_task(self, request: Request, *args, **kwargs) -> Response:
+        return self._retrieve_task(request, *args, **kwargs)
+
+    async def _ainvalidate_cache(self) -> None:
+        if settings.TASKS_CACHE_ENABLED:
+            await sync_to_async(task_cache.bump_version)(self.request.user.pk)
@@ -0,0 +1,396 @@
+"""Benchmark scenarios for the tasks app.
+
+Run them with ``python manage.py benchmark_tasks <scenario>``. Every run creates a
+throwaway test database, seeds it with set-based SQL and drops it at the end, so
+the configured database is never touched.
+"""
+
+import http.client
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.models import Count, Q, QuerySet
+from django.test import Client, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from taskmanager.renderers import ORJSONRenderer
+from tasks import counters
+from tasks.filters import TaskFilterSet
+from tasks.models import Task, TaskState
+from tasks.serializers import TaskReadSerializer, TaskSerializer
+from users.models import User
+
+VERBS = ["write", "review", "deploy", "fix", "plan", "test", "call", "email"]
+NOUNS = ["report", "release", "invoice", "roadmap", "bug", "client", "budget", "team"]
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """Point the default connection at a fresh test database for the duration.
+
+    Reads are not routed to the replicas of DATABASE_REPLICAS meanwhile, nothing
+    replicates the test database to them.
+    """
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with override_settings(DATABASE_REPLICAS=[]):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed_tasks(owners: int, tasks_per_owner: int, heavy_owner_tasks: int) -> User:
+    """Insert benchmark users and their tasks, return the owner with most tasks.
+
+    Tasks are generated with ``generate_series`` so seeding millions of rows takes
+    seconds instead of going through the ORM one object at a time.
+    """
+    password = make_password(None)
+    users = User.objects.bulk_create(
+        User(email=f"benchmark-{i}@example.com", password=password)
+        for i in range(owners + 1)
+    )
+    heavy_owner, *regular_owners = users
+
+    table = connection.ops.quote_name(Task._meta.db_table)
+    sql = f"""
+        INSERT INTO {table}
+            (id, created_at, updated_at, owner_id, title, description, state, due_date)
+        SELECT
+            gen_random_uuid(), now(), now(), owner_id,
+            (%(verbs)s::text[])[1 + i %% %(verbs_count)s] || ' '
+                || (%(nouns)s::text[])[1 + (i / %(verbs_count)s) %% %(nouns_count)s]
+                || ' ' || i,
+            'Generated benchmark task number ' || i,
+            (%(states)s::text[])[1 + i %% %(states_count)s],
+            current_date + (i %% 730) - 365
+        FROM unnest(%(owners)s::uuid[]) AS owner_id, generate_series(1, %(size)s) AS i
+    """
+    params = {
+        "verbs": VERBS,
+        "verbs_count": len(VERBS),
+        "nouns": NOUNS,
+        "nouns_count": len(NOUNS),
+        "states": TaskState.values,
+        "states_count": len(TaskState.values),
+    }
+    with connection.cursor() as cursor:
+        owner_ids = [user.pk for user in regular_owners]
+        cursor.execute(sql, params | {"owners": owner_ids, "size": tasks_per_owner})
+        cursor.execute(
+            sql, params | {"owners": [heavy_owner.pk], "size": heavy_owner_tasks}
+        )
+        cursor.execute(f"ANALYZE {table}")
+    counters.rebuild()
+    return heavy_owner
+
+
+def _plan_nodes(plan: dict) -> Iterator[str]:
+    node = plan["Node Type"]
+    if "Index Name" in plan:
+        node = f"{node} using {plan['Index Name']}"
+    yield node
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def query_plan(queryset: QuerySet) -> dict:
+    """EXPLAIN ANALYZE the query of ``queryset``."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+        explain = cursor.fetchone()[0]
+    if isinstance(explain, str):
+        explain = json.loads(explain)
+
+    nodes = list(_plan_nodes(explain[0]["Plan"]))
+    return {
+        "nodes": nodes,
+        "sorted_in_memory": any(node.startswith("Sort") for node in nodes),
+        "planning_ms": explain[0]["Planning Time"],
+        "execution_ms": explain[0]["Execution Time"],
+    }
+
+
+def list_query_plan(owner: User) -> dict:
+    """EXPLAIN ANALYZE the query behind the first page of ``GET /tasks/``."""
+    return query_plan(Task.objects.upcoming(owner)[: api_settings.PAGE_SIZE])
+
+
+def _median_ms(function: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), content
+
+
+def read_serializers(
+    owner: User, page_sizes: tuple = (30, 500, 5000), repeat: int = 20
+) -> dict:
+    """Compare fetching, serializing and rendering list pages of many sizes."""
+    renderer = JSONRenderer()
+    queryset = Task.objects.upcoming(owner)
+    columns = TaskReadSerializer.get_columns()
+    results = {}
+    for size in page_sizes:
+        model_ms, model_content = _median_ms(
+            lambda: renderer.render(
+                TaskSerializer(list(queryset[:size]), many=True).data
+            ),
+            repeat,
+        )
+        rows_ms, rows_content = _median_ms(
+            lambda: renderer.render(
+                TaskReadSerializer(
+                    list(queryset.values_list(*columns, named=True)[:size]), many=True
+                ).data
+            ),
+            repeat,
+        )
+        results[size] = {
+            "task_serializer_ms": round(model_ms, 3),
+            "task_read_serializer_ms": round(rows_ms, 3),
+            "speedup": round(model_ms / rows_ms, 2),
+            "identical_output": model_content == rows_content,
+        }
+    return results
+
+
+def renderers(
+    owner: User, page_sizes: tuple = (30, 500, 5000), repeat: int = 20
+) -> dict:
+    """Compare JSONRenderer and ORJSONRenderer on list pages of many sizes."""
+    queryset = Task.objects.upcoming(owner)
+    columns = TaskReadSerializer.get_columns()
+    results = {}
+    for size in page_sizes:
+        rows = list(queryset.values_list(*columns, named=True)[:size])
+        data = TaskReadSerializer(rows, many=True).data
+        json_ms, json_content = _median_ms(lambda: JSONRenderer().render(data), repeat)
+        orjson_ms, orjson_content = _median_ms(
+            lambda: ORJSONRenderer().render(data), repeat
+        )
+        results[size] = {
+            "json_renderer_ms": round(json_ms, 3),
+            "orjson_renderer_ms": round(orjson_ms, 3),
+            "speedup": round(json_ms / orjson_ms, 2),
+            "identical_output": json_content == orjson_content,
+        }
+    return results
+
+
+def summary(owner: User, repeat: int = 20) -> dict:
+    """Compare the summary read from TaskCounter with counting the tasks."""
+    today = timezone.now().date()
+    not_done = ~Q(state=TaskState.DONE)
+
+    def count_tasks() -> dict:
+        return Task.objects.filter(owner=owner).aggregate(
+            to_do=Count("pk", filter=Q(state=TaskState.TO_DO)),
+            in_progress=Count("pk", filter=Q(state=TaskState.IN_PROGRESS)),
+            done=Count("pk", filter=Q(state=TaskState.DONE)),
+            overdue=Count("pk", filter=not_done & Q(due_date__lt=today)),
+            total=Count("pk"),
+        )
+
+    tasks_ms, tasks_summary = _median_ms(count_tasks, repeat)
+    counters_ms, counters_summary = _median_ms(
+        lambda: counters.summary(owner, today), repeat
+    )
+    return {
+        "count_tasks_ms": round(tasks_ms, 3),
+        "counters_ms": round(counters_ms, 3),
+        "speedup": round(tasks_ms / counters_ms, 2),
+        "identical_output": tasks_summary == counters_summary,
+    }
+
+
+def search(owner: User, repeat: int = 20) -> dict:
+    """Time the page and count queries of ``GET /tasks/?search=...``.
+
+    The terms are taken from one of the owner's tasks: its whole title, the start
+    of it as typed in a search box and a single word shared by an eighth of tasks,
+    whose matches all have to be ranked.
+    """
+    title = Task.objects.upcoming(owner).values_list("title", flat=True)[1000]
+    verb, noun, number = title.split()
+    terms = [title, f"{verb} {noun} {number[:2]}", noun]
+    columns = TaskReadSerializer.get_columns()
+    results = {}
+    for term in terms:
+        queryset = TaskFilterSet(
+            {"search": term}, queryset=Task.objects.upcoming(owner)
+        ).qs
+        page = queryset.values_list(*columns)[: api_settings.PAGE_SIZE]
+        plan = query_plan(page)
+        page_ms, rows = _median_ms(lambda: list(page.all()), repeat)
+        count_ms, count = _median_ms(queryset.count, repeat)
+        results[term] = {
+            "matches": count,
+            "page_rows": len(rows),
+            "page_ms": round(page_ms, 3),
+            "count_ms": round(count_ms, 3),
+            "page_nodes": plan["nodes"],
+        }
+    return results
+
+
+# servers compared by the load scenario, {port} is replaced with a free port
+LOAD_SERVERS = {
+    # scripts/entrypoint.sh, speaking HTTP instead of the uwsgi protocol
+    "uwsgi": [
+        "uwsgi",
+        "--http",
+        "127.0.0.1:{port}",
+        "--workers",
+        "4",
+        "--master",
+        "--enable-threads",
+        "--module",
+        "taskmanager.wsgi",
+        "--disable-logging",
+    ],
+    # scripts/asgi_entrypoint.sh
+    "uvicorn": [
+        "uvicorn",
+        "taskmanager.asgi:application",
+        "--port",
+        "{port}",
+        "--workers",
+        "4",
+        "--no-access-log",
+    ],
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def _server(command: list[str], port: int, timeout: float = 30) -> Iterator[None]:
+    """Run the server ``command`` on the benchmark database until the block ends."""
+    env = os.environ | {
+        "POSTGRES_DB": connection.settings_dict["NAME"],
+        # the server reads from the benchmark database only, see above
+        "POSTGRES_REPLICAS": "",
+        "ALLOWED_HOSTS": "127.0.0.1",
+        "DEBUG": "false",
+    }
+    process = subprocess.Popen(
+        [part.format(port=port) for part in command],
+        cwd=settings.BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{command[0]} did not start.")
+                time.sleep(0.1)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _get_many(port: int, path: str, headers: dict, requests: int) -> tuple:
+    """GET ``path`` over one keep-alive connection, return timings and errors."""
+    timings = []
+    errors = 0
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            errors += response.status != 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            errors += 1
+        timings.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    return timings, errors
+
+
+def load(
+    owner: User, concurrency: int = 32, requests: int = 4000, warmup: int = 200
+) -> dict:
+    """Compare latency and throughput of ``GET /tasks/`` under every server.
+
+    Each of ``concurrency`` client threads sends its share of ``requests`` over a
+    keep-alive connection, with the session of ``owner``.
+    """
+    client = Client()
+    client.force_login(owner)
+    cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+    headers = {"Cookie": f"{cookie.key}={cookie.value}"}
+    path = "/tasks/"
+    per_client = requests // concurrency
+
+    results = {}
+    for name, command in LOAD_SERVERS.items():
+        if shutil.which(command[0]) is None:
+            results[name] = {"skipped": f"{command[0]} is not installed"}
+            continue
+        port = _free_port()
+        with _server(command, port):
+            _get_many(port, path, headers, warmup)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as executor:
+                runs = list(
+                    executor.map(
+                        lambda _: _get_many(port, path, headers, per_client),
+                        range(concurrency),
+                    )
+                )
+            elapsed = time.perf_counter() - start
+        timings = sorted(t for run_timings, _ in runs for t in run_timings)
+        percentiles = statistics.quantiles(timings, n=100)
+        results[name] = {
+            "requests": len(timings),
+            "errors": sum(errors for _, errors in runs),
+            "requests_per_second": round(len(timings) / elapsed, 1),
+            "p50_ms": round(percentiles[49], 3),
+            "p95_ms": round(percentiles[94], 3),
+            "p99_ms": round(percentiles[98], 3),
+        }
+    return results
+
+
+SCENARIOS: dict[str, Callable[[User], dict]] = {
+    "list-plan": list_query_plan,
+    "load": load,
+    "read-serializers": read_serializers,
+    "search": search,
+    "renderers": renderers,
+    "summary": summary,
+}
@@ -0,0 +1,67 @@
+"""Versioned cache of TaskViewSet's read responses.
+
+Every owner has a version number kept in the cache and every cached response of
+that owner has the version in its key. Bumping the version after a write makes
+all the owner's cached responses unreachable at once, they expire on their own.
+The versions must be seen by every worker, so the cache has to be a shared one,
+which the ``tasks.E001`` check enforces.
+"""
+
+import time
+from collections import Counter
+from hashlib import sha256
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+# hits and misses of this process, exported by the metrics endpoint
+stats: Counter = Counter()
+
+
+def get_cache() -> BaseCache:
+    return caches[settings.TASKS_CACHE_ALIAS]
+
+
+def _version_key(owner_id: Any) -> str:
+    return f"tasks:version:{owner_id}"
+
+
+def _new_version() -> int:
+    # Versions start from the current time, so a version key that got evicted
+    # never comes back with a number used by entries that may still be cached.
+    return time.time_ns()
+
+
+def get_version(owner_id: Any) -> int:
+    cache = get_cache()
+    key = _version_key(owner_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(owner_id: Any) -> None:
+    cache = get_cache()
+    key = _version_key(owner_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def response_key(owner_id: Any, *parts: Any) -> str:
+    digest = sha256("|".join(map(str, parts)).encode()).hexdigest()
+    return f"tasks:response:{owner_id}:{get_version(owner_id)}:{digest}"
+
+
+def get_response(key: str) -> Optional[Any]:
+    data = get_cache().get(key)
+    stats["misses" if data is None else "hits"] += 1
+    return data
+
+
+def set_response(key: str, data: Any) -> None:
+    get_cache().set(key, data, timeout=settings.TASKS_CACHE_TIMEOUT)
@@ -0,0 +1,51 @@
+"""System checks of the tasks' settings."""
+
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import CheckMessage, Error, Tags, register
+
+# backends keeping their entries in the memory of the process, or nowhere
+LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(alias: str) -> bool:
+    """Whether all the worker processes see the entries of the cache ``alias``."""
+    return not isinstance(caches[alias], LOCAL_CACHE_BACKENDS)
+
+
+@register(Tags.caches)
+def check_tasks_cache(app_configs: Any, **kwargs: Any) -> list[CheckMessage]:
+    if not settings.TASKS_CACHE_ENABLED or is_shared_cache(settings.TASKS_CACHE_ALIAS):
+        return []
+    return [
+        Error(
+            "TASKS_CACHE_ENABLED needs a cache shared by the worker processes.",
+            hint=(
+                "A write bumps the owner's version only in the cache of its "
+                "worker, the others would serve stale responses. Set CACHE_URL, "
+                "e.g. to rediscache://redis:6379/1."
+            ),
+            id="tasks.E001",
+        )
+    ]
+
+
+@register(Tags.caches, Tags.database)
+def check_replica_pins(app_configs: Any, **kwargs: Any) -> list[CheckMessage]:
+    if not settings.DATABASE_REPLICAS or is_shared_cache(DEFAULT_CACHE_ALIAS):
+        return []
+    return [
+        Error(
+            "POSTGRES_REPLICAS needs a cache shared by the worker processes.",
+            hint=(
+                "Users that wrote are pinned to the primary in the cache, a pin "
+                "in the cache of one worker would let the others read stale "
+                "replicas. Set CACHE_URL, e.g. to rediscache://redis:6379/1."
+            ),
+            id="tasks.E002",
+        )
+    ]
@@ -0,0 +1,41 @@
+"""Validators for conditional GET requests (ETag / Last-Modified)."""
+
+from datetime import datetime
+from hashlib import sha256
+from typing import Any, NamedTuple, Optional
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime] = None
+    # Deleting a task doesn't move the latest updated_at of a list, so lists
+    # are validated with their ETag only.
+    check_last_modified: bool = True
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = http_date(self.last_modified.timestamp())
+        return headers
+
+    def not_modified_response(self, request: Request) -> Optional[HttpResponse]:
+        last_modified = None
+        if self.check_last_modified and self.last_modified is not None:
+            last_modified = int(self.last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=last_modified
+        )
+        if response is not None:
+            for header, value in self.headers.items():
+                response.headers[header] = value
+        return response
+
+
+def make_etag(*parts: Any) -> str:
+    return quote_etag(sha256("|".join(map(str, parts)).encode()).hexdigest())
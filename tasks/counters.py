@@ -0,0 +1,145 @@
+"""Incremental maintenance of TaskCounter.
+
+Every write that changes tasks adds its deltas to the counters in the same
+transaction. Deltas are summed per counter and applied with one upsert, in key
+order so concurrent transactions lock the counters they share in the same order.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+
+from tasks.models import Task, TaskCounter, TaskState
+
+# owner id, state, due date, change of the count
+Delta = tuple[Any, str, date, int]
+
+
+class Drift(NamedTuple):
+    owner_id: Any
+    state: str
+    due_date: date
+    counted: int
+    actual: int
+
+
+def _table(model: type) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def upsert_sql(select_sql: str) -> str:
+    """SQL adding ``(owner_id, state, due_date, count)`` rows to the counters."""
+    table = _table(TaskCounter)
+    return (
+        f"INSERT INTO {table} (owner_id, state, due_date, count) {select_sql} "
+        f"ON CONFLICT (owner_id, state, due_date) "
+        f"DO UPDATE SET count = {table}.count + EXCLUDED.count"
+    )
+
+
+def delta(task: Task, count: int) -> Delta:
+    return task.owner_id, task.state, task.due_date, count
+
+
+def add(deltas: Iterable[Delta]) -> None:
+    """Apply ``deltas`` to the counters, with at most one query."""
+    totals: Counter = Counter()
+    for owner_id, state, due_date, count in deltas:
+        totals[owner_id, str(state), due_date] += count
+    rows = sorted((*key, count) for key, count in totals.items() if count)
+    if not rows:
+        return
+
+    owner_ids, states, due_dates, counts = map(list, zip(*rows))
+    sql = upsert_sql(
+        "SELECT * FROM unnest(%s::uuid[], %s::varchar[], %s::date[], %s::int[])"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [owner_ids, states, due_dates, counts])
+
+
+@contextmanager
+def counting(task: Task) -> Iterator[None]:
+    """Count the changes made to an existing ``task`` in the block.
+
+    The task's row is locked first, so the old values taken off the counters are
+    the ones the block replaces, even when other requests change the task too.
+    Deleting the task in the block only takes it off.
+    """
+    with transaction.atomic():
+        old = (
+            Task.objects.select_for_update()
+            .filter(pk=task.pk)
+            .values_list("owner_id", "state", "due_date")
+            .first()
+        )
+        yield
+        deltas = []
+        if old is not None:
+            deltas.append((*old, -1))
+        # Model.delete() clears the primary key
+        if task.pk is not None:
+            deltas.append(delta(task, 1))
+        add(deltas)
+
+
+def summary(owner: Any, today: date) -> dict:
+    """Number of the owner's tasks per state and of the overdue ones."""
+    not_done = ~Q(state=TaskState.DONE)
+
+    def total(condition: Q) -> Coalesce:
+        return Coalesce(Sum("count", filter=condition), 0)
+
+    return TaskCounter.objects.filter(owner=owner).aggregate(
+        to_do=total(Q(state=TaskState.TO_DO)),
+        in_progress=total(Q(state=TaskState.IN_PROGRESS)),
+        done=total(Q(state=TaskState.DONE)),
+        overdue=total(not_done & Q(due_date__lt=today)),
+        total=total(Q()),
+    )
+
+
+def _actual_counts_sql() -> str:
+    return (
+        f"SELECT owner_id, state, due_date, count(*) AS count "
+        f"FROM {_table(Task)} GROUP BY owner_id, state, due_date"
+    )
+
+
+def find_drift() -> list[Drift]:
+    """Compare every counter with a fresh count of the tasks."""
+    sql = f"""
+        SELECT owner_id, state, due_date,
+            COALESCE(counter.count, 0), COALESCE(actual.count, 0)
+        FROM {_table(TaskCounter)} AS counter
+        FULL OUTER JOIN ({_actual_counts_sql()}) AS actual
+            USING (owner_id, state, due_date)
+        WHERE COALESCE(counter.count, 0) <> COALESCE(actual.count, 0)
+        ORDER BY owner_id, state, due_date
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return [Drift(*row) for row in cursor.fetchall()]
+
+
+def rebuild() -> int:
+    """Recount all tasks into the counters, return the number of counters.
+
+    The counters table is locked until the rebuild commits: writers that already
+    counted their tasks have committed and are seen by the recount, the others
+    wait and add their deltas on top of it.
+    """
+    table = _table(TaskCounter)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(
+            f"INSERT INTO {table} (owner_id, state, due_date, count) "
+            f"{_actual_counts_sql()}"
+        )
+        return cursor.rowcount
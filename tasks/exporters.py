@@ -0,0 +1,87 @@
+"""Streaming exports of tasks as NDJSON or CSV."""
+
+import csv
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from tasks.serializers import TaskReadSerializer
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """Ignore the Accept header, the export format comes from a query param.
+
+    Errors are rendered with the first configured renderer.
+    """
+
+    def select_parser(self, request: Request, parsers: list) -> Optional[Any]:
+        return parsers[0] if parsers else None
+
+    def select_renderer(
+        self, request: Request, renderers: list[BaseRenderer], format_suffix: str = None
+    ) -> tuple[BaseRenderer, str]:
+        return renderers[0], renderers[0].media_type
+
+
+class Echo:
+    """Pseudo-buffer whose ``write`` returns the value, so csv.writer returns rows."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def export_ndjson(rows: Iterable[tuple], batch_size: int) -> Iterator[bytes]:
+    """Yield one JSON object per line, ``batch_size`` rows per chunk."""
+    renderer = next(
+        renderer_class()
+        for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES
+        if renderer_class.format == "json"
+    )
+    serializer = TaskReadSerializer()
+    for batch in _batches(rows, batch_size):
+        yield b"".join(
+            renderer.render(serializer.to_representation(row)) + b"\n" for row in batch
+        )
+
+
+def export_csv(rows: Iterable[tuple], batch_size: int) -> Iterator[bytes]:
+    """Yield a header line and one CSV line per row, ``batch_size`` rows per chunk."""
+    writer = csv.writer(Echo())
+    serializer = TaskReadSerializer()
+    names = [name for name, _, _ in serializer.get_converters()]
+    yield writer.writerow(names).encode()
+    for batch in _batches(rows, batch_size):
+        yield "".join(
+            writer.writerow(serializer.to_representation(row).values()) for row in batch
+        ).encode()
+
+
+async def aiter_chunks(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Iterate ``chunks`` in the thread of sync code, a chunk at a time.
+
+    Django reads a sync iterator to the end before sending it under ASGI.
+    """
+    try:
+        while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # closes the server-side cursor in the thread that opened it
+        await sync_to_async(chunks.close)()
+
+
+# file format: (content type, exporter)
+EXPORTERS: dict[str, tuple[str, Callable[[Iterable[tuple], int], Iterator[bytes]]]] = {
+    "ndjson": ("application/x-ndjson", export_ndjson),
+    "csv": ("text/csv", export_csv),
+}
@@ -1,9 +1,51 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q, QuerySet
 from django_filters import rest_framework as filters
 
-from tasks.models import Task
+from tasks.models import SEARCH_CONFIG, Task, TaskState
+
+
+class ChoiceInFilter(filters.BaseInFilter, filters.ChoiceFilter):
+    """Comma separated choices, each of them validated."""
 
 
 class TaskFilterSet(filters.FilterSet):
+    """Filters of the task list.
+
+    Every filter has an index led by the owner to go with it, so any combination
+    of them is answered without reading all of an owner's tasks:
+    due dates use ``task_owner_due_date_idx``, a state
+    ``task_owner_state_due_date_idx``, the states that are not done
+    ``task_owner_open_due_date_idx`` and ``updated_after``
+    ``task_owner_updated_at_idx``. TaskIndexesTestCase checks each of them.
+    """
+
+    state__in = ChoiceInFilter(
+        field_name="state", lookup_expr="in", choices=TaskState.choices
+    )
+    updated_after = filters.IsoDateTimeFilter(field_name="updated_at", lookup_expr="gt")
+    search = filters.CharFilter(
+        method="filter_search",
+        label="Words in the title or description, or the beginning of the title.",
+    )
+
     class Meta:
         model = Task
-        fields = ["due_date"]
+        fields = {
+            "due_date": ["exact", "gte", "lte"],
+            "state": ["exact"],
+        }
+
+    def filter_search(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        """Match ``value`` with websearch syntax or as a title prefix, best first.
+
+        Both conditions are served by indexes led by the owner: the words by the
+        GIN index on ``search_vector``, the prefix by a range scan of the btree
+        index on the upper-cased title.
+        """
+        query = SearchQuery(value, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            queryset.filter(Q(search_vector=query) | Q(title__istartswith=value))
+            .annotate(search_rank=SearchRank(F("search_vector"), query))
+            .order_by("-search_rank", "due_date", "id")
+        )
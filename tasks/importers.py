@@ -0,0 +1,204 @@
+"""Bulk import of tasks from NDJSON or CSV through PostgreSQL's COPY.
+
+Rows are read and validated one at a time with TaskSerializer's rules, valid ones
+are buffered and written with one ``COPY ... FROM STDIN`` per batch, so memory use
+depends on the batch size only, not on the size of the upload.
+"""
+
+import codecs
+import csv
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+
+from tasks import cache as task_cache
+from tasks import counters
+from tasks.models import Task, TaskState
+from tasks.serializers import TaskImportSerializer
+from users.models import User
+
+try:
+    from orjson import loads
+except ImportError:  # pragma: no cover
+    from json import loads
+
+
+class Reject(NamedTuple):
+    line: int
+    row: Any
+    errors: Any
+
+
+class ImportResult(NamedTuple):
+    imported: int
+    rejected: int
+
+
+class InvalidRow(NamedTuple):
+    """A row that a reader could not read, rejected with ``errors``."""
+
+    row: Any
+    errors: Any
+
+
+def read_ndjson(
+    lines: Iterable[bytes], encoding: str = "utf-8"
+) -> Iterator[tuple[int, Any]]:
+    """Yield ``(line number, object)`` for every non-blank line.
+
+    JSON is UTF-8, ``encoding`` only decodes the lines that are not JSON.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, loads(line)
+        except ValueError:
+            yield number, line.decode(encoding, errors="replace").rstrip("\r\n")
+
+
+def read_csv(
+    lines: Iterable[bytes], encoding: str = "utf-8"
+) -> Iterator[tuple[int, Any]]:
+    """Yield ``(line number, dict)`` for every record, the first line is a header.
+
+    Records with bytes that are invalid in ``encoding`` are yielded as InvalidRow.
+    """
+    errors = {"non_field_errors": [f"Invalid {encoding} text."]}
+    if codecs.lookup(encoding).name == "utf-8":
+        # Excel starts UTF-8 files with a byte order mark
+        encoding = "utf-8-sig"
+    invalid_lines = set()
+
+    def decode() -> Iterator[str]:
+        for number, line in enumerate(lines, start=1):
+            try:
+                yield line.decode(encoding)
+            except UnicodeDecodeError:
+                invalid_lines.add(number)
+                yield line.decode(encoding, errors="replace")
+
+    reader = csv.DictReader(decode())
+    first_line = reader.line_num + 1
+    for row in reader:
+        if invalid_lines and not invalid_lines.isdisjoint(
+            range(first_line, reader.line_num + 1)
+        ):
+            row = InvalidRow(row, errors)
+        yield reader.line_num, row
+        first_line = reader.line_num + 1
+
+
+def is_known_encoding(encoding: str) -> bool:
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return False
+    return True
+
+
+READERS: dict[str, Callable[..., Iterator[tuple[int, Any]]]] = {
+    "ndjson": read_ndjson,
+    "csv": read_csv,
+}
+# content type of an upload: file format
+CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+
+def validate_rows(
+    rows: Iterable[tuple[int, Any]], reject: Callable[[Reject], None]
+) -> Iterator[dict]:
+    """Yield validated data of valid rows and pass the invalid ones to ``reject``."""
+    # one serializer validates every row, its fields are built only once
+    serializer = TaskImportSerializer()
+    for number, row in rows:
+        if isinstance(row, InvalidRow):
+            reject(Reject(number, *row))
+            continue
+        if not isinstance(row, dict):
+            reject(Reject(number, row, {"non_field_errors": ["Invalid JSON object."]}))
+            continue
+        try:
+            yield serializer.run_validation(row)
+        except ValidationError as exc:
+            reject(Reject(number, row, exc.detail))
+
+
+def copy_tasks(owner: User, tasks: list[dict]) -> None:
+    """Insert ``tasks`` of ``owner`` with a single COPY statement."""
+    columns = [
+        "id",
+        "created_at",
+        "updated_at",
+        "owner_id",
+        "title",
+        "description",
+        "state",
+        "due_date",
+    ]
+    quote_name = connection.ops.quote_name
+    sql = (
+        f"COPY {quote_name(Task._meta.db_table)} "
+        f"({', '.join(quote_name(column) for column in columns)}) FROM STDIN"
+    )
+    timestamp = now()
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for task in tasks:
+                copy.write_row(
+                    (
+                        uuid4(),
+                        timestamp,
+                        timestamp,
+                        owner.pk,
+                        task["title"],
+                        task["description"],
+                        TaskState.TO_DO.value,
+                        task["due_date"],
+                    )
+                )
+
+
+def import_tasks(
+    owner: User,
+    lines: Iterable[bytes],
+    file_format: str,
+    reject: Callable[[Reject], None],
+    batch_size: int = None,
+    encoding: str = "utf-8",
+) -> ImportResult:
+    """Import tasks of ``owner`` from ``lines`` of an NDJSON or CSV file.
+
+    Every batch is committed on its own, so a failure part way through keeps the
+    batches imported before it. Rejected rows are passed to ``reject``, as are the
+    records of CSV with bytes that are invalid in ``encoding``.
+    """
+    read = READERS[file_format]
+    batch_size = batch_size or settings.TASKS_IMPORT_BATCH_SIZE
+    rejected = 0
+
+    def count_reject(item: Reject) -> None:
+        nonlocal rejected
+        rejected += 1
+        reject(item)
+
+    imported = 0
+    tasks = validate_rows(read(lines, encoding), count_reject)
+    while batch := list(islice(tasks, batch_size)):
+        with transaction.atomic():
+            copy_tasks(owner, batch)
+            counters.add(
+                (owner.pk, TaskState.TO_DO, task["due_date"], 1) for task in batch
+            )
+        imported += len(batch)
+        if settings.TASKS_CACHE_ENABLED:
+            task_cache.bump_version(owner.pk)
+    return ImportResult(imported, rejected)
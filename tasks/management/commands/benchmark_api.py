@@ -0,0 +1,54 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from taskmanager.benchmarks import compare, run
+from tasks.benchmarks import benchmark_database
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API's endpoints on a generated data set."""
+
+    help = (
+        "Seed a throwaway database with users and tasks and measure latency, "
+        "throughput and queries of every endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--tasks-per-user", type=int, default=1_000)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--login-requests",
+            type=int,
+            default=20,
+            help="Logins hash a password each, they are measured fewer times.",
+        )
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--output", help="File to write the JSON result to.")
+        parser.add_argument(
+            "--compare", help="JSON result of another run to compare with."
+        )
+
+    def handle(self, *args, **options):
+        if min(options["requests"], options["login_requests"]) < 2:
+            raise CommandError("Percentiles need at least 2 requests.")
+
+        with benchmark_database():
+            self.stderr.write("Seeding and running the benchmark...")
+            result = run(
+                users=options["users"],
+                tasks_per_user=options["tasks_per_user"],
+                requests=options["requests"],
+                login_requests=options["login_requests"],
+                warmup=options["warmup"],
+            )
+
+        if options["compare"]:
+            with open(options["compare"]) as baseline:
+                result["comparison"] = compare(result, json.load(baseline))
+        content = json.dumps(result, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(content + "\n")
+        self.stdout.write(content)
@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from tasks.benchmarks import SCENARIOS, benchmark_database, seed_tasks
+
+
+class Command(BaseCommand):
+    """Django command to benchmark task queries on a generated data set."""
+
+    help = "Seed a throwaway database with tasks and run a benchmark scenario."
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenario", choices=sorted(SCENARIOS))
+        parser.add_argument("--owners", type=int, default=100)
+        parser.add_argument("--tasks-per-owner", type=int, default=1_000)
+        parser.add_argument("--heavy-owner-tasks", type=int, default=2_000_000)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.stdout.write("Seeding benchmark data...")
+            owner = seed_tasks(
+                owners=options["owners"],
+                tasks_per_owner=options["tasks_per_owner"],
+                heavy_owner_tasks=options["heavy_owner_tasks"],
+            )
+            self.stdout.write(f"Running {options['scenario']}...")
+            result = SCENARIOS[options["scenario"]](owner)
+
+        self.stdout.write(json.dumps(result, indent=2))
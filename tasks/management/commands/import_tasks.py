@@ -0,0 +1,62 @@
+import json
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importers import READERS, Reject, import_tasks
+from users.models import User
+
+
+class Command(BaseCommand):
+    """Django command to import tasks of a user from an NDJSON or CSV file."""
+
+    help = "Import tasks of a user from an NDJSON or CSV file through COPY."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON or CSV file, - reads stdin.")
+        parser.add_argument("--owner", required=True, help="Email of the owner.")
+        parser.add_argument(
+            "--file-format",
+            choices=sorted(READERS),
+            help="Format of the file, guessed from its extension by default.",
+        )
+        parser.add_argument(
+            "--rejects", help="File to write the rejected rows to, as NDJSON."
+        )
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(email=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['owner']} does not exist.")
+
+        path = options["path"]
+        file_format = options["file_format"] or Path(path).suffix[1:].lower()
+        if file_format not in READERS:
+            raise CommandError("Cannot guess the file format, use --file-format.")
+
+        with ExitStack() as stack:
+            if path == "-":
+                lines = sys.stdin.buffer
+            else:
+                lines = stack.enter_context(open(path, "rb"))
+            rejects = None
+            if options["rejects"]:
+                rejects = stack.enter_context(open(options["rejects"], "w"))
+
+            def reject(item: Reject) -> None:
+                if rejects is not None:
+                    rejects.write(json.dumps(item._asdict()) + "\n")
+
+            result = import_tasks(
+                owner, lines, file_format, reject, batch_size=options["batch_size"]
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} tasks, rejected {result.rejected}."
+            )
+        )
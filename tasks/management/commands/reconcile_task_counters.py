@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import counters
+
+
+class Command(BaseCommand):
+    """Django command to verify and rebuild the task counters."""
+
+    help = "Compare the task counters with the tasks and rebuild them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drifted counters, fail if there are any.",
+        )
+
+    def handle(self, *args, **options):
+        drift = counters.find_drift()
+        for item in drift:
+            self.stdout.write(
+                f"{item.owner_id} {item.state} {item.due_date}: "
+                f"counted {item.counted}, actual {item.actual}"
+            )
+        owners = len({item.owner_id for item in drift})
+        message = f"{len(drift)} drifted counters of {owners} owners."
+
+        if options["check"]:
+            if drift:
+                raise CommandError(message)
+            self.stdout.write(self.style.SUCCESS(message))
+            return
+
+        self.stdout.write(message)
+        rebuilt = counters.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} counters."))
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:19
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "due_date", "id"], name="task_owner_due_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("state", "DONE"), _negated=True),
+                fields=["owner", "due_date", "id"],
+                name="task_owner_open_due_date_idx",
+            ),
+        ),
+        # Altering the FK through the schema editor would drop and re-validate the
+        # foreign key constraint, only the now redundant index has to go.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="task",
+                    name="owner",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql='DROP INDEX CONCURRENTLY IF EXISTS "tasks_task_owner_id_db3dcc3e";',
+                    reverse_sql=(
+                        'CREATE INDEX CONCURRENTLY "tasks_task_owner_id_db3dcc3e" '
+                        'ON "tasks_task" ("owner_id");'
+                    ),
+                ),
+            ],
+        ),
+    ]
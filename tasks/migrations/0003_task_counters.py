@@ -0,0 +1,65 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0002_task_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("TO_DO", "to do"),
+                            ("IN_PROGRESS", "in progress"),
+                            ("DONE", "done"),
+                        ]
+                    ),
+                ),
+                ("due_date", models.DateField()),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="taskcounter",
+            constraint=models.UniqueConstraint(
+                fields=("owner", "state", "due_date"), name="task_counter_key"
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO tasks_taskcounter (owner_id, state, due_date, count)
+                SELECT owner_id, state, due_date, count(*)
+                FROM tasks_task
+                GROUP BY owner_id, state, due_date
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:56
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0004_task_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "state", "due_date", "id"],
+                name="task_owner_state_due_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "updated_at"], name="task_owner_updated_at_idx"
+            ),
+        ),
+    ]
@@ -1,8 +1,16 @@
 from uuid import uuid4
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
+from tasks.querysets import TaskQuerySet
+
+# text search configuration of Task.search_vector and of the queries against it
+SEARCH_CONFIG = "english"
+
 
 class TaskState(models.TextChoices):
     TO_DO = "TO_DO", _("to do")
@@ -15,7 +23,6 @@ class BaseModel(models.Model):
 
     id = models.UUIDField(
         primary_key=True,
-        db_index=True,
         default=uuid4,
         editable=False,
     )
@@ -31,8 +38,82 @@ class Task(BaseModel):
         verbose_name=_("user"),
         to="users.User",
         on_delete=models.CASCADE,
+        # covered by the leading column of task_owner_due_date_idx
+        db_index=False,
     )
     title = models.CharField(verbose_name=_("title"), max_length=128)
     description = models.TextField(verbose_name=_("description"))
     state = models.CharField(choices=TaskState.choices)
     due_date = models.DateField()
+    # computed by the database on every write, titles weigh more than descriptions
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # serves TaskViewSet's "owner = ? AND due_date >= ? ORDER BY due_date, id"
+            # as a range scan without a sort step
+            models.Index(
+                fields=["owner", "due_date", "id"],
+                name="task_owner_due_date_idx",
+            ),
+            models.Index(
+                fields=["owner", "due_date", "id"],
+                name="task_owner_open_due_date_idx",
+                condition=~models.Q(state=TaskState.DONE),
+            ),
+            # state filters, with due dates in the order of the list
+            models.Index(
+                fields=["owner", "state", "due_date", "id"],
+                name="task_owner_state_due_date_idx",
+            ),
+            # updated_after filter
+            models.Index(
+                fields=["owner", "updated_at"],
+                name="task_owner_updated_at_idx",
+            ),
+            # full-text search within an owner's tasks, owner_id needs btree_gin
+            GinIndex(fields=["owner", "search_vector"], name="task_owner_search_idx"),
+            # typeahead: title__istartswith is "UPPER(title) LIKE 'X%'", which the
+            # pattern opclass turns into a range scan within the owner's titles
+            models.Index(
+                models.F("owner"),
+                OpClass(Upper("title"), name="text_pattern_ops"),
+                name="task_owner_title_prefix_idx",
+            ),
+        ]
+
+
+class TaskCounter(models.Model):
+    """Number of an owner's tasks in a state due on a date.
+
+    Kept up to date by ``tasks.counters`` in the transactions that change tasks,
+    so summaries add up a few counters instead of counting the tasks. Due dates
+    are kept because they are what makes a task overdue as days pass.
+    """
+
+    owner = models.ForeignKey(
+        verbose_name=_("user"),
+        to="users.User",
+        on_delete=models.CASCADE,
+        # covered by the leading column of task_counter_key
+        db_index=False,
+    )
+    state = models.CharField(choices=TaskState.choices)
+    due_date = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "state", "due_date"], name="task_counter_key"
+            ),
+        ]
@@ -0,0 +1,186 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import date
+from typing import Any, NamedTuple, Optional
+from urllib import parse
+from uuid import UUID
+
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models.query import QuerySet
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TaskPageNumberPagination(PageNumberPagination):
+    """PageNumberPagination that can reuse a row count the view already knows."""
+
+    count = None
+
+    def django_paginator_class(self, object_list: QuerySet, per_page: int) -> Paginator:
+        paginator = Paginator(object_list, per_page)
+        if self.count is not None:
+            paginator.count = self.count
+        return paginator
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> Optional[list]:
+        """paginate_queryset for async views, querying with the async ORM."""
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        if self.count is None:
+            self.count = await queryset.acount()
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+        # the page slices the queryset lazily, fetch its rows before it is read
+        self.page.object_list = [row async for row in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+
+class Cursor(NamedTuple):
+    due_date: date
+    id: UUID
+    reverse: bool
+
+
+class TaskCursorPagination(BasePagination):
+    """Keyset pagination for tasks ordered by ``(due_date, id)``.
+
+    Each page is fetched with a range condition starting right after the last
+    seen ``(due_date, id)`` pair, so there is no COUNT query and no OFFSET -
+    fetching the 1000th page costs the same as fetching the first one. Works
+    with both model instances and named ``values_list`` rows.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    ordering = ("due_date", "id")
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list:
+        return self._set_page(list(self._get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list:
+        """paginate_queryset for async views, querying with the async ORM."""
+        page_queryset = self._get_page_queryset(queryset, request)
+        return self._set_page([row async for row in page_queryset])
+
+    def _get_page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            queryset = queryset.order_by(*self.ordering)
+        elif self.cursor.reverse:
+            queryset = (
+                queryset.filter(due_date__lte=self.cursor.due_date)
+                .exclude(due_date=self.cursor.due_date, id__gte=self.cursor.id)
+                .order_by(*[f"-{field}" for field in self.ordering])
+            )
+        else:
+            queryset = (
+                queryset.filter(due_date__gte=self.cursor.due_date)
+                .exclude(due_date=self.cursor.due_date, id__lte=self.cursor.id)
+                .order_by(*self.ordering)
+            )
+
+        # Fetch one extra row to know whether there is anything past this page.
+        return queryset[: self.page_size + 1]
+
+    def _set_page(self, results: list) -> list:
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        if not self.page:
+            # An empty page reached by going backwards - start from the beginning.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        last = self.page[-1]
+        return self.encode_cursor(Cursor(last.due_date, last.id, reverse=False))
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        first = self.page[0]
+        return self.encode_cursor(Cursor(first.due_date, first.id, reverse=True))
+
+    def decode_cursor(self, request: Request) -> Optional[Cursor]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            return Cursor(
+                due_date=date.fromisoformat(tokens["d"][0]),
+                id=UUID(tokens["i"][0]),
+                reverse=bool(int(tokens.get("r", ["0"])[0])),
+            )
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        tokens = {"d": cursor.due_date.isoformat(), "i": str(cursor.id)}
+        if cursor.reverse:
+            tokens["r"] = "1"
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
@@ -11,3 +11,8 @@ class IsTaskOwner(permissions.BasePermission):
 
     def has_object_permission(self, request: Request, view: Any, obj: Task) -> bool:
         return obj.owner_id == request.user.id
+
+    async def ahas_object_permission(
+        self, request: Request, view: Any, obj: Task
+    ) -> bool:
+        return self.has_object_permission(request, view, obj)
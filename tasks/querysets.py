@@ -0,0 +1,88 @@
+from typing import Sequence
+
+from asgiref.sync import sync_to_async
+from django.db import connections, models
+from django.utils.timezone import now
+
+
+class TaskQuerySet(models.QuerySet):
+    """A QuerySet used by Task's model."""
+
+    def upcoming(self, owner: models.Model) -> "TaskQuerySet":
+        """Return owner's tasks due today or later, the earliest first.
+
+        ``search_vector`` is only searched, it is left out of the loaded rows.
+        """
+        today = now()
+        return (
+            self.filter(due_date__gte=today, owner=owner)
+            .order_by("due_date", "id")
+            .defer("search_vector")
+        )
+
+    def update_state(
+        self, state: str, fields: Sequence[str] = ("id",)
+    ) -> list[models.Model]:
+        """Move the tasks that are not done yet to ``state`` with one statement.
+
+        Only ``state`` and ``updated_at`` are written and the guard against
+        changing DONE tasks is evaluated by the database, so concurrent requests
+        cannot both pass it. The same statement moves the tasks between their
+        TaskCounter rows, using the state each task had right before the update.
+        Returns the updated tasks with only ``fields`` loaded, read from the
+        UPDATE's RETURNING clause.
+        """
+        from tasks import counters
+        from tasks.models import TaskState
+
+        # routes to the database of writes, without changing the caller's queryset
+        queryset = self._chain()
+        queryset._for_write = True
+        connection = connections[queryset.db]
+        quote_name = connection.ops.quote_name
+        meta = self.model._meta
+        table = quote_name(meta.db_table)
+
+        # from_db() expects the values in the order of the model's fields
+        returned = [meta.get_field(field) for field in fields]
+        returned = [field for field in meta.concrete_fields if field in returned]
+        attnames = [field.attname for field in returned]
+        columns = [quote_name(field.column) for field in returned]
+        subquery, params = self.order_by().values("pk").query.sql_with_params()
+        pk = quote_name(meta.pk.column)
+        deltas = (
+            "SELECT counted_owner_id, counted_state, counted_due_date, sum(delta) "
+            "FROM ("
+            "SELECT counted_owner_id, old_state AS counted_state, "
+            "counted_due_date, -1 AS delta FROM updated "
+            "UNION ALL "
+            "SELECT counted_owner_id, %s, counted_due_date, 1 FROM updated"
+            ") AS deltas "
+            "GROUP BY 1, 2, 3 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3"
+        )
+        sql = (
+            # FOR UPDATE re-reads the state of rows changed concurrently
+            f"WITH old AS ("
+            f"SELECT {pk}, {quote_name('state')} FROM {table} "
+            f"WHERE {pk} IN ({subquery}) AND {quote_name('state')} <> %s "
+            f"FOR UPDATE"
+            f"), updated AS ("
+            f"UPDATE {table} "
+            f"SET {quote_name('state')} = %s, {quote_name('updated_at')} = %s "
+            f"FROM old WHERE {table}.{pk} = old.{pk} "
+            f"RETURNING {', '.join(f'{table}.{column}' for column in columns)}, "
+            f"{table}.{quote_name('owner_id')} AS counted_owner_id, "
+            f"{table}.{quote_name('due_date')} AS counted_due_date, "
+            f"old.{quote_name('state')} AS old_state"
+            f"), counted AS ({counters.upsert_sql(deltas)}) "
+            f"SELECT {', '.join(columns)} FROM updated"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*params, TaskState.DONE, state, now(), state])
+            rows = cursor.fetchall()
+        return [self.model.from_db(queryset.db, attnames, row) for row in rows]
+
+    async def aupdate_state(
+        self, state: str, fields: Sequence[str] = ("id",)
+    ) -> list[models.Model]:
+        return await sync_to_async(self.update_state)(state, fields)
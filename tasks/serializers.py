@@ -1,14 +1,39 @@
 from datetime import date
+from typing import Any, Callable, Optional
 
+from django.conf import settings
+from django.db import transaction
 from django.utils.timezone import now
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework.fields import CurrentUserDefault
+from rest_framework.fields import CurrentUserDefault, Field
+from rest_framework.settings import ISO_8601, api_settings
 
+from taskmanager.timing import TimedListSerializer, TimedSerializerMixin
+from tasks import counters
 from tasks.models import Task, TaskState
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    def create(self, validated_data: list[dict]) -> list[Task]:
+        tasks = [Task(**attrs, state=TaskState.TO_DO) for attrs in validated_data]
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks, batch_size=settings.TASKS_BULK_BATCH_SIZE)
+            counters.add(counters.delta(task, 1) for task in tasks)
+        return tasks
+
+
+class CountedTaskSerializerMixin:
+    """Keep TaskCounter up to date with the tasks changed by ``update``."""
+
+    def update(self, instance: Task, validated_data: dict) -> Task:
+        with counters.counting(instance):
+            return super().update(instance, validated_data)
+
+
+class TaskSerializer(
+    TimedSerializerMixin, CountedTaskSerializerMixin, serializers.ModelSerializer
+):
     owner = serializers.HiddenField(
         default=CurrentUserDefault(),
         write_only=True,
@@ -18,6 +43,7 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = ["description", "due_date", "id", "owner", "state", "title"]
         read_only_fields = ["state"]
+        list_serializer_class = TaskListSerializer
 
     def validate_due_date(self, due_date: date) -> date:
         if due_date < now().date():
@@ -26,18 +52,125 @@ class TaskSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data: dict) -> dict:
         validated_data["state"] = TaskState.TO_DO
-        return super().create(validated_data)
+        with transaction.atomic():
+            task = super().create(validated_data)
+            counters.add([counters.delta(task, 1)])
+        return task
+
+
+class TaskReadSerializer(TimedSerializerMixin, serializers.BaseSerializer):
+    """Read-only serializer giving TaskSerializer's output for ``values_list`` rows.
+
+    The conversion of every column is picked once from TaskSerializer's fields,
+    so serializing a row neither instantiates a model nor goes through the
+    field machinery for every value.
+    """
+
+    class Meta:
+        list_serializer_class = TimedListSerializer
+
+    source_serializer_class = TaskSerializer
+    _converters: Optional[list[tuple[str, str, Callable]]] = None
+
+    @classmethod
+    def get_converters(cls) -> list[tuple[str, str, Callable]]:
+        if cls._converters is None:
+            fields = cls.source_serializer_class().fields.values()
+            cls._converters = [
+                (field.field_name, field.source, cls._get_converter(field))
+                for field in fields
+                if not field.write_only
+            ]
+        return cls._converters
+
+    @classmethod
+    def get_columns(cls) -> list[str]:
+        return [source for _, source, _ in cls.get_converters()]
+
+    @staticmethod
+    def _get_converter(field: Field) -> Callable[[Any], Any]:
+        if isinstance(field, serializers.UUIDField):
+            if field.uuid_format == "hex_verbose":
+                return str
+        if isinstance(field, serializers.DateField):
+            output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+            if output_format and output_format.lower() == ISO_8601:
+                return date.isoformat
+        if type(field) is serializers.CharField:
+            return str
+        if isinstance(field, serializers.ChoiceField) and all(
+            isinstance(choice, str) for choice in field.choices
+        ):
+            return str
+        return field.to_representation
+
+    def to_representation(self, row: tuple) -> dict:
+        return {
+            name: None if value is None else convert(value)
+            for (name, _, convert), value in zip(self.get_converters(), row)
+        }
+
 
+class TaskStateSerializer(
+    TimedSerializerMixin, CountedTaskSerializerMixin, serializers.ModelSerializer
+):
+    already_done = "This task is already done."
 
-class TaskStateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ["state"]
 
     def validate_state(self, state: TaskState) -> TaskState:
         if self.instance.state == TaskState.DONE:
-            raise ValidationError("This task is already done.")
+            raise ValidationError(self.already_done)
         return state
 
     def to_representation(self, instance: Task) -> dict:
         return TaskSerializer().to_representation(instance)
+
+
+class TaskBulkStateSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+    def validate_ids(self, ids: list) -> list:
+        if len(ids) > settings.TASKS_BULK_MAX_SIZE:
+            raise ValidationError(
+                f"Ensure this field has no more than "
+                f"{settings.TASKS_BULK_MAX_SIZE} elements."
+            )
+        return list(dict.fromkeys(ids))
+
+
+class TaskBulkStateResultSerializer(serializers.Serializer):
+    updated = serializers.ListField(child=serializers.UUIDField())
+    skipped = serializers.ListField(child=serializers.UUIDField())
+    not_found = serializers.ListField(child=serializers.UUIDField())
+
+
+class TaskExportSerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    include_past = serializers.BooleanField(default=False)
+
+
+class TaskImportSerializer(TaskSerializer):
+    """TaskSerializer's rules for imported tasks, the importer sets their owner."""
+
+    owner = None
+
+    class Meta(TaskSerializer.Meta):
+        fields = ["description", "due_date", "title"]
+
+
+class TaskSummarySerializer(serializers.Serializer):
+    to_do = serializers.IntegerField()
+    in_progress = serializers.IntegerField()
+    done = serializers.IntegerField()
+    overdue = serializers.IntegerField()
+    total = serializers.IntegerField()
+
+
+class TaskImportResultSerializer(serializers.Serializer):
+    imported = serializers.IntegerField()
+    rejected = serializers.IntegerField()
+    rejects = serializers.ListField(child=serializers.DictField())
+    rejects_truncated = serializers.BooleanField()
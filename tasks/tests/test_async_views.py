@@ -0,0 +1,119 @@
+import csv
+from io import StringIO
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import include, path
+from rest_framework.reverse import reverse
+from rest_framework.routers import SimpleRouter
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_403_FORBIDDEN
+
+from tasks.async_views import AsyncTaskViewSet
+from tasks.factories import TaskFactory
+from tasks.models import Task, TaskState
+from tasks.tests.test_cache import TaskViewSetCacheTestCase
+from tasks.tests.test_conditional import TaskViewSetConditionalGetTestCase
+from tasks.tests.test_views import TaskViewSetTestCase
+from users import backends
+from users.authentication import make_token
+from users.factories import UserFactory
+
+router = SimpleRouter()
+router.register(r"", AsyncTaskViewSet, basename="task")
+
+urlpatterns = [path("tasks/", include((router.urls, "tasks")))]
+
+
+# The test cases of TaskViewSet run against AsyncTaskViewSet too. The sync test
+# client runs the async views in an event loop, where any ORM call that is not
+# async raises SynchronousOnlyOperation.
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncTaskViewSetTestCase(TaskViewSetTestCase):
+    """TestCase for AsyncTaskViewSet, the same as for TaskViewSet."""
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncTaskViewSetConditionalGetTestCase(TaskViewSetConditionalGetTestCase):
+    """TestCase for ETag and Last-Modified handling of AsyncTaskViewSet."""
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncTaskViewSetCacheTestCase(TaskViewSetCacheTestCase):
+    """TestCase for the response cache of AsyncTaskViewSet."""
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncTaskViewSetASGITestCase(TestCase):
+    """TestCase for AsyncTaskViewSet served by Django's ASGI handler."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+
+    def setUp(self) -> None:
+        self.url = reverse("tasks:task-list")
+
+    async def test_list_returns_forbidden_for_anonymous_user(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    async def test_list_returns_tasks_of_session_user(self):
+        task = await sync_to_async(TaskFactory)(owner=self.user)
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]], [str(task.pk)]
+        )
+
+    async def test_list_returns_tasks_of_token_user_not_cached_yet(self):
+        task = await sync_to_async(TaskFactory)(owner=self.user)
+        backends.clear()
+
+        response = await self.async_client.get(
+            self.url, headers={"Authorization": f"Token {make_token(self.user)}"}
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]], [str(task.pk)]
+        )
+
+    async def test_create_and_mark_done_with_session_user(self):
+        await self.async_client.aforce_login(self.user)
+        data = {"title": "Report", "description": "Q3", "due_date": "2100-01-01"}
+
+        created = await self.async_client.post(
+            self.url, data, content_type="application/json"
+        )
+        url = reverse("tasks:task-mark-done", kwargs={"pk": created.json()["id"]})
+        response = await self.async_client.post(url)
+
+        self.assertEqual(created.status_code, HTTP_201_CREATED)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        task = await Task.objects.aget(owner=self.user)
+        self.assertEqual(task.state, TaskState.DONE)
+
+    async def test_export_streams_chunks_asynchronously(self):
+        tasks = await sync_to_async(TaskFactory.create_batch)(
+            size=3, owner=self.user, due_date="2100-01-01"
+        )
+        await self.async_client.aforce_login(self.user)
+
+        with override_settings(TASKS_EXPORT_CHUNK_SIZE=2):
+            response = await self.async_client.get(
+                reverse("tasks:task-export"), {"file_format": "csv"}
+            )
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        # the header and the tasks in batches of two
+        self.assertEqual(len(chunks), 3)
+        rows = csv.DictReader(StringIO(b"".join(chunks).decode()))
+        self.assertEqual(
+            sorted(row["id"] for row in rows), sorted(str(task.pk) for task in tasks)
+        )
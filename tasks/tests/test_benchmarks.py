@@ -0,0 +1,24 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from tasks.benchmarks import benchmark_database
+
+
+class BenchmarkDatabaseTestCase(SimpleTestCase):
+    """TestCase for the throwaway database of the benchmarks."""
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    def test_reads_are_not_routed_to_replicas(self):
+        creation = connection.creation
+        with patch.object(creation, "create_test_db") as create_test_db:
+            with patch.object(creation, "destroy_test_db") as destroy_test_db:
+                with benchmark_database():
+                    replicas = settings.DATABASE_REPLICAS
+
+        self.assertEqual(replicas, [])
+        self.assertEqual(settings.DATABASE_REPLICAS, ["replica_1"])
+        create_test_db.assert_called_once()
+        destroy_test_db.assert_called_once()
@@ -0,0 +1,144 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_302_FOUND
+from rest_framework.test import APITestCase
+
+from tasks import cache as task_cache
+from tasks.factories import TaskFactory
+from tasks.models import TaskState
+from users.factories import UserFactory
+
+
+@override_settings(TASKS_CACHE_ENABLED=True, TASKS_CACHE_ALIAS="default")
+class TaskViewSetCacheTestCase(APITestCase):
+    """TestCase for the cache of TaskViewSet's responses."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+
+    def setUp(self) -> None:
+        cache.clear()
+        task_cache.stats.clear()
+        self.url = reverse("tasks:task-list")
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_served_from_cache_without_queries(self):
+        TaskFactory.create_batch(size=2, owner=self.user)
+        first_response = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertJSONEqual(response.content, first_response.content.decode())
+        self.assertEqual(task_cache.stats, {"hits": 1, "misses": 1})
+
+    def test_list_is_cached_per_query_params(self):
+        task = TaskFactory(owner=self.user)
+        self.client.get(self.url)
+
+        response = self.client.get(self.url, {"due_date": task.due_date})
+
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(task_cache.stats, {"misses": 2})
+
+    def test_list_is_cached_per_owner(self):
+        TaskFactory(owner=self.user)
+        self.client.get(self.url)
+        self.client.force_authenticate(UserFactory())
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_create_invalidates_owners_cached_list(self):
+        task = TaskFactory.build(owner=self.user)
+        self.client.get(self.url)
+        data = {
+            "due_date": task.due_date,
+            "title": task.title,
+            "description": task.description,
+        }
+        self.assertEqual(self.client.post(self.url, data).status_code, HTTP_201_CREATED)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_mark_done_invalidates_owners_cached_task(self):
+        task = TaskFactory(owner=self.user, state=TaskState.TO_DO)
+        url = reverse("tasks:task-detail", args=[task.pk])
+        self.client.get(url)
+        self.client.post(reverse("tasks:task-mark-done", args=[task.pk]))
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.json()["state"], TaskState.DONE)
+
+    def test_delete_invalidates_owners_cached_list(self):
+        task = TaskFactory(owner=self.user)
+        self.client.get(self.url)
+        self.client.delete(reverse("tasks:task-detail", args=[task.pk]))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_version_starts_again_after_eviction_without_reusing_old_numbers(self):
+        version = task_cache.get_version(self.user.pk)
+        task_cache.bump_version(self.user.pk)
+        cache.delete(f"tasks:version:{self.user.pk}")
+
+        self.assertGreater(task_cache.get_version(self.user.pk), version + 1)
+
+
+@override_settings(TASKS_CACHE_ENABLED=True, TASKS_CACHE_ALIAS="default")
+class TaskAdminCacheTestCase(APITestCase):
+    """TestCase for the invalidation of cached responses by the Task admin."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+
+    def test_change_invalidates_cached_responses_of_old_and_new_owner(self):
+        task = TaskFactory(owner=self.user)
+        new_owner = UserFactory()
+        versions = [task_cache.get_version(self.user.pk)]
+        versions.append(task_cache.get_version(new_owner.pk))
+        data = {
+            "owner": new_owner.pk,
+            "title": task.title,
+            "description": task.description,
+            "state": task.state,
+            "due_date": task.due_date,
+        }
+
+        response = self.client.post(
+            reverse("admin:tasks_task_change", args=[task.pk]), data, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, HTTP_302_FOUND)
+        self.assertGreater(task_cache.get_version(self.user.pk), versions[0])
+        self.assertGreater(task_cache.get_version(new_owner.pk), versions[1])
+
+    def test_delete_action_invalidates_owners_cached_responses(self):
+        task = TaskFactory(owner=self.user)
+        version = task_cache.get_version(self.user.pk)
+        data = {
+            "action": "delete_selected",
+            "_selected_action": [task.pk],
+            "post": "yes",
+        }
+
+        response = self.client.post(
+            reverse("admin:tasks_task_changelist"), data, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, HTTP_302_FOUND)
+        self.assertGreater(task_cache.get_version(self.user.pk), version)
@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase, override_settings
+
+from tasks.checks import check_replica_pins, check_tasks_cache
+
+LOCAL_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/taskmanager-test-cache",
+    }
+}
+
+
+@override_settings(TASKS_CACHE_ENABLED=True, TASKS_CACHE_ALIAS="default")
+class TasksCacheCheckTestCase(SimpleTestCase):
+    """TestCase for the check of the task responses' cache."""
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_local_memory_cache_is_an_error(self):
+        errors = check_tasks_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["tasks.E001"])
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_tasks_cache(None), [])
+
+    @override_settings(TASKS_CACHE_ENABLED=False)
+    def test_disabled_cache_passes(self):
+        self.assertEqual(check_tasks_cache(None), [])
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaPinsCheckTestCase(SimpleTestCase):
+    """TestCase for the check of the cache keeping the pins to the primary."""
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_local_memory_cache_is_an_error(self):
+        errors = check_replica_pins(None)
+
+        self.assertEqual([error.id for error in errors], ["tasks.E002"])
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_replica_pins(None), [])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_pass(self):
+        self.assertEqual(check_replica_pins(None), [])
@@ -0,0 +1,114 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils.http import http_date
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+from rest_framework.test import APITestCase
+
+from tasks.factories import TaskFactory
+from users.factories import UserFactory
+
+
+class TaskViewSetConditionalGetTestCase(APITestCase):
+    """TestCase for ETag and Last-Modified handling of TaskViewSet."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+
+    def setUp(self) -> None:
+        self.url = reverse("tasks:task-list")
+        self.client.force_authenticate(self.user)
+
+    def test_list_returns_validators(self):
+        task = TaskFactory(owner=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertTrue(response.headers["ETag"].startswith('"'))
+        self.assertEqual(
+            response.headers["Last-Modified"], http_date(task.updated_at.timestamp())
+        )
+
+    def test_list_returns_not_modified_for_matching_etag(self):
+        TaskFactory.create_batch(size=2, owner=self.user)
+        etag = self.client.get(self.url).headers["ETag"]
+        expected_queries = 1
+
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_list_etag_changes_when_a_task_is_deleted(self):
+        tasks = TaskFactory.create_batch(size=2, owner=self.user)
+        etag = self.client.get(self.url).headers["ETag"]
+        tasks[0].delete()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_list_etag_depends_on_query_params(self):
+        task = TaskFactory(owner=self.user)
+        etag = self.client.get(self.url).headers["ETag"]
+
+        response = self.client.get(
+            self.url, {"due_date": task.due_date}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_list_ignores_if_modified_since(self):
+        TaskFactory(owner=self.user)
+        last_modified = self.client.get(self.url).headers["Last-Modified"]
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_retrieve_returns_not_modified_for_matching_etag(self):
+        task = TaskFactory(owner=self.user)
+        url = reverse("tasks:task-detail", args=[task.pk])
+        etag = self.client.get(url).headers["ETag"]
+        expected_queries = 1
+
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_returns_not_modified_when_not_modified_since(self):
+        task = TaskFactory(owner=self.user)
+        url = reverse("tasks:task-detail", args=[task.pk])
+        last_modified = self.client.get(url).headers["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_returns_task_after_it_was_updated(self):
+        task = TaskFactory(owner=self.user)
+        url = reverse("tasks:task-detail", args=[task.pk])
+        etag = self.client.get(url).headers["ETag"]
+        self.client.patch(url, {"title": "New title"})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "New title")
+
+    @override_settings(TASKS_CACHE_ENABLED=True, TASKS_CACHE_ALIAS="default")
+    def test_cached_list_returns_not_modified_without_queries(self):
+        cache.clear()
+        TaskFactory(owner=self.user)
+        etag = self.client.get(self.url).headers["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,181 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.utils.timezone import now
+from factory import Iterator
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_403_FORBIDDEN
+from rest_framework.test import APITestCase
+
+from tasks import counters
+from tasks.factories import TaskFactory
+from tasks.models import Task, TaskCounter, TaskState
+from users.factories import UserFactory
+
+
+class TaskCountersTestCase(APITestCase):
+    """TestCase for keeping TaskCounter up to date with the tasks."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+        cls.due_date = (now() + timedelta(days=1)).date()
+
+    def setUp(self) -> None:
+        self.client.force_authenticate(self.user)
+        self.tasks = TaskFactory.create_batch(
+            size=3, owner=self.user, state=TaskState.TO_DO, due_date=self.due_date
+        )
+        # factories bypass the counters
+        counters.rebuild()
+
+    def assertCountersMatchTasks(self) -> None:
+        self.assertEqual(counters.find_drift(), [])
+
+    def test_create_adds_task_to_counters(self):
+        data = {"title": "t", "description": "d", "due_date": self.due_date}
+
+        self.client.post(reverse("tasks:task-list"), data)
+
+        self.assertCountersMatchTasks()
+        counter = TaskCounter.objects.get(owner=self.user)
+        self.assertEqual(counter.count, 4)
+
+    def test_bulk_create_adds_tasks_to_counters(self):
+        data = [
+            {"title": "t", "description": "d", "due_date": self.due_date + timedelta(i)}
+            for i in range(3)
+        ]
+
+        self.client.post(reverse("tasks:task-bulk-create"), data)
+
+        self.assertCountersMatchTasks()
+        self.assertEqual(TaskCounter.objects.filter(owner=self.user).count(), 3)
+
+    def test_update_moves_task_between_counters(self):
+        url = reverse("tasks:task-detail", args=[self.tasks[0].pk])
+
+        self.client.patch(url, {"due_date": self.due_date + timedelta(days=1)})
+
+        self.assertCountersMatchTasks()
+
+    def test_destroy_removes_task_from_counters(self):
+        url = reverse("tasks:task-detail", args=[self.tasks[0].pk])
+
+        self.client.delete(url)
+
+        self.assertCountersMatchTasks()
+        self.assertEqual(TaskCounter.objects.get(owner=self.user).count, 2)
+
+    def test_mark_actions_move_tasks_between_counters(self):
+        task = self.tasks[0]
+
+        self.client.post(reverse("tasks:task-mark-in-progress", args=[task.pk]))
+        self.assertCountersMatchTasks()
+        self.client.post(reverse("tasks:task-mark-done", args=[task.pk]))
+        self.assertCountersMatchTasks()
+        # rejected, the task is done already
+        self.client.post(reverse("tasks:task-mark-to-do", args=[task.pk]))
+        self.assertCountersMatchTasks()
+
+    def test_bulk_mark_moves_tasks_between_counters(self):
+        Task.objects.filter(pk=self.tasks[0].pk).update_state(TaskState.DONE)
+        ids = [task.pk for task in self.tasks]
+
+        self.client.post(reverse("tasks:task-bulk-mark-in-progress"), {"ids": ids})
+
+        self.assertCountersMatchTasks()
+        self.assertEqual(
+            counters.summary(self.user, now().date())["in_progress"], len(ids) - 1
+        )
+
+    def test_admin_delete_action_removes_tasks_from_counters(self):
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        data = {
+            "action": "delete_selected",
+            "_selected_action": [task.pk for task in self.tasks[:2]],
+            "post": "yes",
+        }
+
+        self.client.post(
+            reverse("admin:tasks_task_changelist"), data, format="multipart"
+        )
+
+        self.assertCountersMatchTasks()
+        self.assertEqual(TaskCounter.objects.get(owner=self.user).count, 1)
+
+    def test_marking_task_with_its_own_state_keeps_counters(self):
+        Task.objects.filter(pk=self.tasks[0].pk).update_state(TaskState.TO_DO)
+
+        self.assertCountersMatchTasks()
+
+
+class TaskViewSetSummaryTestCase(APITestCase):
+    """TestCase for the summary action of TaskViewSet."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+
+    def setUp(self) -> None:
+        self.url = reverse("tasks:task-summary")
+
+    def test_summary_returns_forbidden_for_anonymous_user(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_summary_counts_tasks_per_state_and_overdue_tasks(self):
+        self.client.force_authenticate(self.user)
+        today = now().date()
+        yesterday = today - timedelta(days=1)
+        TaskFactory.create_batch(size=2)
+        TaskFactory.create_batch(
+            size=5,
+            owner=self.user,
+            state=Iterator([TaskState.TO_DO, TaskState.IN_PROGRESS, TaskState.DONE]),
+            due_date=Iterator([yesterday, yesterday, yesterday, today, today]),
+        )
+        counters.rebuild()
+        expected_data = {
+            "to_do": 2,
+            "in_progress": 2,
+            "done": 1,
+            "overdue": 2,
+            "total": 5,
+        }
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json(), expected_data)
+
+    def test_summary_of_user_without_tasks(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.json(),
+            {"to_do": 0, "in_progress": 0, "done": 0, "overdue": 0, "total": 0},
+        )
+
+
+class ReconcileTaskCountersCommandTestCase(APITestCase):
+    """TestCase for the reconcile_task_counters command."""
+
+    def test_check_fails_on_drift_and_rebuild_fixes_it(self):
+        task = TaskFactory()
+        stdout = StringIO()
+
+        with self.assertRaisesMessage(CommandError, "1 drifted counters of 1 owners."):
+            call_command("reconcile_task_counters", check=True, stdout=stdout)
+        self.assertIn(f"{task.owner_id} {task.state}", stdout.getvalue())
+
+        call_command("reconcile_task_counters", stdout=stdout)
+
+        self.assertIn("Rebuilt 1 counters.", stdout.getvalue())
+        call_command("reconcile_task_counters", check=True, stdout=stdout)
+        self.assertEqual(TaskCounter.objects.get(owner=task.owner).count, 1)
@@ -0,0 +1,171 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils.timezone import now
+
+from tasks.importers import Reject, import_tasks
+from tasks.models import Task, TaskState
+from users.factories import UserFactory
+
+
+class ImportTasksTestCase(TestCase):
+    """TestCase for import_tasks."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+        cls.due_date = (now() + timedelta(days=1)).date()
+
+    def test_import_ndjson_in_batches(self):
+        lines = [
+            json.dumps(
+                {
+                    "title": f"task {i}",
+                    "description": "d",
+                    "due_date": str(self.due_date),
+                }
+            ).encode()
+            + b"\n"
+            for i in range(5)
+        ]
+        rejects = []
+
+        # a COPY and a counters' upsert per batch of two, each in a savepoint
+        with self.assertNumQueries(12):
+            result = import_tasks(
+                self.user, lines, "ndjson", rejects.append, batch_size=2
+            )
+
+        self.assertEqual(result, (5, 0))
+        self.assertEqual(rejects, [])
+        tasks = Task.objects.filter(owner=self.user).order_by("title")
+        self.assertEqual([t.title for t in tasks], [f"task {i}" for i in range(5)])
+        self.assertEqual({t.state for t in tasks}, {TaskState.TO_DO})
+        self.assertEqual({t.due_date for t in tasks}, {self.due_date})
+
+    def test_import_ndjson_rejects_invalid_rows(self):
+        past_date = (now() - timedelta(days=1)).date()
+        lines = [
+            b'{"title": "valid", "description": "d", "due_date": "%s"}\n'
+            % str(self.due_date).encode(),
+            b"\n",
+            b'{"title": "past", "description": "d", "due_date": "%s"}\n'
+            % str(past_date).encode(),
+            b"not json\n",
+            b"[1, 2]\n",
+        ]
+        rejects = []
+
+        result = import_tasks(self.user, lines, "ndjson", rejects.append)
+
+        self.assertEqual(result, (1, 3))
+        self.assertEqual([r.line for r in rejects], [3, 4, 5])
+        self.assertEqual(
+            rejects[0].errors, {"due_date": ["This date cannot be in the past."]}
+        )
+        self.assertEqual(rejects[1].row, "not json")
+        self.assertEqual(
+            rejects[2],
+            Reject(5, [1, 2], {"non_field_errors": ["Invalid JSON object."]}),
+        )
+
+    def test_import_csv(self):
+        content = (
+            "\ufefftitle,description,due_date\r\n"
+            f'first,"multi\r\nline",{self.due_date}\r\n'
+            f"second,,{self.due_date}\r\n"
+            f"third,d,{self.due_date}\r\n"
+        )
+        rejects = []
+
+        result = import_tasks(
+            self.user, content.encode().splitlines(True), "csv", rejects.append
+        )
+
+        self.assertEqual(result, (2, 1))
+        self.assertEqual(rejects[0].line, 4)
+        self.assertIn("description", rejects[0].errors)
+        self.assertEqual(
+            Task.objects.get(owner=self.user, title="first").description,
+            "multi\r\nline",
+        )
+
+    def test_import_csv_in_other_encoding(self):
+        content = f"title,description,due_date\r\ncafé,crème,{self.due_date}\r\n"
+        lines = content.encode("latin-1").splitlines(True)
+        rejects = []
+
+        result = import_tasks(
+            self.user, lines, "csv", rejects.append, encoding="latin-1"
+        )
+
+        self.assertEqual(result, (1, 0), rejects)
+        self.assertEqual(Task.objects.get(owner=self.user).description, "crème")
+
+    def test_import_csv_rejects_records_invalid_in_encoding(self):
+        content = (
+            "title,description,due_date\r\n"
+            f'first,"multi\r\nlinè",{self.due_date}\r\n'
+            f"second,d,{self.due_date}\r\n"
+        )
+        rejects = []
+
+        result = import_tasks(
+            self.user, content.encode("latin-1").splitlines(True), "csv", rejects.append
+        )
+
+        self.assertEqual(result, (1, 1))
+        self.assertEqual(rejects[0].line, 3)
+        self.assertEqual(rejects[0].row["description"], "multi\r\nlin\ufffd")
+        self.assertEqual(
+            rejects[0].errors, {"non_field_errors": ["Invalid utf-8 text."]}
+        )
+        self.assertEqual(Task.objects.get(owner=self.user).title, "second")
+
+
+class ImportTasksCommandTestCase(TestCase):
+    """TestCase for the import_tasks command."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = UserFactory()
+
+    def test_import_writes_rejects_file(self):
+        due_date = (now() + timedelta(days=1)).date()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "tasks.csv"
+            path.write_text(
+                f"title,description,due_date\nvalid,d,{due_date}\nmissing,d,\n"
+            )
+            rejects_path = Path(directory) / "rejects.ndjson"
+            stdout = StringIO()
+
+            call_command(
+                "import_tasks",
+                str(path),
+                owner=self.user.email,
+                rejects=str(rejects_path),
+                stdout=stdout,
+            )
+
+            rejects = [
+                json.loads(line) for line in rejects_path.read_text().splitlines()
+            ]
+        self.assertIn("Imported 1 tasks, rejected 1.", stdout.getvalue())
+        self.assertEqual(Task.objects.get(owner=self.user).title, "valid")
+        self.assertEqual(len(rejects), 1)
+        self.assertEqual(rejects[0]["line"], 3)
+        self.assertIn("due_date", rejects[0]["errors"])
+
+    def test_import_fails_for_unknown_owner(self):
+        with self.assertRaises(CommandError):
+            call_command("import_tasks", "tasks.csv", owner="nobody@example.com")
+
+    def test_import_fails_for_unknown_file_format(self):
+        with self.assertRaises(CommandError):
+            call_command("import_tasks", "tasks.xml", owner=self.user.email)
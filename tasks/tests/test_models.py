@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from tasks.benchmarks import list_query_plan, query_plan, seed_tasks
+from tasks.factories import TaskFactory
+from tasks.filters import TaskFilterSet
+from tasks.models import SEARCH_CONFIG, Task, TaskState
+
+
+class TaskQuerySetTestCase(TestCase):
+    """TestCase for TaskQuerySet."""
+
+    def test_upcoming_does_not_load_search_vector(self):
+        task = TaskFactory()
+
+        with CaptureQueriesContext(connection) as queries:
+            upcoming = list(Task.objects.upcoming(task.owner))
+
+        self.assertEqual(upcoming, [task])
+        self.assertEqual(upcoming[0].get_deferred_fields(), {"search_vector"})
+        self.assertNotIn("search_vector", queries[0]["sql"])
+
+
+class TaskIndexesTestCase(TransactionTestCase):
+    """TestCase for indexes defined on the Task model.
+
+    The planner picks indexes by table statistics, so the tasks are seeded and
+    analyzed like the benchmarks' instead of forcing its choice. Tests run
+    outside of a transaction, else ANALYZE would leave the statistics of rows
+    rolled back to the tests that follow.
+    """
+
+    def setUp(self) -> None:
+        # 30000 tasks, the size of ANALYZE's sample, so it reads all of them and
+        # the statistics and plans are the same on every run
+        self.owner = seed_tasks(owners=50, tasks_per_owner=200, heavy_owner_tasks=20000)
+
+    def _filter_plan(self, params: dict) -> dict:
+        filterset = TaskFilterSet(params, queryset=Task.objects.upcoming(self.owner))
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        return query_plan(filterset.qs[:30])
+
+    def test_upcoming_tasks_are_read_with_an_index_range_scan(self):
+        result = list_query_plan(self.owner)
+
+        self.assertIn("Index Scan using task_owner_due_date_idx", result["nodes"])
+        self.assertFalse(result["sorted_in_memory"])
+
+    def test_search_words_are_matched_with_the_gin_index(self):
+        query = SearchQuery("12345", search_type="websearch", config=SEARCH_CONFIG)
+
+        result = query_plan(Task.objects.filter(owner=self.owner, search_vector=query))
+
+        self.assertIn("Bitmap Index Scan using task_owner_search_idx", result["nodes"])
+
+    def test_task_filters_are_served_by_their_indexes(self):
+        today = now().date()
+        week = {
+            "due_date__gte": today.isoformat(),
+            "due_date__lte": (today + timedelta(days=7)).isoformat(),
+        }
+        state = {"state": TaskState.IN_PROGRESS}
+        open_states = {"state__in": f"{TaskState.TO_DO},{TaskState.IN_PROGRESS}"}
+        # nothing was updated since, the index skips all of the owner's tasks
+        updated_after = {"updated_after": now().isoformat()}
+        # filters: indexes of the plan, whether its rows are sorted after
+        cases = [
+            (week, ["task_owner_due_date_idx"], False),
+            (state, ["task_owner_state_due_date_idx"], False),
+            (week | state, ["task_owner_state_due_date_idx"], False),
+            (open_states, ["task_owner_open_due_date_idx"], False),
+            (week | open_states, ["task_owner_open_due_date_idx"], False),
+            (updated_after, ["task_owner_updated_at_idx"], True),
+            (updated_after | state, ["task_owner_updated_at_idx"], True),
+            (
+                {"search": "12345"},
+                ["task_owner_search_idx", "task_owner_title_prefix_idx"],
+                True,
+            ),
+        ]
+
+        for params, expected_indexes, sorted_in_memory in cases:
+            with self.subTest(params=params):
+                result = self._filter_plan(params)
+
+                indexes = [
+                    node.split(" using ")[1]
+                    for node in result["nodes"]
+                    if " using " in node
+                ]
+                self.assertEqual(indexes, expected_indexes, result["nodes"])
+                self.assertEqual(result["sorted_in_memory"], sorted_in_memory)
@@ -0,0 +1,26 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from tasks.factories import TaskFactory
+from tasks.models import Task
+from tasks.serializers import TaskReadSerializer, TaskSerializer
+
+
+class TaskReadSerializerTestCase(APITestCase):
+    """TestCase for TaskReadSerializer."""
+
+    def test_get_columns_returns_readable_fields_of_task_serializer(self):
+        expected_columns = ["description", "due_date", "id", "state", "title"]
+
+        self.assertEqual(TaskReadSerializer.get_columns(), expected_columns)
+
+    def test_output_is_identical_to_task_serializer(self):
+        TaskFactory.create_batch(size=5)
+        queryset = Task.objects.order_by("due_date", "id")
+        rows = queryset.values_list(*TaskReadSerializer.get_columns(), named=True)
+        renderer = JSONRenderer()
+
+        expected_content = renderer.render(TaskSerializer(queryset, many=True).data)
+        content = renderer.render(TaskReadSerializer(rows, many=True).data)
+
+        self.assertEqual(content, expected_content)
@@ -1,6 +1,9 @@
+import csv
 from datetime import timedelta
-from unittest.mock import ANY
+from io import StringIO
+from unittest.mock import ANY, patch
 
+from django.test import override_settings
 from django.utils.timezone import now
 from factory import Iterator
 from rest_framework.reverse import reverse
@@ -10,11 +13,14 @@ from rest_framework.status import (
     HTTP_204_NO_CONTENT,
     HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
+    HTTP_404_NOT_FOUND,
+    HTTP_415_UNSUPPORTED_MEDIA_TYPE,
 )
 from rest_framework.test import APITestCase
 
 from tasks.factories import TaskFactory
 from tasks.models import Task, TaskState
+from tasks.pagination import TaskCursorPagination
 from users.factories import UserFactory
 
 
@@ -102,6 +108,164 @@ class TaskViewSetTestCase(APITestCase):
         self.assertEqual(response.status_code, HTTP_200_OK)
         self.assertJSONEqual(response.content, expected_data)
 
+    def test_list_searches_tasks_by_words_ranking_titles_first(self):
+        self.client.force_authenticate(self.user)
+        due_date = (now() + timedelta(days=1)).date()
+        in_description = TaskFactory(
+            owner=self.user,
+            due_date=due_date,
+            title="Call Bob",
+            description="Prepare the quarterly budgets",
+        )
+        in_title = TaskFactory(
+            owner=self.user,
+            due_date=due_date + timedelta(days=1),
+            title="Review budget",
+            description="Numbers",
+        )
+        TaskFactory(owner=self.user, title="Call Alice", description="Holidays")
+        TaskFactory(title="Budget", description="Budget of another user")
+        expected_data = {
+            "count": 2,
+            "next": None,
+            "previous": None,
+            "results": [
+                self._prepare_task_response(in_title),
+                self._prepare_task_response(in_description),
+            ],
+        }
+
+        response = self.client.get(self.url, {"search": "budget"})
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertJSONEqual(response.content, expected_data)
+
+    def test_list_searches_tasks_by_title_prefix(self):
+        self.client.force_authenticate(self.user)
+        task = TaskFactory(owner=self.user, title="Quarterly budget")
+        TaskFactory(owner=self.user, title="Budget for a quarter")
+
+        response = self.client.get(self.url, {"search": "quar"})
+
+        self.assertEqual(
+            response.json()["results"], [self._prepare_task_response(task)]
+        )
+
+    def test_list_search_supports_websearch_syntax(self):
+        self.client.force_authenticate(self.user)
+        task = TaskFactory(owner=self.user, title="Review budget", description="")
+        TaskFactory(owner=self.user, title="Review roadmap", description="")
+
+        response = self.client.get(self.url, {"search": "review -roadmap"})
+
+        self.assertEqual(
+            response.json()["results"], [self._prepare_task_response(task)]
+        )
+
+    def test_list_filters_tasks_by_due_date_range_and_state(self):
+        self.client.force_authenticate(self.user)
+        today = now().date()
+        task = TaskFactory(owner=self.user, due_date=today, state=TaskState.IN_PROGRESS)
+        TaskFactory(owner=self.user, due_date=today, state=TaskState.TO_DO)
+        TaskFactory(
+            owner=self.user,
+            due_date=today + timedelta(days=8),
+            state=TaskState.IN_PROGRESS,
+        )
+        params = {
+            "due_date__gte": today.isoformat(),
+            "due_date__lte": (today + timedelta(days=7)).isoformat(),
+            "state": TaskState.IN_PROGRESS,
+        }
+
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"], [self._prepare_task_response(task)]
+        )
+
+    def test_list_filters_tasks_by_many_states(self):
+        self.client.force_authenticate(self.user)
+        tasks = TaskFactory.create_batch(
+            size=2,
+            owner=self.user,
+            due_date=Iterator([now().date(), (now() + timedelta(days=1)).date()]),
+            state=Iterator([TaskState.TO_DO, TaskState.DONE]),
+        )
+        TaskFactory(owner=self.user, state=TaskState.IN_PROGRESS)
+
+        response = self.client.get(
+            self.url, {"state__in": f"{TaskState.TO_DO},{TaskState.DONE}"}
+        )
+
+        self.assertEqual(
+            response.json()["results"],
+            [self._prepare_task_response(t) for t in tasks],
+        )
+
+    def test_list_filters_tasks_updated_after(self):
+        self.client.force_authenticate(self.user)
+        TaskFactory(owner=self.user)
+        since = now()
+        task = TaskFactory(owner=self.user)
+
+        response = self.client.get(self.url, {"updated_after": since.isoformat()})
+
+        self.assertEqual(
+            response.json()["results"], [self._prepare_task_response(task)]
+        )
+
+    def test_list_returns_bad_request_for_invalid_filters(self):
+        self.client.force_authenticate(self.user)
+
+        for params in [
+            {"state": "LATER"},
+            {"state__in": f"{TaskState.TO_DO},LATER"},
+            {"due_date__gte": "tomorrow"},
+            {"updated_after": "yesterday"},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+
+                self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_list_with_cursor_pagination_queries_count(self):
+        self.client.force_authenticate(self.user)
+        TaskFactory.create_batch(size=3, owner=self.user)
+        expected_queries = 1
+
+        with self.assertNumQueries(expected_queries):
+            self.client.get(self.url, {"pagination": "cursor"})
+
+    @patch.object(TaskCursorPagination, "page_size", 2)
+    def test_list_with_cursor_pagination_follows_next_and_previous_links(self):
+        self.client.force_authenticate(self.user)
+        due_date = (now() + timedelta(days=1)).date()
+        tasks = TaskFactory.create_batch(size=5, owner=self.user, due_date=due_date)
+        tasks.sort(key=lambda t: (t.due_date, str(t.pk)))
+        expected_pages = [tasks[:2], tasks[2:4], tasks[4:]]
+
+        response = self.client.get(self.url, {"pagination": "cursor"})
+        pages = [response.json()]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).json())
+        previous_page = self.client.get(pages[-1]["previous"]).json()
+
+        self.assertEqual(
+            [page["results"] for page in pages],
+            [[self._prepare_task_response(t) for t in p] for p in expected_pages],
+        )
+        self.assertIsNone(pages[0]["previous"])
+        self.assertEqual(previous_page["results"], pages[1]["results"])
+
+    def test_list_with_cursor_pagination_returns_not_found_for_invalid_cursor(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+
     def test_retrieve_returns_forbidden_for_anonymous_user(self):
         task = TaskFactory()
         url = reverse("tasks:task-detail", args=[task.pk])
@@ -167,6 +331,131 @@ class TaskViewSetTestCase(APITestCase):
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
         self.assertJSONEqual(response.content, expected_response)
 
+    def test_bulk_create_returns_forbidden_for_anonymous_user(self):
+        url = reverse("tasks:task-bulk-create")
+
+        response = self.client.post(url, [])
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_bulk_create_creates_tasks_for_user(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("tasks:task-bulk-create")
+        tasks = TaskFactory.build_batch(size=3, owner=self.user, state=TaskState.TO_DO)
+        data = [
+            {
+                "due_date": task.due_date,
+                "title": task.title,
+                "description": task.description,
+                "state": TaskState.DONE,
+            }
+            for task in tasks
+        ]
+        expected_response = [
+            self._prepare_task_response(task) | {"id": ANY} for task in tasks
+        ]
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        self.assertJSONEqual(response.content, expected_response)
+        self.assertEqual(
+            Task.objects.filter(owner=self.user, state=TaskState.TO_DO).count(), 3
+        )
+
+    def test_bulk_create_inserts_tasks_with_one_query_and_updates_counters(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("tasks:task-bulk-create")
+        data = [
+            {
+                "due_date": task.due_date,
+                "title": task.title,
+                "description": task.description,
+            }
+            for task in TaskFactory.build_batch(size=20)
+        ]
+        # the INSERT and the counters' upsert, in a savepoint
+        expected_queries = 4
+
+        with self.assertNumQueries(expected_queries):
+            self.client.post(url, data)
+
+    def test_bulk_create_returns_errors_and_creates_nothing_when_task_invalid(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("tasks:task-bulk-create")
+        data = [
+            {
+                "due_date": (now() + timedelta(days=1)).date(),
+                "title": "Task title",
+                "description": "Task description",
+            },
+            {
+                "due_date": (now() - timedelta(days=1)).date(),
+                "title": "Task title",
+                "description": "Task description",
+            },
+        ]
+        expected_response = [
+            {},
+            {"due_date": ["This date cannot be in the past."]},
+        ]
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertJSONEqual(response.content, expected_response)
+        self.assertFalse(Task.objects.filter(owner=self.user).exists())
+
+    def test_bulk_create_with_skip_invalid_creates_valid_tasks(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("tasks:task-bulk-create") + "?skip_invalid=true"
+        task = TaskFactory.build(owner=self.user, state=TaskState.TO_DO)
+        data = [
+            {
+                "due_date": (now() - timedelta(days=1)).date(),
+                "title": "Task title",
+                "description": "Task description",
+            },
+            {
+                "due_date": task.due_date,
+                "title": task.title,
+                "description": task.description,
+            },
+        ]
+        expected_response = {
+            "created": [self._prepare_task_response(task) | {"id": ANY}],
+            "errors": [
+                {
+                    "index": 0,
+                    "errors": {"due_date": ["This date cannot be in the past."]},
+                },
+            ],
+        }
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        self.assertJSONEqual(response.content, expected_response)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+
+    @override_settings(TASKS_BULK_MAX_SIZE=2)
+    def test_bulk_create_returns_error_when_too_many_tasks(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("tasks:task-bulk-create")
+        data = [
+            {
+                "due_date": task.due_date,
+                "title": task.title,
+                "description": task.description,
+            }
+            for task in TaskFactory.build_batch(size=3)
+        ]
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.filter(owner=self.user).exists())
+
     def test_update_returns_forbidden_for_anonymous_user(self):
         task = TaskFactory()
         url = reverse("tasks:task-detail", args=[task.pk])
@@ -358,6 +647,26 @@ class TaskViewSetTestCase(APITestCase):
                 self.assertEqual(response.status_code, HTTP_200_OK)
                 self.assertJSONEqual(response.content, expected_response)
 
+    def test_mark_done_queries_count(self):
+        self.client.force_authenticate(self.user)
+        task = TaskFactory(owner=self.user, state=TaskState.TO_DO)
+        url = reverse("tasks:task-mark-done", args=[task.pk])
+        expected_queries = 1
+
+        with self.assertNumQueries(expected_queries):
+            self.client.post(url)
+
+    def test_mark_done_returns_not_found_when_user_is_not_owner(self):
+        self.client.force_authenticate(self.user)
+        task = TaskFactory(state=TaskState.TO_DO)
+        url = reverse("tasks:task-mark-done", args=[task.pk])
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+        task.refresh_from_db()
+        self.assertEqual(task.state, TaskState.TO_DO)
+
     def test_mark_done_returns_returns_error_when_task_is_done(self):
         self.client.force_authenticate(self.user)
         task = TaskFactory(owner=self.user, state=TaskState.DONE)
@@ -365,8 +674,242 @@ class TaskViewSetTestCase(APITestCase):
         expected_response = {
             "state": ["This task is already done."],
         }
+        updated_at = task.updated_at
 
         response = self.client.post(url)
 
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
         self.assertJSONEqual(response.content, expected_response)
+        task.refresh_from_db()
+        self.assertEqual(task.updated_at, updated_at)
+
+    def test_bulk_mark_done_returns_forbidden_for_anonymous_user(self):
+        task = TaskFactory()
+        url = reverse("tasks:task-bulk-mark-done")
+
+        response = self.client.post(url, {"ids": [task.pk]})
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_bulk_mark_done_updates_tasks_with_one_query(self):
+        self.client.force_authenticate(self.user)
+        tasks = TaskFactory.create_batch(
+            size=3,
+            owner=self.user,
+            state=Iterator([TaskState.TO_DO, TaskState.IN_PROGRESS]),
+        )
+        url = reverse("tasks:task-bulk-mark-done")
+        expected_queries = 1
+
+        with self.assertNumQueries(expected_queries):
+            response = self.client.post(url, {"ids": [t.pk for t in tasks]})
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            Task.objects.filter(owner=self.user, state=TaskState.DONE).count(), 3
+        )
+
+    def test_bulk_mark_in_progress_reports_skipped_and_not_found_tasks(self):
+        self.client.force_authenticate(self.user)
+        todo, done = TaskFactory.create_batch(
+            size=2,
+            owner=self.user,
+            state=Iterator([TaskState.TO_DO, TaskState.DONE]),
+        )
+        not_owned = TaskFactory(state=TaskState.TO_DO)
+        url = reverse("tasks:task-bulk-mark-in-progress")
+        data = {"ids": [todo.pk, done.pk, not_owned.pk]}
+        expected_response = {
+            "updated": [str(todo.pk)],
+            "skipped": [str(done.pk)],
+            "not_found": [str(not_owned.pk)],
+        }
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertJSONEqual(response.content, expected_response)
+        todo.refresh_from_db()
+        not_owned.refresh_from_db()
+        self.assertEqual(todo.state, TaskState.IN_PROGRESS)
+        self.assertEqual(not_owned.state, TaskState.TO_DO)
+
+    def test_bulk_mark_to_do_returns_error_when_no_ids_given(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("tasks:task-bulk-mark-to-do")
+
+        response = self.client.post(url, {"ids": []})
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_export_returns_forbidden_for_anonymous_user(self):
+        response = self.client.get(reverse("tasks:task-export"))
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_export_streams_users_upcoming_tasks_as_ndjson(self):
+        self.client.force_authenticate(self.user)
+        today = now().date()
+        TaskFactory.create_batch(size=2)
+        TaskFactory(owner=self.user, due_date=today - timedelta(days=1))
+        tasks = TaskFactory.create_batch(
+            size=3,
+            due_date=Iterator([today + timedelta(days=i) for i in range(3)]),
+            owner=self.user,
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("tasks:task-export"))
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="tasks.ndjson"'
+        )
+        lines = content.decode().splitlines()
+        self.assertEqual(len(lines), len(tasks))
+        for line, task in zip(lines, tasks):
+            self.assertJSONEqual(line, self._prepare_task_response(task))
+
+    @override_settings(TASKS_EXPORT_CHUNK_SIZE=2)
+    def test_export_streams_past_tasks_as_csv(self):
+        self.client.force_authenticate(self.user)
+        today = now().date()
+        tasks = TaskFactory.create_batch(
+            size=3,
+            due_date=Iterator([today + timedelta(days=i) for i in (-2, -1, 1)]),
+            owner=self.user,
+        )
+        url = reverse("tasks:task-export")
+
+        response = self.client.get(
+            url, {"file_format": "csv", "include_past": "true"}, HTTP_ACCEPT="text/csv"
+        )
+        chunks = list(response.streaming_content)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        # the header and the tasks in batches of two
+        self.assertEqual(len(chunks), 3)
+        expected_rows = [["description", "due_date", "id", "state", "title"]] + [
+            [t.description, t.due_date.isoformat(), str(t.pk), t.state, t.title]
+            for t in tasks
+        ]
+        rows = list(csv.reader(StringIO(b"".join(chunks).decode())))
+        self.assertEqual(rows, expected_rows)
+
+    def test_export_returns_error_for_unknown_file_format(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(reverse("tasks:task-export"), {"file_format": "xml"})
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertIn("file_format", response.json())
+
+    def test_import_tasks_returns_forbidden_for_anonymous_user(self):
+        response = self.client.post(
+            reverse("tasks:task-import-tasks"), b"", content_type="text/csv"
+        )
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_import_tasks_imports_valid_tasks_and_reports_rejects(self):
+        self.client.force_authenticate(self.user)
+        due_date = (now() + timedelta(days=1)).date()
+        content = (
+            f'{{"title": "valid", "description": "d", "due_date": "{due_date}"}}\n'
+            '{"title": "invalid"}\n'
+        )
+
+        response = self.client.post(
+            reverse("tasks:task-import-tasks"),
+            content.encode(),
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        expected_data = {
+            "imported": 1,
+            "rejected": 1,
+            "rejects": [
+                {
+                    "line": 2,
+                    "row": {"title": "invalid"},
+                    "errors": {
+                        "description": ["This field is required."],
+                        "due_date": ["This field is required."],
+                    },
+                }
+            ],
+            "rejects_truncated": False,
+        }
+        self.assertEqual(response.json(), expected_data)
+        self.assertEqual(Task.objects.get(owner=self.user).title, "valid")
+
+    @override_settings(TASKS_IMPORT_MAX_REPORTED_REJECTS=1)
+    def test_import_tasks_returns_error_when_nothing_is_imported(self):
+        self.client.force_authenticate(self.user)
+        content = "title,description,due_date\na,b,\nc,d,\n"
+
+        response = self.client.post(
+            reverse("tasks:task-import-tasks"),
+            content.encode(),
+            content_type="text/csv; charset=utf-8",
+        )
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        data = response.json()
+        self.assertEqual((data["imported"], data["rejected"]), (0, 2))
+        self.assertEqual(len(data["rejects"]), 1)
+        self.assertTrue(data["rejects_truncated"])
+
+    def test_import_tasks_decodes_charset_of_content_type(self):
+        self.client.force_authenticate(self.user)
+        due_date = (now() + timedelta(days=1)).date()
+        content = f"title,description,due_date\ncafé,d,{due_date}\n"
+
+        response = self.client.post(
+            reverse("tasks:task-import-tasks"),
+            content.encode("latin-1"),
+            content_type="text/csv; charset=latin-1",
+        )
+
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        self.assertEqual(Task.objects.get(owner=self.user).title, "café")
+
+    def test_import_tasks_rejects_records_invalid_in_charset(self):
+        self.client.force_authenticate(self.user)
+        content = "title,description,due_date\ncafé,d,2000-01-01\n"
+
+        response = self.client.post(
+            reverse("tasks:task-import-tasks"),
+            content.encode("latin-1"),
+            content_type="text/csv",
+        )
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["rejects"][0]["errors"],
+            {"non_field_errors": ["Invalid utf-8 text."]},
+        )
+
+    def test_import_tasks_returns_error_for_unknown_charset(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            reverse("tasks:task-import-tasks"),
+            b"title,description,due_date\n",
+            content_type="text/csv; charset=unknown",
+        )
+
+        self.assertEqual(response.status_code, HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_import_tasks_returns_error_for_unsupported_content_type(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            reverse("tasks:task-import-tasks"), [], format="json"
+        )
+
+        self.assertEqual(response.status_code, HTTP_415_UNSUPPORTED_MEDIA_TYPE)
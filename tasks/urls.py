@@ -1,11 +1,17 @@
+from django.conf import settings
 from rest_framework import routers
 
+from tasks.async_views import AsyncTaskViewSet
 from tasks.views import TaskViewSet
 
 app_name = "tasks"
 
 router = routers.SimpleRouter()
 
-router.register(r"", TaskViewSet, basename="task")
+router.register(
+    r"",
+    AsyncTaskViewSet if settings.TASKS_ASYNC_VIEWS else TaskViewSet,
+    basename="task",
+)
 
 urlpatterns = router.urls
@@ -1,25 +1,103 @@
-from typing import Type
+from typing import Any, Callable, Optional, Type
 
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max
 from django.db.models.query import QuerySet
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_header_parameters
 from django.utils.timezone import now
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import ModelSerializer
 from rest_framework.viewsets import ModelViewSet
 
+from taskmanager.views import ReplicaReadsMixin
+from tasks import cache as task_cache
+from tasks import counters, importers
+from tasks.conditional import Validators, make_etag
+from tasks.exporters import EXPORTERS, ExportContentNegotiation, aiter_chunks
 from tasks.filters import TaskFilterSet
 from tasks.models import Task, TaskState
+from tasks.pagination import TaskCursorPagination, TaskPageNumberPagination
 from tasks.permissions import IsTaskOwner
-from tasks.serializers import TaskSerializer, TaskStateSerializer
+from tasks.serializers import (
+    TaskBulkStateResultSerializer,
+    TaskBulkStateSerializer,
+    TaskExportSerializer,
+    TaskImportResultSerializer,
+    TaskImportSerializer,
+    TaskReadSerializer,
+    TaskSerializer,
+    TaskStateSerializer,
+    TaskSummarySerializer,
+)
 
 
 @extend_schema_view(
     create=extend_schema(description="Create a new task for the logged-in user."),
-    list=extend_schema(description="List out logged-in User's upcoming tasks."),
+    bulk_create=extend_schema(
+        description=(
+            "Create many tasks for the logged-in user at once. By default nothing "
+            "is created if any of the tasks is invalid."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "skip_invalid",
+                bool,
+                description="Create the valid tasks and report errors of the rest.",
+            ),
+        ],
+        request=TaskSerializer(many=True),
+        responses={status.HTTP_201_CREATED: TaskSerializer(many=True)},
+    ),
+    export=extend_schema(
+        description=(
+            "Stream all upcoming tasks of the logged-in User as NDJSON (one JSON "
+            "object per line) or CSV. Pass `include_past=true` to export past "
+            "tasks too."
+        ),
+        parameters=[TaskExportSerializer],
+        responses={
+            (status.HTTP_200_OK, "application/x-ndjson"): OpenApiTypes.STR,
+            (status.HTTP_200_OK, "text/csv"): OpenApiTypes.STR,
+        },
+    ),
+    import_tasks=extend_schema(
+        description=(
+            "Import many tasks for the logged-in User from an NDJSON or CSV body, "
+            "picked by its Content-Type. Tasks are validated like on create, "
+            "the valid ones are imported and the rejected ones reported."
+        ),
+        request={
+            "application/x-ndjson": OpenApiTypes.STR,
+            "text/csv": OpenApiTypes.STR,
+        },
+        responses={
+            status.HTTP_201_CREATED: TaskImportResultSerializer,
+            status.HTTP_400_BAD_REQUEST: TaskImportResultSerializer,
+        },
+    ),
+    summary=extend_schema(
+        description=(
+            "Count all tasks of the logged-in User per state, and the overdue ones: "
+            "not done and due before today."
+        ),
+    ),
+    list=extend_schema(
+        description=(
+            "List out logged-in User's upcoming tasks. "
+            "Pass `pagination=cursor` to use keyset pagination instead of pages."
+        ),
+    ),
     retrieve=extend_schema(
         description="Get details of a specific task for the logged-in User.",
     ),
@@ -56,29 +134,198 @@ from tasks.serializers import TaskSerializer, TaskStateSerializer
         request=None,
         responses={status.HTTP_200_OK: TaskSerializer},
     ),
+    bulk_mark_to_do=extend_schema(
+        description=(
+            "Update many tasks related to the logged-in User to be in TO-DO state. "
+            "Tasks that are already done are skipped."
+        ),
+        responses={status.HTTP_200_OK: TaskBulkStateResultSerializer},
+    ),
+    bulk_mark_in_progress=extend_schema(
+        description=(
+            "Update many tasks related to the logged-in User to be in "
+            "IN-PROGRESS state. Tasks that are already done are skipped."
+        ),
+        responses={status.HTTP_200_OK: TaskBulkStateResultSerializer},
+    ),
+    bulk_mark_done=extend_schema(
+        description=(
+            "Update many tasks related to the logged-in User to be in DONE state. "
+            "Tasks that are already done are skipped."
+        ),
+        responses={status.HTTP_200_OK: TaskBulkStateResultSerializer},
+    ),
 )
-class TaskViewSet(ModelViewSet):
+class TaskViewSet(ReplicaReadsMixin, ModelViewSet):
     """ViewSet to handle actions related to Task model."""
 
     permission_classes = (IsAuthenticated, IsTaskOwner)
     filterset_class = TaskFilterSet
+    pagination_class = TaskPageNumberPagination
+    cursor_pagination_class = TaskCursorPagination
+    # columns returned by the UPDATE of mark-* actions, enough to serialize a task
+    task_state_fields = ("description", "due_date", "id", "state", "title")
+    # aggregates of the filtered tasks behind the validators of a list
+    list_summary = {"count": Count("pk"), "last_modified": Max("updated_at")}
 
     def get_queryset(self) -> QuerySet:
         if getattr(self, "swagger_fake_view", False):  # for drf-spectacular
             return Task.objects.none()
 
-        user = self.request.user
-        today = now()
-        return Task.objects.filter(due_date__gte=today, owner=user).order_by("due_date")
+        return Task.objects.upcoming(self.request.user)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        get_validators = self._get_list_validators
+        if self._uses_cursor_pagination():
+            # validators need a COUNT, which is what cursor pagination avoids
+            get_validators = None
+        return self._read_response(self._list_tasks, get_validators, request)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return self._read_response(
+            self._retrieve_task, self._get_retrieve_validators, request
+        )
+
+    def perform_create(self, serializer: ModelSerializer) -> None:
+        super().perform_create(serializer)
+        self._invalidate_cache()
+
+    def perform_update(self, serializer: ModelSerializer) -> None:
+        super().perform_update(serializer)
+        self._invalidate_cache()
+
+    def perform_destroy(self, instance: Task) -> None:
+        with counters.counting(instance):
+            super().perform_destroy(instance)
+        self._invalidate_cache()
+
+    @property
+    def paginator(self) -> Optional[BasePagination]:
+        if not hasattr(self, "_paginator") and self._uses_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+    def _uses_cursor_pagination(self) -> bool:
+        request = getattr(self, "request", None)
+        if request is None:
+            return False
+        params = request.query_params
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        return params.get("pagination") == "cursor" or cursor_param in params
 
     def get_serializer_class(self) -> Type[ModelSerializer]:
         serializers = {
             "mark_to_do": TaskStateSerializer,
             "mark_in_progress": TaskStateSerializer,
             "mark_done": TaskStateSerializer,
+            "bulk_mark_to_do": TaskBulkStateSerializer,
+            "bulk_mark_in_progress": TaskBulkStateSerializer,
+            "bulk_mark_done": TaskBulkStateSerializer,
+            "export": TaskExportSerializer,
+            "import_tasks": TaskImportSerializer,
+            "summary": TaskSummarySerializer,
         }
         return serializers.get(self.action, TaskSerializer)
 
+    @action(methods=["post"], detail=False, url_path="bulk")
+    def bulk_create(self, request: Request) -> Response:
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=settings.TASKS_BULK_MAX_SIZE
+        )
+        if serializer.is_valid():
+            self.perform_create(serializer)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        item_errors = serializer.errors
+        skip_invalid = request.query_params.get("skip_invalid") in ("1", "true")
+        if not skip_invalid or not isinstance(item_errors, list):
+            raise ValidationError(item_errors)
+
+        valid_items = [
+            item for item, errors in zip(request.data, item_errors) if not errors
+        ]
+        serializer = self.get_serializer(data=valid_items, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        data = {
+            "created": serializer.data,
+            "errors": [
+                {"index": index, "errors": errors}
+                for index, errors in enumerate(item_errors)
+                if errors
+            ],
+        }
+        if valid_items:
+            return Response(data, status=status.HTTP_201_CREATED)
+        return Response(data, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(
+        methods=["get"],
+        detail=False,
+        content_negotiation_class=ExportContentNegotiation,
+    )
+    def export(self, request: Request) -> StreamingHttpResponse:
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        file_format = serializer.validated_data["file_format"]
+
+        if serializer.validated_data["include_past"]:
+            queryset = Task.objects.filter(owner=request.user).order_by(
+                "due_date", "id"
+            )
+        else:
+            queryset = self.get_queryset()
+        # a server-side cursor keeps memory flat however many tasks there are
+        chunk_size = settings.TASKS_EXPORT_CHUNK_SIZE
+        rows = (
+            self.filter_queryset(queryset)
+            .values_list(*TaskReadSerializer.get_columns())
+            .iterator(chunk_size=chunk_size)
+        )
+
+        content_type, exporter = EXPORTERS[file_format]
+        content = exporter(rows, chunk_size)
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_chunks(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="tasks.{file_format}"'
+        return response
+
+    @action(methods=["post"], detail=False, url_path="import")
+    def import_tasks(self, request: Request) -> Response:
+        # the body is read as a stream, never parsed into request.data at once
+        media_type, params = parse_header_parameters(request.content_type)
+        file_format = importers.CONTENT_TYPES.get(media_type)
+        encoding = params.get("charset", "utf-8")
+        if file_format is None or not importers.is_known_encoding(encoding):
+            raise UnsupportedMediaType(request.content_type)
+
+        rejects = []
+        max_rejects = settings.TASKS_IMPORT_MAX_REPORTED_REJECTS
+
+        def reject(item: importers.Reject) -> None:
+            if len(rejects) < max_rejects:
+                rejects.append(item._asdict())
+
+        result = importers.import_tasks(
+            request.user, request.stream or [], file_format, reject, encoding=encoding
+        )
+        data = {
+            "imported": result.imported,
+            "rejected": result.rejected,
+            "rejects": rejects,
+            "rejects_truncated": result.rejected > len(rejects),
+        }
+        serializer = TaskImportResultSerializer(data)
+        if result.imported:
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(methods=["get"], detail=False)
+    def summary(self, request: Request) -> Response:
+        data = counters.summary(request.user, now().date())
+        return Response(self.get_serializer(data).data)
+
     @action(methods=["post"], detail=True, url_path="mark-to-do")
     def mark_to_do(self, request: Request, pk: str = None) -> Response:
         return self._update_task_state(TaskState.TO_DO)
@@ -91,10 +338,166 @@ class TaskViewSet(ModelViewSet):
     def mark_done(self, request: Request, pk: str = None) -> Response:
         return self._update_task_state(TaskState.DONE)
 
+    @action(methods=["post"], detail=False, url_path="bulk-mark-to-do")
+    def bulk_mark_to_do(self, request: Request) -> Response:
+        return self._bulk_update_task_state(TaskState.TO_DO)
+
+    @action(methods=["post"], detail=False, url_path="bulk-mark-in-progress")
+    def bulk_mark_in_progress(self, request: Request) -> Response:
+        return self._bulk_update_task_state(TaskState.IN_PROGRESS)
+
+    @action(methods=["post"], detail=False, url_path="bulk-mark-done")
+    def bulk_mark_done(self, request: Request) -> Response:
+        return self._bulk_update_task_state(TaskState.DONE)
+
     def _update_task_state(self, state: TaskState) -> Response:
-        task = self.get_object()
-        data = {"state": state}
-        serializer = self.get_serializer(instance=task, data=data, partial=True)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.get_queryset().filter(pk=self.kwargs[lookup_url_kwarg])
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+
+        tasks = queryset.update_state(state, fields=self.task_state_fields)
+        if tasks:
+            self._invalidate_cache()
+            serializer = self.get_serializer(instance=tasks[0])
+            return Response(serializer.data)
+
+        # Nothing was updated - 404 or 403 if the task is missing or not the user's,
+        # else it was done when the UPDATE read it
+        self.get_object()
+        raise ValidationError({"state": [TaskStateSerializer.already_done]})
+
+    def _bulk_update_task_state(self, state: TaskState) -> Response:
+        serializer = self.get_serializer(data=self.request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        ids = serializer.validated_data["ids"]
+
+        # get_queryset limits the tasks to the owner's ones, like get_object does
+        queryset = self.get_queryset().filter(pk__in=ids)
+        updated = {task.pk for task in queryset.update_state(state)}
+        if updated:
+            self._invalidate_cache()
+        pending = [pk for pk in ids if pk not in updated]
+        existing = set()
+        if pending:
+            existing = set(queryset.filter(pk__in=pending).values_list("pk", flat=True))
+
+        result = {
+            "updated": [pk for pk in ids if pk in updated],
+            "skipped": [pk for pk in pending if pk in existing],
+            "not_found": [pk for pk in pending if pk not in existing],
+        }
+        return Response(TaskBulkStateResultSerializer(result).data)
+
+    def _read_response(
+        self,
+        handler: Callable[..., Response],
+        get_validators: Optional[Callable[[], Validators]],
+        request: Request,
+    ) -> Response:
+        """Respond to a read action, with a 304 when the client is up to date.
+
+        Cached responses keep their validators, so a cache hit answers both
+        plain and conditional requests without touching the database.
+        """
+        key = self._get_read_cache_key(request)
+        if key is not None:
+            cached = task_cache.get_response(key)
+            if cached is not None:
+                return self._cached_read_response(request, *cached)
+
+        validators = get_validators() if get_validators is not None else None
+        not_modified = self._not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        response = handler(request, *self.args, **self.kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            self._set_validator_headers(response, validators)
+            if key is not None:
+                task_cache.set_response(key, (response.data, validators))
+        return response
+
+    def _get_read_cache_key(self, request: Request) -> Optional[str]:
+        if not settings.TASKS_CACHE_ENABLED:
+            return None
+        # the list depends on today's date, links in it on the requested host
+        return task_cache.response_key(
+            request.user.pk,
+            self.action,
+            now().date(),
+            request.build_absolute_uri(),
+        )
+
+    def _cached_read_response(
+        self, request: Request, data: Any, validators: Optional[Validators]
+    ) -> Response:
+        not_modified = self._not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+        headers = validators.headers if validators is not None else None
+        return Response(data, headers=headers)
+
+    @staticmethod
+    def _not_modified_response(
+        request: Request, validators: Optional[Validators]
+    ) -> Optional[HttpResponse]:
+        if validators is None:
+            return None
+        return validators.not_modified_response(request)
+
+    @staticmethod
+    def _set_validator_headers(
+        response: Response, validators: Optional[Validators]
+    ) -> None:
+        if validators is not None:
+            for header, value in validators.headers.items():
+                response.headers[header] = value
+
+    def _get_list_validators(self) -> Validators:
+        queryset = self.filter_queryset(self.get_queryset())
+        summary = queryset.aggregate(**self.list_summary)
+        return self._make_list_validators(summary)
+
+    def _make_list_validators(self, summary: dict) -> Validators:
+        # the page that follows is counted already
+        self.paginator.count = summary["count"]
+        etag = make_etag(
+            self.request.user.pk,
+            self.request.get_full_path(),
+            now().date(),
+            summary["count"],
+            summary["last_modified"],
+        )
+        return Validators(etag, summary["last_modified"], check_last_modified=False)
+
+    def _get_retrieve_validators(self) -> Validators:
+        self.task = self.get_object()
+        return self._make_retrieve_validators(self.task)
+
+    @staticmethod
+    def _make_retrieve_validators(task: Task) -> Validators:
+        etag = make_etag(task.pk, task.updated_at.isoformat())
+        return Validators(etag, task.updated_at)
+
+    def _list_tasks(self, request: Request, *args, **kwargs) -> Response:
+        # rows instead of model instances, serialized by the fast read serializer
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            *TaskReadSerializer.get_columns(), named=True
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = TaskReadSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = TaskReadSerializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def _retrieve_task(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(self.task)
         return Response(serializer.data)
+
+    def _invalidate_cache(self) -> None:
+        if settings.TASKS_CACHE_ENABLED:
+            task_cache.bump_version(self.request.user.pk)
@@ -0,0 +1,68 @@
+"""Stateless signed tokens for API clients.
+
+A token is the id of a User signed with ``SECRET_KEY`` and a timestamp, nothing
+is stored on the server. It expires after ``USERS_TOKEN_MAX_AGE`` seconds and
+it carries a hash of the User's password, so changing the password revokes all
+the User's tokens. The User itself is loaded by the authentication backend,
+which ``CachedModelBackend`` serves from the worker's memory.
+"""
+
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import load_backend
+from django.core import signing
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+
+from users.models import User
+
+TOKEN_SALT = "users.authentication.SignedTokenAuthentication"
+
+
+def make_token(user: User) -> str:
+    payload = {"id": str(user.pk), "hash": user.get_session_auth_hash()}
+    return signing.dumps(payload, salt=TOKEN_SALT)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """Authenticate with an ``Authorization: Token <token>`` header."""
+
+    keyword = "Token"
+
+    def authenticate(self, request: Request) -> Optional[tuple[User, str]]:
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed(_("Invalid token header."))
+
+        try:
+            token = auth[1].decode()
+            payload = signing.loads(
+                token, salt=TOKEN_SALT, max_age=settings.USERS_TOKEN_MAX_AGE
+            )
+        except (UnicodeError, signing.BadSignature):
+            # SignatureExpired is a BadSignature too
+            raise AuthenticationFailed(_("Invalid or expired token."))
+
+        user = self._get_user(payload.get("id"))
+        if user is None or not constant_time_compare(
+            payload.get("hash", ""), user.get_session_auth_hash()
+        ):
+            raise AuthenticationFailed(_("Invalid or expired token."))
+        return user, token
+
+    def authenticate_header(self, request: Request) -> str:
+        return self.keyword
+
+    @staticmethod
+    def _get_user(user_id: Optional[str]) -> Optional[User]:
+        if user_id is None:
+            return None
+        # the first backend, so the user comes from the cache of the worker
+        backend = load_backend(settings.AUTHENTICATION_BACKENDS[0])
+        return backend.get_user(user_id)
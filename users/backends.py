@@ -0,0 +1,100 @@
+"""Authentication backend caching Users in the memory of a worker.
+
+Every authenticated request loads its User by the id kept in the session or in a
+token. ``CachedModelBackend`` keeps the loaded Users for ``USERS_CACHE_TIMEOUT``
+seconds, so the requests of a user that follow don't query the database for it.
+Saving or deleting a User drops it from the cache of the worker that did it (see
+``users.signals``), but not from the caches of the other workers: there a user
+that was deactivated or changed their password stays authenticated, as they
+were, for up to ``USERS_CACHE_TIMEOUT`` seconds. Changes made with
+``QuerySet.update()`` send no signals and wait for the timeout on every worker.
+Set ``USERS_CACHE_TIMEOUT`` to 0 where that delay isn't acceptable.
+"""
+
+import copy
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest
+
+from users.models import User
+
+# max number of Users kept by a worker, the least recently used go first
+MAX_SIZE = 10000
+
+_users: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+# hits and misses of this process, exported by the metrics endpoint
+stats: Counter = Counter()
+
+
+def size() -> int:
+    return len(_users)
+
+
+def get_user(user_id: Any) -> Optional[User]:
+    key = str(user_id)
+    with _lock:
+        entry = _users.get(key)
+        if entry is None:
+            stats["misses"] += 1
+            return None
+        expires, user = entry
+        if expires < time.monotonic():
+            del _users[key]
+            stats["misses"] += 1
+            return None
+        _users.move_to_end(key)
+        stats["hits"] += 1
+    # a copy, so a request changing its user doesn't change the cached one
+    return copy.copy(user)
+
+
+def set_user(user: User) -> None:
+    key = str(user.pk)
+    expires = time.monotonic() + settings.USERS_CACHE_TIMEOUT
+    with _lock:
+        _users[key] = (expires, copy.copy(user))
+        _users.move_to_end(key)
+        while len(_users) > MAX_SIZE:
+            _users.popitem(last=False)
+
+
+def delete_user(user_id: Any) -> None:
+    with _lock:
+        _users.pop(str(user_id), None)
+
+
+def clear() -> None:
+    with _lock:
+        _users.clear()
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend loading Users of sessions and tokens from the worker's cache."""
+
+    def authenticate(
+        self, request: Optional[HttpRequest], *args: Any, **kwargs: Any
+    ) -> Optional[User]:
+        user = super().authenticate(request, *args, **kwargs)
+        if user is None:
+            # stops authenticate(), else ModelBackend, which is listed for older
+            # sessions, would hash the password again to fail the same way
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id: Any) -> Optional[User]:
+        if settings.USERS_CACHE_TIMEOUT <= 0:
+            return super().get_user(user_id)
+
+        user = get_user(user_id)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                set_user(user)
+        return user
@@ -0,0 +1,45 @@
+"""Thread pool checking the passwords of async logins.
+
+Checking a password runs a deliberately slow hash. Under ASGI Django runs the
+sync code of all requests in a single thread by default, so a burst of logins
+would make every other request wait behind their hashes. Async logins hash in a
+pool of ``USERS_HASHING_THREADS`` threads of their own instead: a burst queues
+there while task requests go on. hashlib releases the GIL while it hashes, so the
+threads hash in parallel.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.USERS_HASHING_THREADS,
+                thread_name_prefix="users-hashing",
+            )
+    return _executor
+
+
+async def run_hashing(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await func(*args, **kwargs) run in the hashing pool."""
+
+    def run() -> Any:
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # threads of the pool outlive requests, close their connections like
+            # the end of a request does
+            close_old_connections()
+
+    return await sync_to_async(run, thread_sensitive=False, executor=get_executor())()
@@ -0,0 +1,103 @@
+"""Bulk import of users from NDJSON or CSV.
+
+Rows are validated one at a time and created in batches with
+``User.objects.bulk_create_users()``, whose password hashing, the bulk of the
+work, runs in a pool of processes on all the cores. Every batch is committed on
+its own.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import django
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from tasks.importers import READERS, ImportResult, Reject
+from users.models import User
+from users.serializers import UserImportSerializer
+
+EMAIL_TAKEN = {"email": ["user with this email address already exists."]}
+
+
+def validate_rows(
+    rows: Iterable[tuple[int, Any]], reject: Callable[[Reject], None]
+) -> Iterator[tuple[int, Any, dict]]:
+    """Yield ``(line number, row, validated data)`` of valid rows.
+
+    Invalid ones are passed to ``reject``.
+    """
+    serializer = UserImportSerializer()
+    for number, row in rows:
+        if not isinstance(row, dict):
+            reject(Reject(number, row, {"non_field_errors": ["Invalid JSON object."]}))
+            continue
+        try:
+            yield number, row, serializer.run_validation(row)
+        except ValidationError as exc:
+            reject(Reject(number, row, exc.detail))
+
+
+def _new_users(
+    batch: list[tuple[int, Any, dict]],
+    seen: set[str],
+    reject: Callable[[Reject], None],
+) -> list[dict]:
+    """Validated data of rows whose email is neither taken nor seen before."""
+    emails = {User.objects.normalize_email(data["email"]) for _, _, data in batch}
+    taken = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+    users = []
+    for number, row, data in batch:
+        email = User.objects.normalize_email(data["email"])
+        if email in taken or email in seen:
+            reject(Reject(number, row, EMAIL_TAKEN))
+            continue
+        seen.add(email)
+        users.append(data)
+    return users
+
+
+def import_users(
+    lines: Iterable[bytes],
+    file_format: str,
+    reject: Callable[[Reject], None],
+    batch_size: Optional[int] = None,
+    processes: Optional[int] = None,
+) -> ImportResult:
+    """Import users from ``lines`` of an NDJSON or CSV file.
+
+    Passwords are hashed by ``processes`` processes, as many as CPUs by default,
+    or in this process when it is 1. Rows with an email that is taken or repeated
+    are passed to ``reject`` with the invalid ones.
+    """
+    read = READERS[file_format]
+    batch_size = batch_size or settings.USERS_IMPORT_BATCH_SIZE
+    rejected = 0
+
+    def count_reject(item: Reject) -> None:
+        nonlocal rejected
+        rejected += 1
+        if isinstance(item.row, dict) and "password" in item.row:
+            # rejects end up in files and responses, not the passwords
+            item = item._replace(row={**item.row, "password": "********"})
+        reject(item)
+
+    imported = 0
+    seen = set()
+    rows = validate_rows(read(lines), count_reject)
+    with ExitStack() as stack:
+        executor = None
+        if processes != 1:
+            # children set Django up, they are not forked on every platform
+            executor = stack.enter_context(
+                ProcessPoolExecutor(processes, initializer=django.setup)
+            )
+        while batch := list(islice(rows, batch_size)):
+            users = _new_users(batch, seen, count_reject)
+            with transaction.atomic():
+                User.objects.bulk_create_users(users, executor=executor)
+            imported += len(users)
+    return ImportResult(imported, rejected)
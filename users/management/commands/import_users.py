@@ -0,0 +1,65 @@
+import json
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importers import READERS, Reject
+from users.importers import import_users
+
+
+class Command(BaseCommand):
+    """Django command to create users from an NDJSON or CSV file."""
+
+    help = "Create users from an NDJSON or CSV file, hashing passwords on all CPUs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON or CSV file, - reads stdin.")
+        parser.add_argument(
+            "--file-format",
+            choices=sorted(READERS),
+            help="Format of the file, guessed from its extension by default.",
+        )
+        parser.add_argument(
+            "--rejects", help="File to write the rejected rows to, as NDJSON."
+        )
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            help="Number of processes hashing passwords, as many as CPUs by default.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or Path(path).suffix[1:].lower()
+        if file_format not in READERS:
+            raise CommandError("Cannot guess the file format, use --file-format.")
+
+        with ExitStack() as stack:
+            if path == "-":
+                lines = sys.stdin.buffer
+            else:
+                lines = stack.enter_context(open(path, "rb"))
+            rejects = None
+            if options["rejects"]:
+                rejects = stack.enter_context(open(options["rejects"], "w"))
+
+            def reject(item: Reject) -> None:
+                if rejects is not None:
+                    rejects.write(json.dumps(item._asdict()) + "\n")
+
+            result = import_users(
+                lines,
+                file_format,
+                reject,
+                batch_size=options["batch_size"],
+                processes=options["processes"],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} users, rejected {result.rejected}."
+            )
+        )
@@ -1,21 +1,26 @@
-import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
 
-from django.core.management.base import BaseCommand
-from django.db import connections
-from django.db.utils import OperationalError
+from taskmanager.warmup import wait_for_database
 
 
 class Command(BaseCommand):
     """Django command to pause execution until database is available."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=settings.WARMUP_DB_TIMEOUT,
+            help="Seconds to wait for, WARMUP_DB_TIMEOUT by default.",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
-            try:
-                db_conn = connections["default"]
-            except OperationalError:
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
+        try:
+            wait_for_database(timeout=options["timeout"], log=self.stdout.write)
+        except DatabaseError as exc:
+            raise CommandError(f"Database unavailable: {exc}")
 
         self.stdout.write(self.style.SUCCESS("Database available!"))
@@ -0,0 +1,31 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from taskmanager.warmup import warm_up
+
+
+class Command(BaseCommand):
+    """Django command to check that a process can warm up and how long it takes."""
+
+    help = (
+        "Wait for the database, import views, build URLs, load translations, "
+        "connect to the database and caches and print milliseconds per step."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            help="Seconds to wait for the database, WARMUP_DB_TIMEOUT by default.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            durations = warm_up(timeout=options["timeout"], log=self.stderr.write)
+        except DatabaseError as exc:
+            raise CommandError(f"Database unavailable: {exc}")
+
+        milliseconds = {name: round(d * 1000, 3) for name, d in durations.items()}
+        self.stdout.write(json.dumps(milliseconds, indent=2))
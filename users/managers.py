@@ -1,3 +1,6 @@
+from concurrent.futures import Executor
+from typing import Iterable, Optional
+
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager as DjangoUserManager
 
@@ -47,3 +50,28 @@ class UserManager(DjangoUserManager.from_queryset(UserQuerySet), DjangoUserManag
         return super().create_superuser(
             email, email=email, password=password, **extra_fields
         )
+
+    def bulk_create_users(
+        self,
+        users: Iterable[dict],
+        batch_size: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> list:
+        """Creates Users of dicts of an email, a password and other fields at once.
+
+        Emails are normalized like create_user() does and have to be new, as with
+        bulk_create(). Passwords are hashed with ``executor`` (e.g. a pool of
+        processes), a missing one makes the password unusable.
+        """
+        users = list(users)
+        passwords = [user.get("password") for user in users]
+        # hashing takes most of the time, one password at a time keeps workers busy
+        hash_password = map if executor is None else executor.map
+        hashes = hash_password(make_password, passwords)
+
+        objs = []
+        for fields, hashed in zip(users, hashes):
+            fields = {**fields, "email": self.normalize_email(fields["email"])}
+            fields["password"] = hashed
+            objs.append(self.model(**fields))
+        return self.bulk_create(objs, batch_size=batch_size)
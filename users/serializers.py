@@ -1,9 +1,11 @@
+from django.conf import settings
 from django.contrib.auth import authenticate, password_validation
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from users.authentication import make_token
 from users.models import User
 
 
@@ -33,11 +35,28 @@ class RegistrationSerializer(serializers.ModelSerializer):
             raise ValidationError(ex.messages)
 
 
-class LoginSerializer(serializers.ModelSerializer):
+class AuthenticateMixin:
+    """Authenticates the User of the email and password of a serializer."""
+
     default_error_messages = {
         "incorrect_authentication": _("Wrong e-mail or password."),
     }
 
+    def _authenticate(self, attrs: dict) -> User:
+        user: User = authenticate(
+            self.context["request"],
+            email=attrs["email"],
+            password=attrs["password"],
+        )
+        if not user:
+            raise ValidationError(
+                self.error_messages["incorrect_authentication"],
+                code="authorization",
+            )
+        return user
+
+
+class LoginSerializer(AuthenticateMixin, serializers.ModelSerializer):
     email = serializers.EmailField()
     password = serializers.CharField(
         label=_("Password"),
@@ -51,17 +70,54 @@ class LoginSerializer(serializers.ModelSerializer):
         fields = ["email", "id", "password"]
 
     def validate(self, attrs: dict) -> dict:
-        user: User = authenticate(
-            self.context["request"],
-            email=attrs["email"],
-            password=attrs["password"],
-        )
-        if not user:
-            raise ValidationError(
-                self.error_messages["incorrect_authentication"],
-                code="authorization",
-            )
+        # the authenticated User, so create() doesn't query it again
+        attrs["user"] = self._authenticate(attrs)
         return attrs
 
     def create(self, validated_data: dict) -> User:
-        return User.objects.get(email=validated_data["email"])
+        return validated_data["user"]
+
+
+class TokenSerializer(AuthenticateMixin, serializers.Serializer):
+    email = serializers.EmailField(write_only=True)
+    password = serializers.CharField(
+        label=_("Password"),
+        style={"input_type": "password"},
+        trim_whitespace=False,
+        write_only=True,
+    )
+    token = serializers.CharField(read_only=True)
+    expires_in = serializers.IntegerField(read_only=True)
+
+    def validate(self, attrs: dict) -> dict:
+        user = self._authenticate(attrs)
+        attrs["token"] = make_token(user)
+        attrs["expires_in"] = settings.USERS_TOKEN_MAX_AGE
+        return attrs
+
+
+class UserImportSerializer(serializers.ModelSerializer):
+    """Validates a row of a users' import, without checking if its email is taken."""
+
+    # not the model field, whose unique validator queries every row
+    email = serializers.EmailField()
+    # blank, e.g. an empty CSV cell, makes the password unusable
+    password = serializers.CharField(
+        required=False, allow_blank=True, trim_whitespace=False, write_only=True
+    )
+
+    class Meta:
+        model = User
+        fields = ["email", "password", "first_name", "last_name"]
+
+    def validate(self, attrs: dict) -> dict:
+        if not attrs.get("password"):
+            attrs.pop("password", None)
+        else:
+            try:
+                password_validation.validate_password(
+                    attrs["password"], User(email=attrs["email"])
+                )
+            except DjangoValidationError as ex:
+                raise ValidationError({"password": ex.messages})
+        return attrs
@@ -0,0 +1,17 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users import backends
+from users.models import User
+
+
+@receiver(post_save, sender=User, dispatch_uid="users.forget_cached_user_on_save")
+@receiver(post_delete, sender=User, dispatch_uid="users.forget_cached_user_on_delete")
+def forget_cached_user(sender: type, instance: User, **kwargs: Any) -> None:
+    """Drop a changed User, e.g. deactivated, from this worker's cache of Users.
+
+    Other workers keep their copy until it expires, see ``users.backends``.
+    """
+    backends.delete_user(instance.pk)
@@ -1,5 +1,13 @@
-from django.contrib.auth.hashers import make_password
-from django.test import override_settings
+import threading
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
 from rest_framework.reverse import reverse
 from rest_framework.status import (
     HTTP_200_OK,
@@ -9,8 +17,24 @@ from rest_framework.status import (
 )
 from rest_framework.test import APITestCase
 
+from users import backends
+from users.authentication import make_token
 from users.factories import COMMON_PASSWORD, UserFactory
 from users.models import User
+from users.views import AsyncLoginAPIView
+
+urlpatterns = [
+    path(
+        "users/",
+        include(([path("login/", AsyncLoginAPIView.as_view(), name="login")], "users")),
+    ),
+]
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """A PBKDF2 hasher cheap enough for tests."""
+
+    iterations = 1000
 
 
 @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
@@ -133,6 +157,114 @@ class LoginAPIViewTestCase(APITestCase):
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
         self.assertJSONEqual(response.content, expected_data)
 
+    def test_post_fetches_user_once(self):
+        password = make_password(COMMON_PASSWORD)
+        user = UserFactory(password=password)
+        data = {"email": user.email, "password": COMMON_PASSWORD}
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        user_selects = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('SELECT "users_user"')
+        ]
+        self.assertEqual(len(user_selects), 1)
+
+    @override_settings(PASSWORD_HASHERS=[f"{__name__}.FastPBKDF2PasswordHasher"])
+    def test_post_upgrades_password_hash(self):
+        hasher = FastPBKDF2PasswordHasher()
+        password = hasher.encode(COMMON_PASSWORD, hasher.salt(), iterations=10)
+        user = UserFactory(password=password)
+        data = {"email": user.email, "password": COMMON_PASSWORD}
+
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(hasher.decode(user.password)["iterations"], hasher.iterations)
+        self.assertTrue(user.check_password(COMMON_PASSWORD))
+        # the session of the login stays valid with the new hash
+        self.assertEqual(
+            self.client.get(reverse("tasks:task-list")).status_code, HTTP_200_OK
+        )
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    ROOT_URLCONF=__name__,
+)
+class AsyncLoginAPIViewTestCase(TransactionTestCase):
+    """TestCase for AsyncLoginAPIView.
+
+    Passwords are checked in threads of their own with their own connections, so
+    the User has to be committed.
+    """
+
+    def setUp(self) -> None:
+        self.url = reverse("users:login")
+        self.user = UserFactory(password=make_password(COMMON_PASSWORD))
+
+    async def test_post_logs_user_in(self):
+        data = {"email": self.user.email, "password": COMMON_PASSWORD}
+        expected_data = {"email": self.user.email, "id": str(self.user.pk)}
+
+        with patch(
+            "users.serializers.authenticate", side_effect=authenticate
+        ) as mocked:
+            response = await self.async_client.post(
+                self.url, data, content_type="application/json"
+            )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertJSONEqual(response.content, expected_data)
+        session = await self.async_client.asession()
+        user_id = await sync_to_async(session.get)("_auth_user_id")
+        self.assertEqual(user_id, str(self.user.pk))
+        self.assertEqual(mocked.call_count, 1)
+
+    async def test_post_checks_password_in_hashing_pool(self):
+        data = {"email": self.user.email, "password": COMMON_PASSWORD}
+        threads = []
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return authenticate(*args, **kwargs)
+
+        with patch("users.serializers.authenticate", side_effect=record_thread):
+            await self.async_client.post(
+                self.url, data, content_type="application/json"
+            )
+
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("users-hashing"))
+
+    async def test_post_with_a_token_of_a_user_not_cached_yet(self):
+        data = {"email": self.user.email, "password": COMMON_PASSWORD}
+        backends.clear()
+
+        response = await self.async_client.post(
+            self.url,
+            data,
+            content_type="application/json",
+            headers={"Authorization": f"Token {make_token(self.user)}"},
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    async def test_post_returns_error_when_wrong_password(self):
+        data = {"email": self.user.email, "password": "different"}
+        expected_data = {"non_field_errors": ["Wrong e-mail or password."]}
+
+        response = await self.async_client.post(
+            self.url, data, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertJSONEqual(response.content, expected_data)
+
 
 @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
 class LogoutAPIViewTestCase(APITestCase):
@@ -0,0 +1,178 @@
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import override_settings
+from freezegun import freeze_time
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN
+from rest_framework.test import APITestCase
+
+from users import backends
+from users.authentication import make_token
+from users.factories import COMMON_PASSWORD, UserFactory
+from users.models import User
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class TokenAPIViewTestCase(APITestCase):
+    """TestCase for TokenAPIView."""
+
+    def setUp(self) -> None:
+        self.url = reverse("users:token")
+        self.user = UserFactory(password=make_password(COMMON_PASSWORD))
+
+    @override_settings(USERS_TOKEN_MAX_AGE=600)
+    def test_post_returns_token(self):
+        data = {"email": self.user.email, "password": COMMON_PASSWORD}
+
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json()["expires_in"], 600)
+        self.assertFalse("_auth_user_id" in self.client.session)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.json()['token']}")
+        self.assertEqual(
+            self.client.get(reverse("tasks:task-list")).status_code, HTTP_200_OK
+        )
+
+    def test_post_returns_error_when_wrong_password(self):
+        data = {"email": self.user.email, "password": "different"}
+        expected_data = {"non_field_errors": ["Wrong e-mail or password."]}
+
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertJSONEqual(response.content, expected_data)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class SignedTokenAuthenticationTestCase(APITestCase):
+    """TestCase for SignedTokenAuthentication."""
+
+    def setUp(self) -> None:
+        backends.clear()
+        self.url = reverse("tasks:task-list")
+        self.user = UserFactory(password=make_password(COMMON_PASSWORD))
+
+    def _authorize(self, token: str) -> None:
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def _assert_rejected(self, response: Response) -> None:
+        # 403, not 401, SessionAuthentication comes first and has no auth header
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json(), {"detail": "Invalid or expired token."})
+
+    def test_list_queries_count(self):
+        self._authorize(make_token(self.user))
+        self.client.get(self.url)
+        # only the tasks, the user of the token is in the worker's cache
+        expected_queries = 1
+
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_list_returns_forbidden_for_tampered_token(self):
+        # the payload of one user with the signature of another
+        payload = make_token(self.user).split(":", 1)[0]
+        signature = make_token(UserFactory()).split(":", 1)[1]
+        self._authorize(f"{payload}:{signature}")
+
+        response = self.client.get(self.url)
+
+        self._assert_rejected(response)
+
+    @override_settings(USERS_TOKEN_MAX_AGE=60)
+    def test_list_returns_forbidden_for_expired_token(self):
+        with freeze_time("2024-01-01 12:00:00"):
+            token = make_token(self.user)
+        self._authorize(token)
+
+        with freeze_time("2024-01-01 12:01:01"):
+            response = self.client.get(self.url)
+
+        self._assert_rejected(response)
+
+    def test_list_returns_forbidden_after_password_change(self):
+        self._authorize(make_token(self.user))
+        self.client.get(self.url)
+
+        self.user.set_password("AnotherPassw0rd")
+        self.user.save()
+        response = self.client.get(self.url)
+
+        self._assert_rejected(response)
+
+    def test_list_returns_forbidden_for_deactivated_user(self):
+        self._authorize(make_token(self.user))
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+
+        self._assert_rejected(response)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+)
+class CachedSessionTestCase(APITestCase):
+    """TestCase for session requests with cached sessions and Users."""
+
+    def setUp(self) -> None:
+        backends.clear()
+        cache.clear()
+        self.url = reverse("tasks:task-list")
+        self.user = UserFactory(password=make_password(COMMON_PASSWORD))
+        self.client.login(email=self.user.email, password=COMMON_PASSWORD)
+
+    def test_list_queries_count(self):
+        self.client.get(self.url)
+        # only the tasks, the session and the user come from caches
+        expected_queries = 1
+
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    @override_settings(USERS_CACHE_TIMEOUT=0)
+    def test_list_queries_count_without_user_cache(self):
+        self.client.get(self.url)
+        expected_queries = 2
+
+        with self.assertNumQueries(expected_queries):
+            self.client.get(self.url)
+
+    def test_list_returns_forbidden_for_deactivated_user(self):
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_sessions_of_model_backend_stay_logged_in(self):
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_wrong_password_is_checked_once(self):
+        self.client.logout()
+
+        with patch.object(User, "check_password", autospec=True) as check_password:
+            check_password.return_value = False
+            logged_in = self.client.login(email=self.user.email, password="wrong")
+
+        self.assertFalse(logged_in)
+        check_password.assert_called_once()
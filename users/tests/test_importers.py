@@ -0,0 +1,173 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from tasks.importers import Reject
+from users.factories import COMMON_PASSWORD, UserFactory
+from users.importers import EMAIL_TAKEN, import_users
+from users.models import User
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class BulkCreateUsersTestCase(TestCase):
+    """TestCase for UserManager.bulk_create_users."""
+
+    def test_bulk_create_users(self):
+        users = [
+            {"email": "first@EXAMPLE.com", "password": COMMON_PASSWORD},
+            {"email": "second@example.com", "first_name": "Second"},
+        ]
+
+        with self.assertNumQueries(1):
+            created = User.objects.bulk_create_users(users)
+
+        first, second = User.objects.filter(pk__in=[u.pk for u in created]).order_by(
+            "email"
+        )
+        self.assertEqual(first.email, "first@example.com")
+        self.assertTrue(first.check_password(COMMON_PASSWORD))
+        second = User.objects.get(email="second@example.com")
+        self.assertFalse(second.has_usable_password())
+        self.assertFalse(first.is_staff)
+        self.assertEqual(second.first_name, "Second")
+        self.assertFalse(second.has_usable_password())
+
+    def test_bulk_create_users_hashes_in_executor(self):
+        users = [
+            {"email": f"user{i}@example.com", "password": f"pw{i}"} for i in range(4)
+        ]
+
+        with ProcessPoolExecutor(2) as executor:
+            created = User.objects.bulk_create_users(users, executor=executor)
+
+        self.assertEqual(len(created), 4)
+        for i, user in enumerate(User.objects.order_by("email")):
+            self.assertTrue(user.check_password(f"pw{i}"))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ImportUsersTestCase(TestCase):
+    """TestCase for import_users."""
+
+    def test_import_ndjson_in_batches(self):
+        lines = [
+            json.dumps(
+                {"email": f"user{i}@example.com", "password": COMMON_PASSWORD}
+            ).encode()
+            + b"\n"
+            for i in range(5)
+        ]
+        rejects = []
+
+        # a lookup of taken emails and an INSERT per batch of two, in a savepoint
+        with self.assertNumQueries(12):
+            result = import_users(
+                lines, "ndjson", rejects.append, batch_size=2, processes=1
+            )
+
+        self.assertEqual(result, (5, 0))
+        self.assertEqual(rejects, [])
+        self.assertEqual(
+            list(User.objects.order_by("email").values_list("email", flat=True)),
+            [f"user{i}@example.com" for i in range(5)],
+        )
+
+    def test_import_rejects_taken_and_repeated_emails(self):
+        UserFactory(email="taken@example.com")
+        lines = [
+            b'{"email": "taken@EXAMPLE.COM"}\n',
+            b'{"email": "new@example.com"}\n',
+            b'{"email": "new@Example.com"}\n',
+        ]
+        rejects = []
+
+        result = import_users(lines, "ndjson", rejects.append, processes=1)
+
+        self.assertEqual(result, (1, 2))
+        self.assertEqual(
+            rejects,
+            [
+                Reject(1, {"email": "taken@EXAMPLE.COM"}, EMAIL_TAKEN),
+                Reject(3, {"email": "new@Example.com"}, EMAIL_TAKEN),
+            ],
+        )
+
+    def test_import_rejects_invalid_rows_without_their_passwords(self):
+        lines = [
+            b'{"email": "weak@example.com", "password": "123"}\n',
+            b'{"email": "not an email"}\n',
+            b"[1, 2]\n",
+        ]
+        rejects = []
+
+        result = import_users(lines, "ndjson", rejects.append, processes=1)
+
+        self.assertEqual(result, (0, 3))
+        self.assertEqual(rejects[0].row["password"], "********")
+        self.assertIn("password", rejects[0].errors)
+        self.assertIn("email", rejects[1].errors)
+        self.assertEqual(
+            rejects[2].errors, {"non_field_errors": ["Invalid JSON object."]}
+        )
+
+    def test_import_csv_with_process_pool(self):
+        content = (
+            "email,password,first_name,last_name\r\n"
+            f"first@example.com,{COMMON_PASSWORD},First,User\r\n"
+            "second@example.com,,Second,User\r\n"
+        )
+        rejects = []
+
+        result = import_users(
+            content.encode().splitlines(keepends=True),
+            "csv",
+            rejects.append,
+            processes=2,
+        )
+
+        self.assertEqual(result, (2, 0), rejects)
+        first = User.objects.get(email="first@example.com")
+        self.assertEqual((first.first_name, first.last_name), ("First", "User"))
+        self.assertTrue(first.check_password(COMMON_PASSWORD))
+        second = User.objects.get(email="second@example.com")
+        self.assertFalse(second.has_usable_password())
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ImportUsersCommandTestCase(TestCase):
+    """TestCase for the import_users command."""
+
+    def test_import_writes_rejects_file(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "users.csv"
+            path.write_text("email,password\nvalid@example.com,\ninvalid,\n")
+            rejects_path = Path(directory) / "rejects.ndjson"
+            stdout = StringIO()
+
+            call_command(
+                "import_users",
+                str(path),
+                rejects=str(rejects_path),
+                processes=1,
+                stdout=stdout,
+            )
+
+            rejects = [
+                json.loads(line) for line in rejects_path.read_text().splitlines()
+            ]
+        self.assertIn("Imported 1 users, rejected 1.", stdout.getvalue())
+        self.assertTrue(User.objects.filter(email="valid@example.com").exists())
+        self.assertEqual(len(rejects), 1)
+        self.assertEqual(rejects[0]["line"], 3)
+        self.assertIn("email", rejects[0]["errors"])
+
+    def test_import_fails_for_unknown_file_format(self):
+        with self.assertRaises(CommandError):
+            call_command("import_users", "users.xml")
@@ -1,11 +1,22 @@
+from django.conf import settings
 from django.urls import path
 
-from users.views import LoginAPIView, LogoutAPIView, RegistrationAPIView
+from users.views import (
+    AsyncLoginAPIView,
+    LoginAPIView,
+    LogoutAPIView,
+    RegistrationAPIView,
+    TokenAPIView,
+)
 
 app_name = "users"
 
+# checks passwords outside of the thread running sync code under ASGI
+login_view = AsyncLoginAPIView if settings.USERS_ASYNC_LOGIN else LoginAPIView
+
 urlpatterns = [
-    path("login/", LoginAPIView.as_view(), name="login"),
+    path("login/", login_view.as_view(), name="login"),
     path("logout/", LogoutAPIView.as_view(), name="logout"),
+    path("token/", TokenAPIView.as_view(), name="token"),
     path("registration/", RegistrationAPIView.as_view(), name="registration"),
 ]
@@ -1,4 +1,4 @@
-from django.contrib.auth import login, logout
+from django.contrib.auth import alogin, login, logout
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import status
 from rest_framework.generics import CreateAPIView
@@ -7,7 +7,9 @@ from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from users.serializers import LoginSerializer, RegistrationSerializer
+from taskmanager.views import AsyncAPIViewMixin
+from users.hashing import run_hashing
+from users.serializers import LoginSerializer, RegistrationSerializer, TokenSerializer
 
 
 @extend_schema_view(
@@ -51,6 +53,38 @@ class LoginAPIView(APIView):
         return Response(serializer.data)
 
 
+class AsyncLoginAPIView(AsyncAPIViewMixin, LoginAPIView):
+    """Log in a User, checking the password in the hashing thread pool."""
+
+    async def post(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        await run_hashing(serializer.is_valid, raise_exception=True)
+        # the User is the one authenticated, saving doesn't touch the database
+        user = serializer.save()
+        await alogin(request, user)
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        description="Get a signed token for the Authorization header of a User.",
+        responses={status.HTTP_200_OK: TokenSerializer},
+    ),
+)
+class TokenAPIView(APIView):
+    """Issue a signed token to a User, without logging it in."""
+
+    authentication_classes = []
+    serializer_class = TokenSerializer
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.serializer_class(
+            data=request.data, context={"request": request, "view": self}
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.data)
+
+
 @extend_schema_view(
     post=extend_schema(
         description="Create a User account with given credentials.",